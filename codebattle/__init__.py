@@ -3,11 +3,14 @@
 __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
-import gevent
 import logging
 
+from codebattle import maps
+from codebattle import runtime
 from codebattle.observer import ObserverManager
 from codebattle.player import PlayerManager
+from codebattle.worker import WorkerLauncher
+from codebattle.gateway import Gateway, RoomWorker, GATEWAY_LINK_PATH
 
 LOG_LEVEL_TABLE = {
     'NOTSET': logging.NOTSET,
@@ -20,16 +23,43 @@ LOG_LEVEL_TABLE = {
 
 
 class CodeBattle(object):
-    def __init__(self, log_level='DEBUG'):
+    def __init__(self, log_level='DEBUG', runtime_name=runtime.RUNTIME_GEVENT, workers=1, map_dir=None):
+        """
+
+        :param map_dir: directory of the <map_id>.map files, None plays the default map only
+        """
         self.build_logger(log_level)
+        self.runtime_name = runtime_name
+        self.workers = workers
+        if map_dir is not None:
+            # before the workers fork, they inherit it
+            maps.MAP_DIR = map_dir
 
     def run(self):
+        if self.workers > 1:
+            WorkerLauncher(self.workers, 11011, 11012, self.runtime_name).run()
+            return
+
+        runtime.set_runtime(self.runtime_name)
         ob = ObserverManager(11011)
         ob.start()
 
         p = PlayerManager(11012)
         p.start()
-        gevent.wait()
+        runtime.run_forever()
+
+
+    def run_gateway(self, link_path=GATEWAY_LINK_PATH):
+        """hold the client connections, rooms are in processes started by run_room_worker"""
+        runtime.set_runtime(self.runtime_name)
+        Gateway(11011, 11012, link_path).start()
+        runtime.run_forever()
+
+
+    def run_room_worker(self, link_path=GATEWAY_LINK_PATH):
+        runtime.set_runtime(self.runtime_name)
+        RoomWorker(link_path).start()
+        runtime.run_forever()
 
 
     def build_logger(self, log_level):
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import os
+import socket
+import logging
+
+from codebattle.framing import FrameReader
+from codebattle.runtime import Runtime, RUNTIME_ASYNCIO, RUNTIME_UVLOOP
+
+logger = logging.getLogger('codebattle.runtime')
+
+
+class AsyncioTransport(asyncio.BufferedProtocol):
+    """Drive an EndPoint from asyncio protocol callbacks.
+
+    Received bytes go straight into the FrameReader buffer.
+    Outbound frames stay in the endpoint inbox while the socket is paused,
+    so the inbox limits and policies apply to slow consumers.
+    """
+    has_socket = True
+
+    def __init__(self, loop, handler, data=b''):
+        self.loop = loop
+        self.handler = handler
+        self.frame_reader = FrameReader()
+        if data:
+            self.frame_reader.feed(data)
+        self.transport = None
+        self.address = None
+        self.endpoint = None
+        self.paused = False
+        self.flush_scheduled = False
+        # on_connection_closed or close already called
+        self.closing = False
+
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.address = transport.get_extra_info('peername') or transport.get_extra_info('sockname')
+        self.handler(self)
+
+
+    def start(self, endpoint):
+        """
+
+        :param endpoint: codebattle.endpoint.EndPoint
+        """
+        self.endpoint = endpoint
+        endpoint.inbox.on_ready = self.schedule_flush
+        if self.frame_reader.pending():
+            self.loop.call_soon(self.buffer_updated, 0)
+
+
+    def get_buffer(self, sizehint):
+        return self.frame_reader.get_buffer()
+
+
+    def buffer_updated(self, nbytes):
+        reader = self.frame_reader
+        reader.buffer_updated(nbytes)
+        try:
+            for data in reader.frames():
+                self.endpoint.on_data(data)
+                if self.endpoint.closed:
+                    break
+        except reader.FrameError as e:
+            logger.warning("EndPoint {0} {1}".format(id(self.endpoint), e))
+            self.transport.abort()
+
+
+    def eof_received(self):
+        self.closing = True
+        self.endpoint.on_connection_closed()
+        return False
+
+
+    def connection_lost(self, exc):
+        if not self.closing:
+            self.endpoint.on_connection_lost()
+        self.endpoint.terminate()
+
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        self.schedule_flush()
+
+
+    def schedule_flush(self):
+        if self.flush_scheduled or self.paused:
+            return
+        self.flush_scheduled = True
+        self.loop.call_soon(self.flush)
+
+
+    def flush(self):
+        self.flush_scheduled = False
+        inbox = self.endpoint.inbox
+        while not self.paused and not self.transport.is_closing():
+            buffers = inbox.get_batch()
+            if not buffers:
+                break
+            self.transport.writelines(buffers)
+
+
+    def fileno(self):
+        return self.transport.get_extra_info('socket').fileno()
+
+    def pending_data(self):
+        return self.frame_reader.pending()
+
+
+    def close(self):
+        self.closing = True
+        self.transport.close()
+
+
+
+class AsyncioRuntime(Runtime):
+    name = RUNTIME_ASYNCIO
+
+    def __init__(self, loop=None, use_uvloop=False):
+        if loop is None:
+            if use_uvloop:
+                import uvloop
+                loop = uvloop.new_event_loop()
+                self.name = RUNTIME_UVLOOP
+            else:
+                loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        self.loop = loop
+        self.servers = []
+
+
+    def spawn(self, func, *args):
+        return self.loop.call_soon(func, *args)
+
+    def spawn_later(self, seconds, func, *args):
+        return self.loop.call_later(seconds, func, *args)
+
+    def cancel(self, handle):
+        handle.cancel()
+
+
+    def serve(self, port, handler, reuse_port=False):
+        server = self.loop.create_server(
+            lambda: AsyncioTransport(self.loop, handler), '0.0.0.0', port,
+            reuse_address=True, reuse_port=reuse_port or None)
+        if self.loop.is_running():
+            return asyncio.ensure_future(server, loop=self.loop)
+
+        server = self.loop.run_until_complete(server)
+        self.servers.append(server)
+        return server
+
+
+    def serve_unix(self, path, handler):
+        server = self.loop.create_unix_server(lambda: AsyncioTransport(self.loop, handler), path)
+        if self.loop.is_running():
+            return asyncio.ensure_future(server, loop=self.loop)
+
+        server = self.loop.run_until_complete(server)
+        self.servers.append(server)
+        return server
+
+
+    def connect_unix(self, path, handler):
+        connect = self.loop.create_unix_connection(lambda: AsyncioTransport(self.loop, handler), path)
+        return asyncio.ensure_future(connect, loop=self.loop)
+
+
+    def adopt(self, fd, handler, data=b''):
+        sock = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)
+        os.close(fd)
+        sock.setblocking(False)
+        connect = self.loop.connect_accepted_socket(lambda: AsyncioTransport(self.loop, handler, data), sock)
+        return asyncio.ensure_future(connect, loop=self.loop)
+
+
+    def add_reader(self, fd, callback):
+        self.loop.add_reader(fd, callback)
+
+
+    def run_forever(self):
+        self.loop.run_forever()
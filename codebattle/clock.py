@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+# Game time.
+#
+# All game timing (room timeouts, delays, cooldowns, scene ticks) goes through
+# the clock, never through time.time or the runtime timers directly.
+#
+#     RealClock:    wall clock time, timers are runtime timers
+#     VirtualClock: time only moves when a timer is due, it jumps straight to
+#                   the next timer once the callbacks already queued on the
+#                   runtime have run. For in process bot matches, far faster
+#                   than real time.
+#
+# Every endpoint with a peer out of the process (a tcp client) holds the
+# clock while it is connected, see EndPoint.start. A held VirtualClock follows
+# the wall clock, so network clients get the real room timeouts and
+# cooldowns. In process bots connect with codebattle.local.LocalTransport,
+# which does not hold the clock.
+
+import time
+import heapq
+
+from codebattle import runtime
+
+_clock = None
+
+
+class Clock(object):
+    def now(self):
+        """seconds"""
+        raise NotImplementedError()
+
+    def call_later(self, seconds, func, *args):
+        """call func(*args) after seconds of this clock. return a handle"""
+        raise NotImplementedError()
+
+    def cancel(self, handle):
+        """cancel a handle returned by call_later"""
+        raise NotImplementedError()
+
+
+    def hold(self):
+        """a peer out of the process connected, time must follow the wall clock until release"""
+        pass
+
+    def release(self):
+        pass
+
+
+
+class RealClock(Clock):
+    def now(self):
+        return time.time()
+
+    def call_later(self, seconds, func, *args):
+        return runtime.spawn_later(seconds, func, *args)
+
+    def cancel(self, handle):
+        runtime.cancel(handle)
+
+
+
+class VirtualTimer(object):
+    __slots__ = ('when', 'seq', 'func', 'args', 'cancelled')
+
+    def __init__(self, when, seq, func, args):
+        self.when = when
+        self.seq = seq
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+
+
+class VirtualClock(Clock):
+    def __init__(self, start=0.0, auto=True):
+        """
+
+        :param auto: advance by itself on the runtime, else call advance
+        """
+        self.time = start
+        self.auto = auto
+        self.timers = []
+        self.seq = 0
+        self.step_scheduled = False
+        # peers out of the process, time follows the wall clock while there are some
+        self.holds = 0
+        # (wall time, clock time) when the clock started to follow the wall clock
+        self.paced_from = None
+        # runtime timer of the next due timer, while held
+        self.step_handle = None
+        self.step_when = None
+
+
+    def now(self):
+        if self.holds:
+            wall, start = self.paced_from
+            self.time = max(self.time, start + time.time() - wall)
+        return self.time
+
+
+    def call_later(self, seconds, func, *args):
+        self.seq += 1
+        timer = VirtualTimer(self.now() + max(seconds, 0), self.seq, func, args)
+        heapq.heappush(self.timers, timer)
+        self._schedule_step()
+        return timer
+
+
+    def cancel(self, handle):
+        handle.cancelled = True
+
+
+    def hold(self):
+        self.holds += 1
+        if self.holds == 1:
+            self.paced_from = (time.time(), self.time)
+            self._schedule_step()
+
+
+    def release(self):
+        self.now()
+        self.holds -= 1
+        if self.holds == 0:
+            self._cancel_step_handle()
+            self._schedule_step()
+
+
+    def _next_when(self):
+        timers = self.timers
+        while timers and timers[0].cancelled:
+            heapq.heappop(timers)
+        return timers[0].when if timers else None
+
+
+    def _cancel_step_handle(self):
+        if self.step_handle is not None:
+            runtime.cancel(self.step_handle)
+            self.step_handle = None
+
+
+    def _schedule_step(self):
+        if not self.auto:
+            return
+        when = self._next_when()
+        if when is None:
+            return
+
+        if not self.holds:
+            if not self.step_scheduled:
+                self.step_scheduled = True
+                runtime.spawn(self._step)
+            return
+
+        # held, step when the next timer is due on the wall clock
+        if self.step_handle is not None and self.step_when <= when:
+            return
+        self._cancel_step_handle()
+        self.step_when = when
+        self.step_handle = runtime.spawn_later(max(when - self.now(), 0), self._step)
+
+
+    def _step(self):
+        self.step_scheduled = False
+        self.step_handle = None
+        if self.holds:
+            self.now()
+            self._run_due()
+        else:
+            self.advance()
+        self._schedule_step()
+
+
+    def advance(self):
+        """jump to the next timer, run every timer due then.
+
+        :return: False if there is no timer
+        """
+        when = self._next_when()
+        if when is None:
+            return False
+
+        self.time = max(self.time, when)
+        self._run_due()
+        return True
+
+
+    def _run_due(self):
+        timers = self.timers
+        while timers and timers[0].when <= self.time:
+            timer = heapq.heappop(timers)
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            timer.func(*timer.args)
+
+
+
+def set_clock(clock):
+    """
+    :param clock: Clock
+    """
+    global _clock
+    _clock = clock
+    return _clock
+
+
+def get_clock():
+    if _clock is None:
+        set_clock(RealClock())
+    return _clock
+
+
+def now():
+    return get_clock().now()
+
+def call_later(seconds, func, *args):
+    return get_clock().call_later(seconds, func, *args)
+
+def cancel(handle):
+    get_clock().cancel(handle)
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+
+# Hand written codec of the hot messages.
+#
+#     decode: player Cmd with MarineOperate, observer Cmd with MarineReport
+#     encode: Marine, player and observer SenceUpdate Message
+#
+# The bytes are the same as SerializeToString of the generated classes
+# (fields in number order, int32 as 64 bits varint when negative, floats as fixed32).
+# The decoders raise DecodeError for anything unusual (unknown fields or enum
+# values, missing required fields, repeated sub messages), the caller parses
+# the data again with the *_pb2 classes then, so errors stay the same.
+
+import struct
+
+from codebattle.protomsg import api_pb2, observer_pb2, marine_pb2
+
+from codebattle import wire
+
+FLOAT = struct.Struct('<f')
+
+# optional Marine fields, id hp position and status are required
+FIELD_TARGET_POSITION = 1
+FIELD_FLARES_AMOUNT = 2
+FIELD_ROLE = 4
+FIELDS_ALL = FIELD_TARGET_POSITION | FIELD_FLARES_AMOUNT | FIELD_ROLE
+
+MARINE_STATUS = frozenset(marine_pb2.Status.values())
+REPORT = frozenset(observer_pb2.ReportEnum.values())
+
+# tags, (field number << 3) | wire type
+TAG_1_VARINT = 0x08
+TAG_2_VARINT = 0x10
+TAG_4_VARINT = 0x20
+TAG_5_VARINT = 0x28
+TAG_6_VARINT = 0x30
+TAG_7_VARINT = 0x38
+TAG_1_FIXED32 = 0x0d
+TAG_2_FIXED32 = 0x15
+TAG_2_LENGTH = 0x12
+TAG_3_LENGTH = 0x1a
+TAG_4_LENGTH = 0x22
+TAG_5_LENGTH = 0x2a
+TAG_6_LENGTH = 0x32
+
+
+DecodeError = wire.DecodeError
+
+
+class Vector2(object):
+    __slots__ = ('x', 'z')
+
+    def __init__(self, x=0.0, z=0.0):
+        self.x = x
+        self.z = z
+
+
+class MarineOperate(object):
+    __slots__ = ('id', 'status', 'targetPostion')
+
+    def __init__(self):
+        self.id = 0
+        self.status = 0
+        # like the generated class, a missing sub message reads as the default one
+        self.targetPostion = Vector2()
+
+
+class MarineStatus(object):
+    __slots__ = ('id', 'status', 'position')
+
+    def __init__(self):
+        self.id = 0
+        self.status = 0
+        self.position = Vector2()
+
+
+class MarineReport(object):
+    __slots__ = ('report', 'midle', 'mattack', 'mdamage', 'reporterId', 'marines')
+
+    def __init__(self):
+        self.report = 0
+        self.midle = MarineStatus()
+        self.mattack = MarineStatus()
+        self.mdamage = MarineStatus()
+        self.reporterId = 0
+        self.marines = []
+
+
+
+# decode
+
+def _int32(value):
+    value &= 0xffffffff
+    if value & 0x80000000:
+        value -= 0x100000000
+    return value
+
+
+def _enum(value, values):
+    value = _int32(value)
+    if value not in values:
+        raise DecodeError("Unknown enum value {0}".format(value))
+    return value
+
+
+def _sub_message(data, pos):
+    length, pos = wire.read_varint(data, pos)
+    end = pos + length
+    if end > len(data):
+        raise DecodeError("Truncated message")
+    return pos, end
+
+
+def decode_vector2(data, pos, end):
+    v = Vector2()
+    seen = 0
+    while pos < end:
+        tag = data[pos]
+        if tag == TAG_1_FIXED32:
+            v.x = FLOAT.unpack_from(data, pos + 1)[0]
+            seen |= 1
+        elif tag == TAG_2_FIXED32:
+            v.z = FLOAT.unpack_from(data, pos + 1)[0]
+            seen |= 2
+        else:
+            raise DecodeError("Unexpected tag {0} in Vector2".format(tag))
+        pos += 5
+
+    if pos != end or seen != 3:
+        raise DecodeError("Bad Vector2")
+    return v
+
+
+def decode_marine_status(data, pos, end):
+    m = MarineStatus()
+    seen = 0
+    while pos < end:
+        tag = data[pos]
+        if tag == TAG_1_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            m.id = _int32(value)
+            seen |= 1
+        elif tag == TAG_2_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            m.status = _enum(value, MARINE_STATUS)
+            seen |= 2
+        elif tag == TAG_3_LENGTH and not seen & 4:
+            start, pos = _sub_message(data, pos + 1)
+            m.position = decode_vector2(data, start, pos)
+            seen |= 4
+        else:
+            raise DecodeError("Unexpected tag {0} in MarineStatus".format(tag))
+
+    if pos != end or seen != 7:
+        raise DecodeError("Bad MarineStatus")
+    return m
+
+
+def decode_marine_report(data, pos, end):
+    r = MarineReport()
+    seen = 0
+    while pos < end:
+        tag = data[pos]
+        if tag == TAG_1_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            r.report = _enum(value, REPORT)
+            seen |= 1
+        elif tag == TAG_5_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            r.reporterId = _int32(value)
+        elif tag == TAG_6_LENGTH:
+            start, pos = _sub_message(data, pos + 1)
+            r.marines.append(decode_marine_status(data, start, pos))
+        elif tag == TAG_2_LENGTH and not seen & 2:
+            start, pos = _sub_message(data, pos + 1)
+            r.midle = decode_marine_status(data, start, pos)
+            seen |= 2
+        elif tag == TAG_3_LENGTH and not seen & 4:
+            start, pos = _sub_message(data, pos + 1)
+            r.mattack = decode_marine_status(data, start, pos)
+            seen |= 4
+        elif tag == TAG_4_LENGTH and not seen & 8:
+            start, pos = _sub_message(data, pos + 1)
+            r.mdamage = decode_marine_status(data, start, pos)
+            seen |= 8
+        else:
+            raise DecodeError("Unexpected tag {0} in MarineReport".format(tag))
+
+    if pos != end or not seen & 1:
+        raise DecodeError("Bad MarineReport")
+    return r
+
+
+def decode_marine_operate(data, pos, end):
+    o = MarineOperate()
+    seen = 0
+    while pos < end:
+        tag = data[pos]
+        if tag == TAG_1_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            o.id = _int32(value)
+            seen |= 1
+        elif tag == TAG_2_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            o.status = _enum(value, MARINE_STATUS)
+            seen |= 2
+        elif tag == TAG_3_LENGTH and not seen & 4:
+            start, pos = _sub_message(data, pos + 1)
+            o.targetPostion = decode_vector2(data, start, pos)
+            seen |= 4
+        else:
+            raise DecodeError("Unexpected tag {0} in MarineOperate".format(tag))
+
+    if pos != end or seen & 3 != 3:
+        raise DecodeError("Bad MarineOperate")
+    return o
+
+
+def _decode_cmd(data, cmd, sub_tag, decode_sub):
+    """decode a Cmd of cmd with only the sub_tag sub message"""
+    cmd_value = None
+    sub = None
+    pos = 0
+    end = len(data)
+    while pos < end:
+        tag = data[pos]
+        if tag == TAG_1_VARINT:
+            value, pos = wire.read_varint(data, pos + 1)
+            cmd_value = _int32(value)
+        elif tag == sub_tag and sub is None:
+            start, pos = _sub_message(data, pos + 1)
+            sub = decode_sub(data, start, pos)
+        else:
+            raise DecodeError("Unexpected tag {0} in Cmd".format(tag))
+
+    if cmd_value != cmd or sub is None or pos != end:
+        raise DecodeError("Not a fast path Cmd")
+    return sub
+
+
+def _decode(data, cmd, sub_tag, decode_sub):
+    try:
+        return _decode_cmd(wire.byte_values(data), cmd, sub_tag, decode_sub)
+    except (struct.error, IndexError):
+        raise DecodeError("Truncated message")
+
+
+def decode_player_operate(data):
+    """
+    :return: MarineOperate of a player Cmd marineoperate
+    """
+    return _decode(data, api_pb2.marineoperate, TAG_4_LENGTH, decode_marine_operate)
+
+
+def decode_observer_report(data):
+    """
+    :return: MarineReport of an observer Cmd marinereport
+    """
+    return _decode(data, observer_pb2.marinereport, TAG_4_LENGTH, decode_marine_report)
+
+
+
+# encode
+
+def _varint_field(tag, value):
+    if value < 0:
+        value += 1 << 64
+    return bytes(bytearray((tag,))) + wire.encode_varint(value)
+
+
+def encode_vector2(x, z):
+    return b'\x0d' + FLOAT.pack(x) + b'\x15' + FLOAT.pack(z)
+
+
+def _vector2_field(tag, x, z):
+    return bytes(bytearray((tag, 10))) + encode_vector2(x, z)
+
+
+def encode_marine(marine, own=True, optional=FIELDS_ALL):
+    """same bytes as message.marine_obj_to_protobuf(marine, own, optional).SerializeToString()"""
+    parts = [
+        _varint_field(TAG_1_VARINT, marine.id),
+        _varint_field(TAG_2_VARINT, marine.hp),
+        _vector2_field(TAG_3_LENGTH, marine.position[0], marine.position[1]),
+        _varint_field(TAG_4_VARINT, marine.status),
+    ]
+
+    if own:
+        if optional & FIELD_TARGET_POSITION:
+            parts.append(_vector2_field(TAG_5_LENGTH, marine.target_position[0], marine.target_position[1]))
+        if optional & FIELD_FLARES_AMOUNT:
+            parts.append(_varint_field(TAG_6_VARINT, marine.flares_amount))
+
+    if optional & FIELD_ROLE:
+        parts.append(_varint_field(TAG_7_VARINT, marine.role))
+
+    return b''.join(parts)
+
+
+PLAYER_SENCE_UPDATE_HEAD = _varint_field(TAG_1_VARINT, api_pb2.senceupdate)
+OBSERVER_SENCE_UPDATE_HEAD = _varint_field(TAG_1_VARINT, observer_pb2.senceupdate)
+
+
+def encode_player_sence_update(own_marines, other_marines):
+    """
+    :param own_marines: serialized Marines
+    """
+    update = b''.join([wire.length_delimited(1, m) for m in own_marines] +
+                      [wire.length_delimited(2, m) for m in other_marines])
+    if not update:
+        return PLAYER_SENCE_UPDATE_HEAD
+    return PLAYER_SENCE_UPDATE_HEAD + wire.length_delimited(3, update)
+
+
+def encode_observer_sence_update(marines):
+    """
+    :param marines: serialized Marines
+    """
+    update = b''.join([wire.length_delimited(1, m) for m in marines])
+    if not update:
+        return OBSERVER_SENCE_UPDATE_HEAD
+    return OBSERVER_SENCE_UPDATE_HEAD + wire.length_delimited(3, update)
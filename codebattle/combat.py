@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# Server side gunattack.
+#
+# Without it the observer decides who a shot hits and reports it back as a
+# damage report. With it the room casts a ray from the shooter toward its
+# target position when a player orders GunAttack, the nearest enemy marine
+# within HIT_RADIUS of the ray and in sight (codebattle.sight) is hit, and
+# the room sends the same scene updates as for an observer damage report.
+# Damage and gunattack reports of the observer are ignored then.
+#
+# Rooms with a codebattle.store.MarineStore test all enemy marines in one
+# vectorized pass over the store arrays, other rooms gather the positions
+# first, or loop over the marines without numpy.
+
+import math
+
+from codebattle import message
+from codebattle.store import numpy
+
+# off by default, the observer resolves the shots
+SERVER_GUNATTACK = False
+# map units
+GUN_RANGE = 30.0
+HIT_RADIUS = 0.5
+# a shot goes through every marine on the ray, else stops at the first one
+GUN_PIERCE = False
+
+
+def ray_hits(origin, direction, xs, zs, gun_range=GUN_RANGE, hit_radius=HIT_RADIUS):
+    """indexes of the points hit by the ray, nearest first
+
+    :param origin: (x, z)
+    :param direction: (x, z) unit vector
+    :param xs: numpy array
+    """
+    px, pz = xs - origin[0], zs - origin[1]
+    along = px * direction[0] + pz * direction[1]
+    across = px * px + pz * pz - along * along
+    hit = (along >= 0) & (along <= gun_range) & (across <= hit_radius * hit_radius)
+    indexes = numpy.flatnonzero(hit)
+    return indexes[numpy.argsort(along[indexes], kind='stable')]
+
+
+def ray_hits_python(origin, direction, points, gun_range=GUN_RANGE, hit_radius=HIT_RADIUS):
+    """ray_hits without numpy
+
+    :param points: [(x, z)]
+    """
+    hits = []
+    for index, (x, z) in enumerate(points):
+        px, pz = x - origin[0], z - origin[1]
+        along = px * direction[0] + pz * direction[1]
+        if 0 <= along <= gun_range and px * px + pz * pz - along * along <= hit_radius * hit_radius:
+            hits.append((along, index))
+    hits.sort()
+    return [index for _, index in hits]
+
+
+class GunResolver(object):
+    def __init__(self, room, gun_range=GUN_RANGE, hit_radius=HIT_RADIUS, pierce=GUN_PIERCE):
+        """
+
+        :param room: codebattle.room.Room
+        """
+        self.room = room
+        self.gun_range = gun_range
+        self.hit_radius = hit_radius
+        self.pierce = pierce
+
+
+    def resolve(self, marine, player):
+        """marine of player just got the GunAttack status
+
+        :return: [Marine] hit
+        """
+        self.room.report_gunattack(marine, player)
+
+        victims = self.hits(marine, player)
+        for victim in victims:
+            owner = victim.player
+            victim.set_role(message.marine_pb2.Injured)
+            victim.got_damaged()
+            if victim.died:
+                owner.marine_die(victim)
+            self.room.report_damage(victim, owner)
+
+        if victims:
+            marine.set_role(message.marine_pb2.Attacker)
+            self.room.report_damage(marine, player)
+        return victims
+
+
+    def hits(self, marine, player):
+        x, z = marine.position
+        tx, tz = marine.target_position
+        distance = math.hypot(tx - x, tz - z)
+        if distance == 0:
+            return []
+        origin, direction = (x, z), ((tx - x) / distance, (tz - z) / distance)
+
+        if self.room.marine_store is not None:
+            victims = self.hits_store(self.room.marine_store, origin, direction, player)
+        else:
+            victims = self.hits_marines(origin, direction, player)
+
+        # obstacles stop the shot
+        terrain = self.room.terrain
+        victims = [v for v in victims if terrain.can_see(marine.position, v.position)]
+        if not self.pierce:
+            victims = victims[:1]
+        return victims
+
+
+    def hits_store(self, store, origin, direction, player):
+        enemies = [store.owner_index(p) for p in self.room.alive_players if p is not player]
+        rows = numpy.flatnonzero((store.column('hp') > 0) & numpy.isin(store.column('owner'), enemies))
+        indexes = ray_hits(origin, direction, store.x[rows], store.z[rows], self.gun_range, self.hit_radius)
+        return store.marines_of(rows[indexes])
+
+
+    def hits_marines(self, origin, direction, player):
+        enemies = []
+        for p in self.room.alive_players:
+            if p is not player:
+                enemies.extend(p.get_alive_marines())
+        if not enemies:
+            return []
+
+        if numpy is None:
+            indexes = ray_hits_python(origin, direction, [m.position for m in enemies], self.gun_range, self.hit_radius)
+        else:
+            positions = numpy.array([m.position for m in enemies], numpy.float64)
+            indexes = ray_hits(origin, direction, positions[:, 0], positions[:, 1], self.gun_range, self.hit_radius)
+        return [enemies[index] for index in indexes]
@@ -1,3 +1,6 @@
 #!/bin/bash
 
+# protoc older than 3.20, newer ones write modules the python 2 runtime can not load
 protoc --python_out=protomsg -Iprototol prototol/*.proto
+# python 3 has no implicit relative imports
+sed -i 's/^import \(.*_pb2\) as /from . import \1 as /' protomsg/*_pb2.py
@@ -4,25 +4,50 @@ __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
 
-import gevent
-from gevent.queue import Queue
+import logging
 
-import struct
+from codebattle import clock
+from codebattle import runtime
+from codebattle.framing import frame
+from codebattle.outbound import OutboundQueue, OUTBOUND_MAX_FRAMES, OUTBOUND_MAX_BYTES, OUTBOUND_POLICY, SEND_BATCH_SIZE
 
+logger = logging.getLogger('codebattle.endpoint')
 
-class EndPoint(gevent.Greenlet):
-    def __init__(self, transport):
+
+class EndPoint(object):
+    def __init__(self, transport, send_batch_size=SEND_BATCH_SIZE,
+                 outbound_max_frames=OUTBOUND_MAX_FRAMES, outbound_max_bytes=OUTBOUND_MAX_BYTES,
+                 outbound_policy=OUTBOUND_POLICY):
+        """
+
+        :param transport: a transport created by the runtime, see codebattle.runtime.Runtime.serve
+        """
         self.transport = transport
-        self.header_fmt = struct.Struct('>i')
-        self.inbox = Queue()
+        self.inbox = OutboundQueue(outbound_max_frames, outbound_max_bytes, outbound_policy, send_batch_size)
         self.room = None
-        self.jobs = []
+        # codebattle.scene.SceneState, for delta scene updates
+        self.scene_state = None
+        self.closed = False
+        self.links = []
+        # the clock held while a peer out of the process is connected
+        self.held_clock = None
 
-        gevent.Greenlet.__init__(self)
 
+    def put_data(self, data, key=None):
+        """queue data to send
+
+        :param key: set for scene updates, frames with the same key supersede each other
+        """
+        self.put_frame(frame(data), key)
 
-    def put_data(self, data):
-        self.inbox.put(data)
+
+    def put_frame(self, data, key=None):
+        """queue data already framed by codebattle.framing.frame"""
+        try:
+            self.inbox.put(data, key)
+        except self.inbox.Full:
+            logger.warning("EndPoint {0} outbound queue full, disconnect. {1}".format(id(self), self.inbox.stats))
+            runtime.spawn(self.terminate)
 
 
     def set_room(self, room):
@@ -33,31 +58,13 @@ class EndPoint(gevent.Greenlet):
         self.room = room
 
 
-    def recv_data(self):
-        while True:
-            try:
-                length = self.transport.recv(4)
-                if not length:
-                    self.on_connection_closed()
-                    break
-
-                length = self.header_fmt.unpack(length)[0]
-                data = self.transport.recv(length)
-            except:
-                self.on_connection_lost()
-                break
+    def link(self, callback):
+        """callback(endpoint) will be called after the endpoint terminated"""
+        self.links.append(callback)
 
-            self.on_data(data)
-
-
-    def send_data(self):
-        while True:
-            data = self.inbox.get()
-            data_length = len(data)
-            fmt = '>i%ds' % data_length
-            data_struct = struct.Struct(fmt)
-            data = data_struct.pack(data_length, data)
-            self.transport.sendall(data)
+    def unlink(self, callback):
+        if callback in self.links:
+            self.links.remove(callback)
 
 
     def on_connection_closed(self):
@@ -69,26 +76,31 @@ class EndPoint(gevent.Greenlet):
         raise NotImplementedError()
 
     def on_data(self, data):
-        """called when data received. (stripped the 4 bytes header)"""
+        """called when data received. (stripped the 4 bytes header)
+
+        data is a memoryview on the receive buffer, only valid during this call.
+        """
         raise NotImplementedError()
 
 
-    def terminate(self):
-        gevent.killall(self.jobs)
-        self.transport.close()
-        self.kill()
+    def start(self):
+        if not getattr(self.transport, 'in_process', False):
+            self.held_clock = clock.get_clock()
+            self.held_clock.hold()
+        self.transport.start(self)
 
-    def _run(self):
-        job_recv = gevent.spawn(self.recv_data)
-        job_send = gevent.spawn(self.send_data)
 
-        def _exit(glet):
-            job_recv.unlink(_exit)
-            job_send.unlink(_exit)
-            self.terminate()
+    def terminate(self):
+        if self.closed:
+            return
 
-        job_recv.link(_exit)
-        job_send.link(_exit)
+        self.closed = True
+        self.inbox.close()
+        self.transport.close()
+        if self.held_clock is not None:
+            self.held_clock.release()
+            self.held_clock = None
 
-        self.jobs.append(job_recv)
-        self.jobs.append(job_send)
+        links, self.links = self.links, []
+        for callback in links:
+            runtime.spawn(callback, self)
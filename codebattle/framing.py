@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import struct
+
+HEADER = struct.Struct('>i')
+
+RECV_BUFFER_SIZE = 64 * 1024
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+class FrameError(Exception):
+    pass
+
+
+def frame(data):
+    """prefix data with the 4 bytes length header. the result can be shared by every receiver"""
+    return HEADER.pack(len(data)) + data
+
+
+class FrameReader(object):
+    """Split a byte stream into frames of 4 bytes big-endian length + payload.
+
+    Data is received straight into a preallocated bytearray with recv_into,
+    and every complete frame in it is sliced out as a memoryview.
+    A frame is only valid until the next recv_into call.
+    """
+    FrameError = FrameError
+
+    def __init__(self, buffer_size=RECV_BUFFER_SIZE, max_frame_size=MAX_FRAME_SIZE):
+        self.buffer_size = buffer_size
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray(buffer_size)
+        self.start = 0
+        self.end = 0
+
+
+    def _frame_length(self, offset):
+        length = HEADER.unpack_from(self.buffer, offset)[0]
+        if length < 0 or length > self.max_frame_size:
+            raise self.FrameError("Invalid frame length {0}".format(length))
+        return length
+
+
+    def _reserve(self):
+        # make sure the pending frame fits in the buffer behind self.start.
+        # never resize the bytearray in place, frames handed out may still hold a view on it.
+        pending = self.end - self.start
+        if not pending:
+            self.start = self.end = 0
+            if len(self.buffer) > self.buffer_size:
+                self.buffer = bytearray(self.buffer_size)
+            return
+
+        needed = HEADER.size
+        if pending >= HEADER.size:
+            needed += self._frame_length(self.start)
+
+        if len(self.buffer) - self.start >= needed:
+            return
+
+        if len(self.buffer) >= needed:
+            self.buffer[:pending] = self.buffer[self.start:self.end]
+        else:
+            buf = bytearray(max(needed, len(self.buffer) * 2))
+            buf[:pending] = self.buffer[self.start:self.end]
+            self.buffer = buf
+
+        self.start = 0
+        self.end = pending
+
+
+    def get_buffer(self):
+        """writable view on the free space of the buffer"""
+        self._reserve()
+        return memoryview(self.buffer)[self.end:]
+
+
+    def buffer_updated(self, nbytes):
+        """nbytes were written into the view returned by get_buffer"""
+        self.end += nbytes
+
+
+    def recv_into(self, transport):
+        """read once from transport. return the amount of bytes received, 0 means peer closed"""
+        received = transport.recv_into(self.get_buffer())
+        self.buffer_updated(received)
+        return received
+
+
+    def feed(self, data):
+        """append bytes received elsewhere"""
+        data_length = len(data)
+        if len(self.buffer) - self.end < data_length:
+            pending = self.end - self.start
+            buf = bytearray(max(len(self.buffer), pending + data_length))
+            buf[:pending] = self.buffer[self.start:self.end]
+            self.buffer = buf
+            self.start = 0
+            self.end = pending
+
+        self.buffer[self.end:self.end + data_length] = data
+        self.end += data_length
+
+
+    def pending(self):
+        """bytes received but not consumed as frames yet"""
+        return bytes(self.buffer[self.start:self.end])
+
+
+    def frames(self):
+        """yield every complete frame in the buffer (stripped the 4 bytes header)"""
+        view = memoryview(self.buffer)
+        while self.end - self.start >= HEADER.size:
+            frame_start = self.start + HEADER.size
+            frame_end = frame_start + self._frame_length(self.start)
+            if frame_end > self.end:
+                break
+
+            self.start = frame_end
+            yield view[frame_start:frame_end]
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+
+# Gateway mode.
+#
+# The gateway process holds every player and observer tcp connection.
+# It only reads the frame header and the cmd enum of the first frames to pick
+# a room worker, then forwards the frames of the connection to that worker.
+# A joinroom of a room on another worker, or of the matchmaking queue, moves
+# the connection to that worker, the old one gets IPC_CLOSED.
+#
+# Room workers connect to the gateway over a unix socket, so they can be
+# started and stopped while the gateway keeps the client connections.
+# Every frame on the link is
+#
+#     IPC_HEADER(kind, connection id) + payload
+#
+# gateway -> worker: IPC_HELLO, IPC_OBSERVER_DATA, IPC_PLAYER_DATA, IPC_CLOSED
+# worker -> gateway: IPC_SEND, IPC_CLOSED, IPC_ROOM_OPEN, IPC_ROOM_CLOSE
+
+import os
+import struct
+import logging
+
+from codebattle import runtime
+from codebattle import worker
+from codebattle import message
+from codebattle.endpoint import EndPoint
+from codebattle.framing import frame
+from codebattle.room import RoomManager
+
+logger = logging.getLogger('codebattle.gateway')
+
+GATEWAY_LINK_PATH = '/tmp/codebattle-gateway.sock'
+# room ids are encoded with the worker slot, see codebattle.worker.owner_of
+GATEWAY_MAX_WORKERS = 64
+
+# the link carries the frames of many clients, never drop it for a burst
+LINK_MAX_FRAMES = 1024 * 1024
+LINK_MAX_BYTES = 256 * 1024 * 1024
+
+IPC_HEADER = struct.Struct('>BI')
+
+IPC_HELLO = 1           # connection id is the worker slot
+IPC_OBSERVER_DATA = 2
+IPC_PLAYER_DATA = 3
+IPC_SEND = 4            # payload is framed already, write it to the client as is
+IPC_CLOSED = 5
+IPC_ROOM_OPEN = 6       # connection id is the room id
+IPC_ROOM_CLOSE = 7
+
+
+class Link(EndPoint):
+    """a gateway <-> room worker unix connection"""
+    def __init__(self, transport):
+        super(Link, self).__init__(transport, outbound_max_frames=LINK_MAX_FRAMES, outbound_max_bytes=LINK_MAX_BYTES)
+
+
+    def send(self, kind, conn_id, payload=b''):
+        self.put_frame(frame(IPC_HEADER.pack(kind, conn_id) + payload))
+
+
+    def on_connection_closed(self):
+        logger.info("Link {0} closed".format(id(self)))
+
+    def on_connection_lost(self):
+        logger.warning("Link {0} lost".format(id(self)))
+
+
+    def on_data(self, data):
+        kind, conn_id = IPC_HEADER.unpack_from(data)
+        self.on_ipc(kind, conn_id, data[IPC_HEADER.size:])
+
+
+    def on_ipc(self, kind, conn_id, payload):
+        raise NotImplementedError()
+
+
+
+# gateway side
+
+class ClientConnection(EndPoint):
+    """a player or observer tcp connection held by the gateway"""
+    def __init__(self, transport, gateway, conn_id, kind):
+        super(ClientConnection, self).__init__(transport)
+        self.gateway = gateway
+        self.id = conn_id
+        self.kind = kind
+        self.worker_link = None
+
+
+    def on_connection_closed(self):
+        logger.info("Client {0} closed the connection".format(self.id))
+
+    def on_connection_lost(self):
+        logger.info("Client {0} lost".format(self.id))
+
+
+    def on_data(self, data):
+        if self.worker_link is not None:
+            link = self.gateway.join_link(self, data)
+            if link is not None and link is not self.worker_link:
+                logger.info("Client {0} moves to room worker {1}".format(self.id, link.slot))
+                self.unbind()
+
+        if self.worker_link is None:
+            self.worker_link = self.gateway.route(self, data)
+            if self.worker_link is None:
+                logger.warning("Client {0} no room worker available, drop data".format(self.id))
+                return
+            self.worker_link.clients.add(self.id)
+
+        self.worker_link.send(self.kind, self.id, memoryview(data).tobytes())
+
+
+    def unbind(self, notify=True):
+        if self.worker_link is None:
+            return
+        if notify:
+            self.worker_link.send(IPC_CLOSED, self.id)
+        self.worker_link.clients.discard(self.id)
+        self.worker_link = None
+
+
+
+class WorkerLink(Link):
+    def __init__(self, transport, gateway, slot):
+        super(WorkerLink, self).__init__(transport)
+        self.gateway = gateway
+        self.slot = slot
+        self.clients = set()
+        self.rooms = set()
+
+
+    def on_ipc(self, kind, conn_id, payload):
+        if kind == IPC_SEND:
+            client = self.gateway.clients.get(conn_id)
+            if client is not None:
+                client.put_frame(memoryview(payload).tobytes())
+            return
+
+        if kind == IPC_CLOSED:
+            client = self.gateway.clients.get(conn_id)
+            if client is not None and client.worker_link is self:
+                client.unbind(notify=False)
+                client.terminate()
+            return
+
+        if kind == IPC_ROOM_OPEN:
+            self.rooms.add(conn_id)
+            self.gateway.rooms[conn_id] = self
+            return
+
+        if kind == IPC_ROOM_CLOSE:
+            self.rooms.discard(conn_id)
+            if self.gateway.rooms.get(conn_id) is self:
+                self.gateway.rooms.pop(conn_id)
+            return
+
+        logger.warning("WorkerLink {0} unknown ipc kind {1}".format(self.slot, kind))
+
+
+
+class Gateway(object):
+    def __init__(self, observer_port, player_port, link_path=GATEWAY_LINK_PATH):
+        self.observer_port = observer_port
+        self.player_port = player_port
+        self.link_path = link_path
+        self.next_conn_id = 0
+        self.clients = {}
+        self.workers = {}
+        self.rooms = {}
+
+
+    def _client_handler(self, transport, kind):
+        self.next_conn_id = (self.next_conn_id + 1) & 0xffffffff
+        conn_id = self.next_conn_id
+        logger.info("New Connection {0} From {1}".format(conn_id, transport.address))
+
+        client = ClientConnection(transport, self, conn_id, kind)
+        client.link(self.client_terminated)
+        self.clients[conn_id] = client
+        client.start()
+
+
+    def client_terminated(self, client):
+        self.clients.pop(client.id, None)
+        client.unbind()
+
+
+    def _worker_handler(self, transport):
+        for slot in range(GATEWAY_MAX_WORKERS):
+            if slot not in self.workers:
+                break
+        else:
+            logger.error("Too many room workers, reject")
+            transport.close()
+            return
+
+        link = WorkerLink(transport, self, slot)
+        link.link(self.worker_terminated)
+        self.workers[slot] = link
+        link.start()
+        link.send(IPC_HELLO, slot)
+        logger.info("Room worker {0} joined".format(slot))
+
+
+    def worker_terminated(self, link):
+        """clients of the worker stay connected, they can join another room"""
+        self.workers.pop(link.slot, None)
+        for room_id in link.rooms:
+            if self.rooms.get(room_id) is link:
+                self.rooms.pop(room_id)
+
+        for conn_id in list(link.clients):
+            client = self.clients.get(conn_id)
+            if client is not None:
+                client.unbind(notify=False)
+        logger.warning("Room worker {0} left, {1} rooms lost".format(link.slot, len(link.rooms)))
+
+
+    def least_loaded_worker(self):
+        if not self.workers:
+            return None
+        return min(self.workers.values(), key=lambda link: len(link.clients))
+
+
+    def matchmaking_worker(self):
+        """the queue is in one room worker, the lowest slot"""
+        if not self.workers:
+            return None
+        return self.workers[min(self.workers)]
+
+
+    def join_link(self, client, data):
+        """the worker link a joinroom frame of client must go to, None for any worker or another cmd"""
+        cmd = message.peek_cmd(data)
+        if client.kind == IPC_PLAYER_DATA and cmd == message.PLAYER_JOIN_ROOM:
+            room_id = message.player.decode_join_room(data).roomid
+        elif client.kind == IPC_OBSERVER_DATA and cmd == message.OBSERVER_JOIN_ROOM:
+            room_id = message.observer.decode_join_room(data).roomid
+        else:
+            return None
+
+        if room_id <= 0:
+            return self.matchmaking_worker()
+        return self.rooms.get(room_id)
+
+
+    def route(self, client, data):
+        """pick the worker link of the first frame of client"""
+        link = self.join_link(client, data)
+        if link is not None:
+            return link
+
+        # a new room, or an unknown one. the worker answers the errors
+        return self.least_loaded_worker()
+
+
+    def start(self):
+        if os.path.exists(self.link_path):
+            os.unlink(self.link_path)
+
+        logger.info("Gateway Observer Listen at port {0}".format(self.observer_port))
+        runtime.serve(self.observer_port, lambda transport: self._client_handler(transport, IPC_OBSERVER_DATA))
+        logger.info("Gateway Player Listen at port {0}".format(self.player_port))
+        runtime.serve(self.player_port, lambda transport: self._client_handler(transport, IPC_PLAYER_DATA))
+        logger.info("Gateway Link Listen at {0}".format(self.link_path))
+        runtime.serve_unix(self.link_path, self._worker_handler)
+
+
+
+# room worker side
+
+class LinkTransport(object):
+    """the transport of an endpoint living in a room worker, its frames go through the gateway link"""
+    # the gateway holds the client socket
+    has_socket = False
+
+    def __init__(self, link, conn_id):
+        self.link = link
+        self.conn_id = conn_id
+        self.address = 'gateway:{0}'.format(conn_id)
+        self.endpoint = None
+        self.flush_scheduled = False
+        # the gateway closed the client
+        self.peer_closed = False
+
+
+    def start(self, endpoint):
+        self.endpoint = endpoint
+        endpoint.inbox.on_ready = self.schedule_flush
+
+
+    def schedule_flush(self):
+        if self.flush_scheduled:
+            return
+        self.flush_scheduled = True
+        runtime.spawn(self.flush)
+
+
+    def flush(self):
+        self.flush_scheduled = False
+        inbox = self.endpoint.inbox
+        while True:
+            buffers = inbox.get_batch()
+            if not buffers:
+                break
+            self.link.send(IPC_SEND, self.conn_id, b''.join(buffers))
+
+
+    def fileno(self):
+        return None
+
+    def pending_data(self):
+        return b''
+
+
+    def close(self):
+        self.link.endpoints.pop(self.conn_id, None)
+        if self.peer_closed:
+            return
+
+        # the inbox is closed already, send what is left before closing the client
+        inbox = self.endpoint.inbox
+        buffers = []
+        while not inbox.empty():
+            buffers.append(inbox.get_nowait())
+        if buffers:
+            self.link.send(IPC_SEND, self.conn_id, b''.join(buffers))
+        self.link.send(IPC_CLOSED, self.conn_id)
+
+
+
+class GatewayLink(Link):
+    def __init__(self, transport, endpoint_classes):
+        super(GatewayLink, self).__init__(transport)
+        self.endpoint_classes = endpoint_classes
+        self.endpoints = {}
+
+
+    def on_ipc(self, kind, conn_id, payload):
+        if kind == IPC_HELLO:
+            worker.worker_index = conn_id
+            worker.worker_count = GATEWAY_MAX_WORKERS
+            logger.info("Room worker got slot {0}".format(conn_id))
+            return
+
+        if kind == IPC_CLOSED:
+            endpoint = self.endpoints.pop(conn_id, None)
+            if endpoint is not None:
+                endpoint.transport.peer_closed = True
+                endpoint.on_connection_closed()
+                endpoint.terminate()
+            return
+
+        endpoint = self.endpoints.get(conn_id)
+        if endpoint is None:
+            endpoint = self.endpoint_classes[kind](LinkTransport(self, conn_id))
+            self.endpoints[conn_id] = endpoint
+            endpoint.start()
+
+        try:
+            endpoint.on_data(payload)
+        except Exception:
+            logger.exception("Connection {0} failed to handle data".format(conn_id))
+            endpoint.terminate()
+
+
+    def room_created(self, room):
+        self.send(IPC_ROOM_OPEN, room.id)
+
+    def room_destroyed(self, room):
+        self.send(IPC_ROOM_CLOSE, room.id)
+
+
+
+class RoomWorker(object):
+    def __init__(self, link_path=GATEWAY_LINK_PATH):
+        self.link_path = link_path
+        self.link = None
+
+
+    def _connected(self, transport):
+        from codebattle.observer import Observer
+        from codebattle.player import Player
+
+        self.link = GatewayLink(transport, {IPC_OBSERVER_DATA: Observer, IPC_PLAYER_DATA: Player})
+        self.link.link(self._disconnected)
+        RoomManager.listeners.append(self.link)
+        self.link.start()
+        logger.info("Room worker connected to gateway {0}".format(self.link_path))
+
+
+    def _disconnected(self, link):
+        RoomManager.listeners.remove(link)
+        for endpoint in list(link.endpoints.values()):
+            endpoint.transport.peer_closed = True
+            endpoint.terminate()
+        logger.warning("Room worker lost the gateway")
+
+
+    def start(self):
+        runtime.connect_unix(self.link_path, self._connected)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+import gevent
+from gevent import socket
+from gevent.event import Event
+from gevent.server import StreamServer
+
+import os
+import logging
+
+from codebattle.framing import FrameReader
+from codebattle.runtime import Runtime, RUNTIME_GEVENT
+
+logger = logging.getLogger('codebattle.runtime')
+
+
+class GeventTransport(object):
+    """Drive an EndPoint over a gevent socket with one recv and one send greenlet"""
+    has_socket = True
+
+    def __init__(self, sock, address, data=b''):
+        self.sock = sock
+        self.address = address
+        self.frame_reader = FrameReader()
+        if data:
+            self.frame_reader.feed(data)
+        self.endpoint = None
+        self.outbound_ready = Event()
+        self.closed = Event()
+        self.jobs = []
+
+
+    def recv_data(self):
+        endpoint = self.endpoint
+        reader = self.frame_reader
+        while True:
+            try:
+                for data in reader.frames():
+                    endpoint.on_data(data)
+                    if endpoint.closed:
+                        return
+            except reader.FrameError as e:
+                logger.warning("EndPoint {0} {1}".format(id(endpoint), e))
+                endpoint.on_connection_lost()
+                break
+
+            try:
+                received = reader.recv_into(self.sock)
+            except:
+                endpoint.on_connection_lost()
+                break
+
+            if not received:
+                endpoint.on_connection_closed()
+                break
+
+
+    def send_data(self):
+        inbox = self.endpoint.inbox
+        while True:
+            buffers = inbox.get_batch()
+            if buffers:
+                self.sendall_buffers(buffers)
+                continue
+
+            if inbox.closed:
+                break
+
+            self.outbound_ready.clear()
+            self.outbound_ready.wait()
+
+
+    def sendall_buffers(self, buffers):
+        """send all buffers, with one writev when the socket supports sendmsg"""
+        sendmsg = getattr(self.sock, 'sendmsg', None)
+        if sendmsg is None:
+            self.sock.sendall(b''.join(buffers))
+            return
+
+        while buffers:
+            sent = sendmsg(buffers)
+            for index, buf in enumerate(buffers):
+                if sent < len(buf):
+                    buffers = buffers[index:]
+                    buffers[0] = memoryview(buf)[sent:]
+                    break
+                sent -= len(buf)
+            else:
+                buffers = []
+
+
+    def start(self, endpoint):
+        """
+
+        :param endpoint: codebattle.endpoint.EndPoint
+        """
+        self.endpoint = endpoint
+        endpoint.inbox.on_ready = self.outbound_ready.set
+
+        job_recv = gevent.spawn(self.recv_data)
+        job_send = gevent.spawn(self.send_data)
+
+        def _exit(glet):
+            job_recv.unlink(_exit)
+            job_send.unlink(_exit)
+            endpoint.terminate()
+
+        job_recv.link(_exit)
+        job_send.link(_exit)
+
+        self.jobs.append(job_recv)
+        self.jobs.append(job_send)
+
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def pending_data(self):
+        return self.frame_reader.pending()
+
+
+    def close(self):
+        current = gevent.getcurrent()
+        gevent.killall([job for job in self.jobs if job is not current], block=False)
+        self.sock.close()
+        self.closed.set()
+
+
+
+class GeventRuntime(Runtime):
+    name = RUNTIME_GEVENT
+
+    def spawn(self, func, *args):
+        return gevent.spawn(func, *args)
+
+    def spawn_later(self, seconds, func, *args):
+        return gevent.spawn_later(seconds, func, *args)
+
+    def cancel(self, handle):
+        if handle is not gevent.getcurrent():
+            handle.kill(block=False)
+
+
+    def serve(self, port, handler, reuse_port=False):
+        def _connection_handler(client, address):
+            transport = GeventTransport(client, address)
+            handler(transport)
+            # StreamServer closes the socket when this returns
+            transport.closed.wait()
+
+        listener = ('0.0.0.0', port)
+        if reuse_port:
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            listener.bind(('0.0.0.0', port))
+            listener.listen(StreamServer.backlog or 256)
+
+        server = StreamServer(listener, _connection_handler)
+        server.start()
+        return server
+
+
+    def serve_unix(self, path, handler):
+        def _connection_handler(client, address):
+            transport = GeventTransport(client, path)
+            handler(transport)
+            transport.closed.wait()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(StreamServer.backlog or 256)
+
+        server = StreamServer(listener, _connection_handler)
+        server.start()
+        return server
+
+
+    def connect_unix(self, path, handler):
+        def _connect():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+            handler(GeventTransport(sock, path))
+
+        return gevent.spawn(_connect)
+
+
+    def adopt(self, fd, handler, data=b''):
+        sock = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)
+        os.close(fd)
+        transport = GeventTransport(sock, sock.getpeername(), data)
+        handler(transport)
+        return transport
+
+
+    def add_reader(self, fd, callback):
+        watcher = gevent.get_hub().loop.io(fd, 1)
+        watcher.start(gevent.spawn, callback)
+        return watcher
+
+
+    def run_forever(self):
+        gevent.wait()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# In process connections.
+#
+# A LocalTransport connects an endpoint (Player or Observer) to a bot living
+# in the server process, frames go through runtime callbacks instead of a
+# socket. The bot sends serialized Cmds with send and gets every serialized
+# Message in receiver. A LocalTransport does not hold the clock, so a match
+# of in process bots runs on a codebattle.clock.VirtualClock as fast as the
+# callbacks allow.
+#
+#     transport = LocalTransport(bot.on_message)
+#     Player(transport).start()
+#     transport.send(cmd.SerializeToString())
+
+import logging
+
+from codebattle import runtime
+from codebattle.framing import FrameReader
+
+logger = logging.getLogger('codebattle.local')
+
+
+class LocalTransport(object):
+    in_process = True
+    has_socket = False
+
+    def __init__(self, receiver, address='local'):
+        """
+
+        :param receiver: receiver(data), called with every message sent to the bot
+        """
+        self.receiver = receiver
+        self.address = address
+        self.endpoint = None
+        self.frame_reader = FrameReader()
+        self.flush_scheduled = False
+        self.closed = False
+
+
+    def start(self, endpoint):
+        self.endpoint = endpoint
+        endpoint.inbox.on_ready = self.schedule_flush
+
+
+    def send(self, data):
+        """the bot sends a message to the endpoint"""
+        runtime.spawn(self._deliver, data)
+
+
+    def _deliver(self, data):
+        endpoint = self.endpoint
+        if endpoint.closed:
+            return
+        try:
+            endpoint.on_data(data)
+        except Exception:
+            logger.exception("Local connection {0} failed to handle data".format(self.address))
+            endpoint.terminate()
+
+
+    def schedule_flush(self):
+        if self.flush_scheduled:
+            return
+        self.flush_scheduled = True
+        runtime.spawn(self.flush)
+
+
+    def flush(self):
+        self.flush_scheduled = False
+        inbox = self.endpoint.inbox
+        while True:
+            buffers = inbox.get_batch()
+            if not buffers:
+                break
+            self._receive(buffers)
+
+
+    def _receive(self, buffers):
+        self.frame_reader.feed(b''.join(buffers))
+        for data in self.frame_reader.frames():
+            self.receiver(data.tobytes())
+
+
+    def disconnect(self):
+        """the bot closes the connection"""
+        endpoint = self.endpoint
+        if not endpoint.closed:
+            endpoint.on_connection_closed()
+            endpoint.terminate()
+
+
+    def fileno(self):
+        return None
+
+    def pending_data(self):
+        return b''
+
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # the inbox is closed already, the bot still gets what is left
+        inbox = self.endpoint.inbox
+        buffers = []
+        while not inbox.empty():
+            buffers.append(inbox.get_nowait())
+        if buffers:
+            self._receive(buffers)
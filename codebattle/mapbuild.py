@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Offline tables of the terrain maps.
+#
+# The path tables (codebattle.pathing) and the sight tables
+# (codebattle.sight) are built with the maps, the server only loads them.
+# After writing or changing maps run
+#
+#     python -m codebattle.mapbuild MAP_DIR [map_id ...]
+#
+# it builds the tables of the given maps, of every <map_id>.map in MAP_DIR
+# by default.
+
+import os
+import sys
+import logging
+
+from codebattle import maps
+from codebattle import pathing
+from codebattle import sight
+
+logger = logging.getLogger('codebattle.mapbuild')
+
+
+def build_tables(terrain_map):
+    """save the tables of a map file next to it
+
+    :param terrain_map: codebattle.maps.TerrainMap, loaded from a file
+    """
+    maps.save_table(terrain_map.table_path('.path'), pathing.build(terrain_map))
+    maps.save_table(terrain_map.table_path('.los'), sight.build(terrain_map))
+
+
+def build_map(path, width, height, cell_size, obstacles):
+    """write a map file and its tables, see codebattle.maps.write_map"""
+    maps.write_map(path, width, height, cell_size, obstacles)
+    terrain_map = maps.TerrainMap.load(os.path.splitext(os.path.basename(path))[0], path)
+    try:
+        build_tables(terrain_map)
+    finally:
+        terrain_map.close()
+
+
+def build_map_dir(map_dir, map_ids=None):
+    """
+    :param map_ids: the maps to build, default every map file in map_dir
+    :return: the number of maps built
+    """
+    if map_ids is None:
+        map_ids = sorted(os.path.splitext(name)[0] for name in os.listdir(map_dir) if name.endswith('.map'))
+
+    for map_id in map_ids:
+        path = os.path.join(map_dir, '{0}.map'.format(map_id))
+        terrain_map = maps.TerrainMap.load(map_id, path)
+        try:
+            build_tables(terrain_map)
+        finally:
+            terrain_map.close()
+        logger.info("Map {0} tables built".format(map_id))
+
+    return len(map_ids)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        sys.stderr.write("usage: python -m codebattle.mapbuild MAP_DIR [map_id ...]\n")
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s:  %(message)s')
+    build_map_dir(argv[0], argv[1:] or None)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
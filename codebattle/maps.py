@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Terrain maps.
+#
+# A map file MAP_DIR/<map_id>.map is
+#
+#     MAP_HEADER(magic, version, width, height, cell size)
+#     obstacles: width * height bytes, 0 is free
+#
+# the grid is row major, the cell (cx, cz) is at cz * width + cx.
+# Files are mmapped read only and kept in a process wide LRU cache, every
+# room on a map shares one TerrainMap. The pages are the page cache of the
+# file, forked workers share them too.
+# The tables built from a map (codebattle.pathing, codebattle.sight) are
+# written offline with codebattle.mapbuild, next to the map file.
+# A map without a file is the default map, DEFAULT_MAP_SIZE cells of 1 unit
+# without obstacles.
+#
+# MAP_DIR is off by default, every room plays the default map. Set it with
+# CodeBattle(map_dir=...) before the server starts.
+
+import os
+import mmap
+import zlib
+import struct
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger('codebattle.maps')
+
+# None only has the default map
+MAP_DIR = None
+MAP_CACHE_SIZE = 32
+DEFAULT_MAP_SIZE = (50, 50)
+
+MAP_MAGIC = b'CBMP'
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct('<4sHHHf')
+
+
+class MapFormatError(Exception):
+    pass
+
+
+class TerrainMap(object):
+    FormatError = MapFormatError
+
+    def __init__(self, map_id, width, height, cell_size, data, offset=0, mm=None, path=None):
+        """
+
+        :param data: buffer with the obstacles at offset
+        :param mm: the mmap holding data, closed with the map
+        :param path: the map file, None for the default map
+        """
+        self.map_id = map_id
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.size = (width * cell_size, height * cell_size)
+        self.data = data
+        self.obstacles_offset = offset
+        self.mm = mm
+        self.path = path
+        # codebattle.pathing.PathTable, loaded on the first path query
+        self.paths = None
+        # codebattle.sight.SightTable, loaded on the first sight query
+        self.sight = None
+
+
+    @classmethod
+    def default(cls, map_id):
+        width, height = DEFAULT_MAP_SIZE
+        return cls(map_id, width, height, 1, bytes(bytearray(width * height)))
+
+
+    @classmethod
+    def load(cls, map_id, path):
+        mm = map_file(path)
+        if mm is None:
+            raise MapFormatError("{0} is empty".format(path))
+
+        try:
+            if len(mm) < MAP_HEADER.size:
+                raise MapFormatError("{0} too short".format(path))
+            magic, version, width, height, cell_size = MAP_HEADER.unpack_from(mm)
+            if magic != MAP_MAGIC or version != MAP_VERSION:
+                raise MapFormatError("{0} not a version {1} map".format(path, MAP_VERSION))
+            if len(mm) != MAP_HEADER.size + width * height or cell_size <= 0:
+                raise MapFormatError("{0} bad size".format(path))
+        except Exception:
+            mm.close()
+            raise
+
+        return cls(map_id, width, height, cell_size, mm, MAP_HEADER.size, mm, path)
+
+
+    @property
+    def checksum(self):
+        """crc32 of the map file, tables built from the map keep it"""
+        if self.path is None:
+            return 0
+        return zlib.crc32(self.data) & 0xffffffff
+
+
+    def table_path(self, extension):
+        """the file of a table built from the map, next to the map file. None for the default map"""
+        if self.path is None:
+            return None
+        return os.path.splitext(self.path)[0] + extension
+
+
+    def close(self):
+        if self.paths is not None:
+            self.paths.close()
+        if self.sight is not None:
+            self.sight.close()
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+    def cell_of(self, x, z):
+        """the cell of a map position, clamped to the map"""
+        cx = min(max(int(x // self.cell_size), 0), self.width - 1)
+        cz = min(max(int(z // self.cell_size), 0), self.height - 1)
+        return cx, cz
+
+
+    def blocked(self, cx, cz):
+        return self.data[self.obstacles_offset + cz * self.width + cx] not in (0, b'\x00')
+
+    def blocked_at(self, x, z):
+        return self.blocked(*self.cell_of(x, z))
+
+
+
+def map_file(path):
+    """mmap a file read only
+
+    :return: mmap, None for an empty file
+    """
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+
+def save_table(path, data):
+    """write a table file atomically"""
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.rename(path + '.tmp', path)
+
+
+def write_map(path, width, height, cell_size, obstacles):
+    """write a map file
+
+    :param obstacles: width * height ints, row major, 0 is free
+    """
+    if len(obstacles) != width * height:
+        raise MapFormatError("obstacles must have width * height cells")
+
+    with open(path, 'wb') as f:
+        f.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, width, height, cell_size))
+        f.write(bytes(bytearray(1 if o else 0 for o in obstacles)))
+
+
+
+class MapCache(object):
+    """LRU of the loaded maps by map id"""
+    def __init__(self, capacity=MAP_CACHE_SIZE):
+        self.capacity = capacity
+        self.maps = OrderedDict()
+
+
+    def path_of(self, map_id):
+        if MAP_DIR is None:
+            return None
+        return os.path.join(MAP_DIR, '{0}.map'.format(map_id))
+
+
+    def get(self, map_id):
+        """
+        :return: TerrainMap
+        """
+        try:
+            terrain_map = self.maps.pop(map_id)
+        except KeyError:
+            terrain_map = self.load(map_id)
+            while self.maps and len(self.maps) >= self.capacity:
+                # rooms still on the evicted map keep it open
+                self.maps.popitem(last=False)
+
+        self.maps[map_id] = terrain_map
+        return terrain_map
+
+
+    def load(self, map_id):
+        path = self.path_of(map_id)
+        if path is None or not os.path.exists(path):
+            logger.info("Map {0} has no file, use the default map".format(map_id))
+            return TerrainMap.default(map_id)
+
+        try:
+            terrain_map = TerrainMap.load(map_id, path)
+        except (IOError, OSError, ValueError, MapFormatError):
+            logger.exception("Map {0} failed to load {1}, use the default map".format(map_id, path))
+            return TerrainMap.default(map_id)
+
+        logger.info("Map {0} loaded {1}x{2} from {3}".format(map_id, terrain_map.width, terrain_map.height, path))
+        return terrain_map
+
+
+    def clear(self):
+        self.maps.clear()
+
+
+cache = MapCache()
+
+
+def get_map(map_id):
+    return cache.get(map_id)
@@ -4,15 +4,20 @@ __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
 import random
-import time
 import logging
 
+from codebattle import clock
 from codebattle import message
 
 logger = logging.getLogger('codebattle.marine')
 
 GUNSHOT_INTERVAL = 2
 
+MARINE_ID_MIN = 1
+MARINE_ID_MAX = 999999
+# spawned marines are at least this far from each other
+SPAWN_MIN_SEPARATION = 1.0
+
 class MarineGunCoolDown(Exception):
     pass
 
@@ -22,6 +27,12 @@ class MarineEmptyFlares(Exception):
 class MarineOutOfMap(Exception):
     pass
 
+class MarineIdExhausted(Exception):
+    pass
+
+class MarineSpawnMapFull(Exception):
+    pass
+
 
 class Marine(object):
     GunCoolDown = MarineGunCoolDown
@@ -38,6 +49,12 @@ class Marine(object):
         self.flares_amount = 10
         self.last_gunshot_time = 0
         self.player = None
+        # codebattle.terrain.SpatialGrid, set by its insert
+        self.grid = None
+        # bumped on every change, invalidates the serialized cache
+        self.version = 0
+        # (own, optional) -> (version, bytes), see codebattle.message.serialize_marine
+        self.serialized = {}
 
         logger.debug("Create Marine {0}".format(self.id))
 
@@ -49,12 +66,16 @@ class Marine(object):
         """
         self.player = player
 
+    def touch(self):
+        self.version += 1
+
+
     @property
     def died(self):
         return self.hp <= 0
 
     def can_gunshot(self):
-        if int(time.time()) - self.last_gunshot_time < GUNSHOT_INTERVAL:
+        if int(clock.now()) - self.last_gunshot_time < GUNSHOT_INTERVAL:
             return False
         return True
 
@@ -74,20 +95,31 @@ class Marine(object):
 
         self.check_position(position)
         self.target_position = [position.x, position.z]
+        self.touch()
 
 
     def set_position(self, position):
         self.check_position(position)
         self.position = [position.x, position.z]
+        self.touch()
+        if self.grid is not None:
+            self.grid.update(self)
 
 
-    def set_status(self, new_status, target_position=None):
+    def set_status(self, new_status, target_position=None, reported=False):
+        """
+
+        :param reported: the status comes from an observer report, a reported GunAttack is a shot already taken
+        """
         if new_status == message.marine_pb2.GunAttack:
-            if not self.can_gunshot():
-                raise self.GunCoolDown()
+            if not reported:
+                if not self.can_gunshot():
+                    raise self.GunCoolDown()
+                self.last_gunshot_time = int(clock.now())
 
             self.set_target_position(target_position)
             self.status = new_status
+            self.touch()
             return
 
         if new_status == message.marine_pb2.Flares:
@@ -96,22 +128,29 @@ class Marine(object):
 
             self.status = new_status
             self.flares_amount -= 1
+            self.touch()
             return
 
         self.set_target_position(target_position)
-        self.status = new_status
+        if self.status != new_status:
+            self.status = new_status
+            self.touch()
 
 
     def set_role(self, new_role):
-        self.role = new_role
+        if self.role != new_role:
+            self.role = new_role
+            self.touch()
 
     def got_damaged(self):
         self.hp -= 10
+        self.touch()
         logger.debug("Marine {0} Got Damage. New Hp {0}".format(self.id, self.hp))
 
 
-    def update(self, status, position=None, target_position=None, role=message.marine_pb2.Normal, damaged=False):
-        self.set_status(status, target_position)
+    def update(self, status, position=None, target_position=None, role=message.marine_pb2.Normal, damaged=False,
+               reported=False):
+        self.set_status(status, target_position, reported)
         if position:
             self.set_position(position)
 
@@ -124,18 +163,148 @@ class Marine(object):
 
 class MarineFactory(object):
     @staticmethod
-    def create_marines(map_size, amount, keeped_ids=None):
+    def create_marines(map_size, amount, keeped_ids=None, store=None):
+        """
+
+        :param store: codebattle.store.MarineStore, keep the marines in it
+        """
         ids = []
-        keeped_ids = keeped_ids or []
+        used = set(keeped_ids or ())
         while len(ids) < amount:
-            random_id = random.randint(1, 999999)
-            if random_id not in keeped_ids and random_id not in ids:
+            random_id = random.randint(MARINE_ID_MIN, MARINE_ID_MAX)
+            if random_id not in used:
+                used.add(random_id)
                 ids.append(random_id)
 
         marines = []
         for _id in ids:
             position = [random.randint(1, map_size[0]), random.randint(1, map_size[1])]
-            m = Marine(_id, position)
+            if store is None:
+                m = Marine(_id, position)
+            else:
+                m = store.create_marine(_id, position)
+            marines.append(m)
+
+        return marines
+
+
+
+class MarineIdAllocator(object):
+    """unique marine ids in a room"""
+    Exhausted = MarineIdExhausted
+
+    # random draws before scanning for a free id
+    RANDOM_TRIES = 8
+
+    def __init__(self, low=MARINE_ID_MIN, high=MARINE_ID_MAX):
+        self.low = low
+        self.high = high
+        self.used = set()
+
+
+    def allocate(self):
+        used = self.used
+        if len(used) > self.high - self.low:
+            raise self.Exhausted()
+
+        for _ in range(self.RANDOM_TRIES):
+            _id = random.randint(self.low, self.high)
+            if _id not in used:
+                used.add(_id)
+                return _id
+
+        # crowded, scan on from a random id
+        _id = random.randint(self.low, self.high)
+        while _id in used:
+            _id = _id + 1 if _id < self.high else self.low
+        used.add(_id)
+        return _id
+
+
+    def release(self, _id):
+        self.used.discard(_id)
+
+
+
+class MarineSpawner(object):
+    """place marines of a room with a minimum separation.
+
+    the map is cut in cells of twice the separation, every marine takes a
+    random free cell and a random position in the cell, at least half the
+    separation from its borders. O(1) per marine.
+
+    a map holds (width // cell) * (height // cell) marines, 625 on a 50x50
+    map at the default separation, pass a smaller min_separation for more.
+    """
+    MapFull = MarineSpawnMapFull
+
+    def __init__(self, map_size, min_separation=SPAWN_MIN_SEPARATION, ids=None, blocked=None):
+        """
+
+        :param ids: MarineIdAllocator, default a new one
+        :param blocked: blocked(x, z) is True on obstacles, the cell is dropped then
+        """
+        self.map_size = map_size
+        self.min_separation = min_separation
+        self.cell_size = 2.0 * min_separation
+        self.columns = max(int(map_size[0] // self.cell_size), 1)
+        self.rows = max(int(map_size[1] // self.cell_size), 1)
+        self.free_cells = list(range(self.columns * self.rows))
+        self.ids = ids or MarineIdAllocator()
+        self.blocked = blocked
+
+
+    def take_cell(self):
+        """
+        :return: (cell, position), blocked cells are dropped on the way
+        """
+        free_cells = self.free_cells
+        margin = self.min_separation / 2.0
+        jitter = self.cell_size - self.min_separation
+        while free_cells:
+            index = random.randrange(len(free_cells))
+            free_cells[index], free_cells[-1] = free_cells[-1], free_cells[index]
+            cell = free_cells.pop()
+            cx, cz = divmod(cell, self.rows)
+
+            x = min(cx * self.cell_size + margin + random.random() * jitter, self.map_size[0])
+            z = min(cz * self.cell_size + margin + random.random() * jitter, self.map_size[1])
+            if self.blocked is None or not self.blocked(x, z):
+                return cell, [x, z]
+
+        raise self.MapFull()
+
+
+    def take_position(self):
+        return self.take_cell()[1]
+
+
+    def spawn(self, amount, store=None):
+        """
+        all positions are taken before any id or marine is made, on MapFull
+        the cells go back and nothing is allocated.
+
+        :param store: codebattle.store.MarineStore, keep the marines in it
+        :return: [Marine]
+        """
+        if amount > len(self.free_cells):
+            raise self.MapFull()
+
+        taken = []
+        try:
+            for _ in range(amount):
+                taken.append(self.take_cell())
+        except self.MapFull:
+            self.free_cells.extend(cell for cell, _ in taken)
+            raise
+
+        marines = []
+        for _, position in taken:
+            _id = self.ids.allocate()
+            if store is None:
+                m = Marine(_id, position)
+            else:
+                m = store.create_marine(_id, position)
             marines.append(m)
 
         return marines
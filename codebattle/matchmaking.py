@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# Matchmaking.
+#
+# A player joinroom with roomid <= 0 waits in the queue instead, -roomid is
+# the map it wants, 0 is any map. Waiting players are kept in buckets by
+# (map, skill bucket) in arrival order, so matching is O(1) whatever the
+# queue length: a full bucket starts a room, players of a map bucket are
+# completed with any map players of the same skill bucket.
+#
+# The room is created by RoomManager.create_room. An observer joinroom with
+# roomid <= 0 waits in the observer pool and gets the next matched room, it
+# gets a createroom response then. A room without a pooled observer gets a
+# HeadlessObserver, the server moves the marines and resolves the shots.
+#
+# The queue lives in one process. In gateway mode the gateway sends every
+# queue join to the same room worker, in multi process mode every worker
+# matches the players the kernel gave it.
+
+import logging
+from collections import OrderedDict
+
+from codebattle import movement
+from codebattle import message
+from codebattle.room import RoomManager
+
+logger = logging.getLogger('codebattle.matchmaking')
+
+MATCHMAKING = True
+MATCH_ANY_MAP = 0
+# the map of rooms matched from any map players
+MATCH_DEFAULT_MAP = 1
+MATCH_ROOM_SIZE = 2
+MATCH_ROOM_SECONDS = 60 * 10
+SKILL_BUCKET_WIDTH = 100
+# movement tick of rooms without an observer, if codebattle.movement.MOVEMENT_TICK is off
+HEADLESS_MOVEMENT_TICK = 0.1
+
+
+class HeadlessObserver(object):
+    """the observer of a room nobody observes, drops every message"""
+    scene_state = None
+
+    def __init__(self):
+        self.room = None
+
+    def set_room(self, room):
+        self.room = room
+
+    def put_data(self, data, key=None):
+        pass
+
+    def put_frame(self, data, key=None):
+        pass
+
+    def terminate(self):
+        pass
+
+
+
+class QueueEntry(object):
+    __slots__ = ('player', 'key', 'color')
+
+    def __init__(self, player, key, color):
+        self.player = player
+        self.key = key
+        self.color = color
+
+
+
+class Matchmaker(object):
+    def __init__(self, room_size=MATCH_ROOM_SIZE, max_seconds=MATCH_ROOM_SECONDS):
+        self.room_size = room_size
+        self.max_seconds = max_seconds
+        # (map id, skill bucket) -> OrderedDict player -> QueueEntry
+        self.buckets = {}
+        # player -> QueueEntry
+        self.entries = {}
+        # skill bucket -> OrderedDict of the map ids with players waiting
+        self.waiting_maps = {}
+        # observers waiting for a room
+        self.observers = OrderedDict()
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def enqueue(self, player, map_id=MATCH_ANY_MAP, skill=0, color=''):
+        """
+        :param player: codebattle.player.Player
+        """
+        if player in self.entries:
+            return
+
+        skill_bucket = int(skill) // SKILL_BUCKET_WIDTH
+        key = (map_id, skill_bucket)
+        if map_id == MATCH_ANY_MAP:
+            # join the players waiting longest for a map
+            waiting = self.waiting_maps.get(skill_bucket)
+            if waiting:
+                key = (next(iter(waiting)), skill_bucket)
+
+        entry = QueueEntry(player, key, color)
+        self.entries[player] = entry
+        self._bucket(key)[player] = entry
+        player.link(self.player_left)
+        logger.debug("Player {0} queued for {1}".format(id(player), key))
+
+        self.match(key)
+
+
+    def _bucket(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = OrderedDict()
+            if key[0] != MATCH_ANY_MAP:
+                self.waiting_maps.setdefault(key[1], OrderedDict())[key[0]] = True
+        return bucket
+
+
+    def _take(self, key, amount):
+        """the first amount players of the bucket, closed players are dropped on the way.
+        a terminated player stays queued until its player_left link runs
+        """
+        bucket = self.buckets.get(key)
+        entries = []
+        while bucket and len(entries) < amount:
+            entry = bucket.popitem(last=False)[1]
+            del self.entries[entry.player]
+            entry.player.unlink(self.player_left)
+            if not entry.player.closed:
+                entries.append(entry)
+
+        if bucket is not None and not bucket:
+            self._drop_bucket(key)
+        return entries
+
+
+    def _restore(self, entries):
+        """put taken entries back at the front of their buckets"""
+        taken = OrderedDict()
+        for entry in entries:
+            taken.setdefault(entry.key, []).append(entry)
+
+        for key, key_entries in taken.items():
+            bucket = OrderedDict((entry.player, entry) for entry in key_entries)
+            bucket.update(self._bucket(key))
+            self.buckets[key] = bucket
+            for entry in key_entries:
+                self.entries[entry.player] = entry
+                entry.player.link(self.player_left)
+
+
+    def _drop_bucket(self, key):
+        del self.buckets[key]
+        waiting = self.waiting_maps.get(key[1])
+        if waiting is not None:
+            waiting.pop(key[0], None)
+            if not waiting:
+                del self.waiting_maps[key[1]]
+
+
+    def match(self, key):
+        map_id, skill_bucket = key
+        any_key = (MATCH_ANY_MAP, skill_bucket)
+        waiting = len(self.buckets.get(key, ()))
+        if map_id != MATCH_ANY_MAP:
+            waiting += len(self.buckets.get(any_key, ()))
+        if waiting < self.room_size:
+            return
+
+        entries = self._take(key, self.room_size)
+        if len(entries) < self.room_size:
+            entries += self._take(any_key, self.room_size - len(entries))
+        if len(entries) < self.room_size:
+            # closed players were counted, the others keep their place
+            self._restore(entries)
+            return
+        self.start_room(MATCH_DEFAULT_MAP if map_id == MATCH_ANY_MAP else map_id, entries)
+
+
+    def start_room(self, map_id, entries):
+        observer = self.take_observer()
+        if observer is None:
+            room = RoomManager.create_room(map_id, self.room_size, self.max_seconds,
+                                           movement_tick=movement.MOVEMENT_TICK or HEADLESS_MOVEMENT_TICK,
+                                           server_gunattack=True)
+            RoomManager.observer_join_room(room.id, HeadlessObserver())
+        else:
+            room = RoomManager.create_room(map_id, self.room_size, self.max_seconds)
+            RoomManager.observer_join_room(room.id, observer)
+            observer.put_data(message.observer.pack_create_room_message(0, room.id, room.terrain.size))
+
+        logger.info("Matched {0} players in room {1} map {2}".format(len(entries), room.id, map_id))
+        for entry in entries:
+            entry.player.join_room(room.id, entry.color)
+        return room
+
+
+    def player_left(self, player):
+        entry = self.entries.pop(player, None)
+        if entry is None:
+            return
+
+        player.unlink(self.player_left)
+        bucket = self.buckets[entry.key]
+        del bucket[player]
+        if not bucket:
+            self._drop_bucket(entry.key)
+
+
+    def add_observer(self, observer):
+        """
+        :param observer: codebattle.observer.Observer, it observes the next matched room
+        """
+        if observer in self.observers:
+            return
+        self.observers[observer] = True
+        observer.link(self.observer_left)
+
+
+    def take_observer(self):
+        if not self.observers:
+            return None
+        observer = self.observers.popitem(last=False)[0]
+        observer.unlink(self.observer_left)
+        return observer
+
+
+    def observer_left(self, observer):
+        self.observers.pop(observer, None)
+
+
+
+matchmaker = Matchmaker()
@@ -4,7 +4,13 @@ __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
 
-from protomsg import observer_pb2, api_pb2, marine_pb2
+import threading
+
+from codebattle.protomsg import observer_pb2, api_pb2, marine_pb2
+
+from codebattle import wire
+from codebattle import codec
+from codebattle.codec import FIELD_TARGET_POSITION, FIELD_FLARES_AMOUNT, FIELD_ROLE, FIELDS_ALL
 
 
 OBSERVER_CREATE_ROOM = observer_pb2.createroom
@@ -15,43 +21,134 @@ PLAYER_JOIN_ROOM = api_pb2.joinroom
 PLAYER_CREATE_MARINE = api_pb2.createmarine
 PLAYER_OPERATE_MARINE = api_pb2.marineoperate
 
+# outbound queue keys of the scene update streams, with
+# codebattle.outbound.POLICY_COLLAPSE a new update supersedes the queued one
+PLAYER_SENCE_KEY = 'player_sence'
+OBSERVER_SENCE_KEY = 'observer_sence'
+
+
+# reuse one instance of every message class per thread
+MESSAGE_POOL = True
+
+# instances created and reused by the pool, with pack and unpack calls
+# stats['created'] / (stats['pack'] + stats['unpack']) is the allocations per frame
+stats = {
+    'created': 0,
+    'reused': 0,
+    'pack': 0,
+    'unpack': 0,
+}
+
 
-def marine_obj_to_protobuf(marine, own=True):
+class MessagePool(threading.local):
+    """one reusable instance of every message class per thread.
+
+    an instance is cleared and handed out again by the next get of its class,
+    so do not keep it, or anything got from it, after the current call.
+    """
+    def __init__(self):
+        self.instances = {}
+
+
+    def get(self, message_class):
+        if not MESSAGE_POOL:
+            stats['created'] += 1
+            return message_class()
+
+        msg = self.instances.get(message_class)
+        if msg is None:
+            msg = self.instances[message_class] = message_class()
+            stats['created'] += 1
+        else:
+            msg.Clear()
+            stats['reused'] += 1
+        return msg
+
+
+pool = MessagePool()
+
+
+def marine_obj_to_protobuf(marine, own=True, optional=FIELDS_ALL, msg=None):
     """
 
     :param marine: codebattle.marine.Marine
+    :param optional: FIELD_* flags, the optional fields to set
+    :param msg: fill this marine_pb2.Marine in place, like a repeated field add(). default a new one
     """
-    msg = marine_pb2.Marine()
+    if msg is None:
+        msg = marine_pb2.Marine()
     msg.id = marine.id
     msg.hp = marine.hp
     msg.position.x, msg.position.z = marine.position
     msg.status = marine.status
 
     if own:
-        msg.targetPosition.x, msg.targetPosition.z = marine.target_position
-        msg.flaresAmount = marine.flares_amount
+        if optional & FIELD_TARGET_POSITION:
+            msg.targetPosition.x, msg.targetPosition.z = marine.target_position
+        if optional & FIELD_FLARES_AMOUNT:
+            msg.flaresAmount = marine.flares_amount
 
-    msg.role = marine.role
+    if optional & FIELD_ROLE:
+        msg.role = marine.role
 
     return msg
 
 
-class ObserverMessage(object):
-    def unpack(self, data):
-        msg = observer_pb2.Cmd()
-        msg.ParseFromString(data)
+def serialize_marine(marine, own=True, optional=FIELDS_ALL):
+    """serialized marine_obj_to_protobuf(marine, own, optional), cached until the marine changed"""
+    cache_key = (own, optional)
+    cached = marine.serialized.get(cache_key)
+    if cached is not None and cached[0] == marine.version:
+        return cached[1]
+
+    data = codec.encode_marine(marine, own, optional)
+    marine.serialized[cache_key] = (marine.version, data)
+    return data
+
+
+def splice_marines(field_number, marines, own=True):
+    """the repeated Marine field_number of a message, from the cached marine bytes"""
+    return b''.join([wire.length_delimited(field_number, serialize_marine(m, own)) for m in marines])
+
+
+def peek_cmd(data):
+    """the cmd enum of a serialized observer or player Cmd, without parsing it. None if missing"""
+    return wire.find_varint(data, 1)
 
-        if msg.cmd == OBSERVER_CREATE_ROOM:
-            return OBSERVER_CREATE_ROOM, msg.crm
 
-        if msg.cmd == OBSERVER_JOIN_ROOM:
-            return OBSERVER_JOIN_ROOM, msg.jrm
+def parse_sub_message(data, field_number, message_class):
+    """parse only the field_number sub message of a serialized Cmd.
 
-        return OBSERVER_MARINE_REPORT, msg.mrt
+    a missing one reads as the default instance, like after parsing the whole Cmd.
+    the instance is from the pool.
+    """
+    sub = wire.find_length_delimited(data, field_number)
+    msg = pool.get(message_class)
+    if sub is not None:
+        msg.ParseFromString(sub)
+    return msg
+
+
+class ObserverMessage(object):
+    def decode_create_room(self, data):
+        stats['unpack'] += 1
+        return parse_sub_message(data, 2, observer_pb2.CreateRoom)
+
+    def decode_join_room(self, data):
+        stats['unpack'] += 1
+        return parse_sub_message(data, 3, observer_pb2.JoinRoom)
+
+    def decode_marine_report(self, data):
+        stats['unpack'] += 1
+        try:
+            return codec.decode_observer_report(data)
+        except codec.DecodeError:
+            return parse_sub_message(data, 4, observer_pb2.MarineReport)
 
 
     def pack_create_room_message(self, ret=0, room_id=None, size=None):
-        response = observer_pb2.Message()
+        stats['pack'] += 1
+        response = pool.get(observer_pb2.Message)
         response.msg = observer_pb2.cmdresponse
         response.response.ret = 0
         response.response.cmd = OBSERVER_CREATE_ROOM
@@ -62,21 +159,22 @@ class ObserverMessage(object):
 
 
     def pack_create_marine_message(self, marines, color):
-        msg = observer_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(observer_pb2.Message)
         msg.msg = observer_pb2.createmarine
-        msg.marines.color = color
-        for m in marines:
-            msg_m = msg.marines.marine.add()
-            msg_m.MergeFrom(marine_obj_to_protobuf(m))
 
-        return msg.SerializeToString()
+        create_marine = pool.get(observer_pb2.CreateMarine)
+        create_marine.color = color
+        create_marine = create_marine.SerializeToString() + splice_marines(2, marines)
+
+        return msg.SerializeToString() + wire.length_delimited(4, create_marine)
 
     def pack_sence_update_message(self, marine):
-        msg = observer_pb2.Message()
-        msg.msg = observer_pb2.senceupdate
-        msg_m = msg.update.marine.add()
-        msg_m.MergeFrom(marine_obj_to_protobuf(marine))
-        return msg.SerializeToString()
+        return self.pack_sence_update_views([(marine, FIELDS_ALL)])
+
+    def pack_sence_update_views(self, views):
+        stats['pack'] += 1
+        return codec.encode_observer_sence_update([serialize_marine(m, True, optional) for m, optional in views])
 
 
 
@@ -84,45 +182,61 @@ observer = ObserverMessage()
 
 
 class PlayerMessage(object):
-    def unpack(self, data):
-        msg = api_pb2.Cmd()
-        msg.ParseFromString(data)
+    def decode_join_room(self, data):
+        stats['unpack'] += 1
+        return parse_sub_message(data, 2, api_pb2.JoinRoom)
 
-        if msg.cmd == PLAYER_JOIN_ROOM:
-            return PLAYER_JOIN_ROOM, msg.jrm
+    def decode_create_marine(self, data):
+        stats['unpack'] += 1
+        return parse_sub_message(data, 3, api_pb2.CreateMarine)
 
-        if msg.cmd == PLAYER_CREATE_MARINE:
-            return PLAYER_OPERATE_MARINE, msg.cme
-
-        return PLAYER_OPERATE_MARINE, msg.opt
+    def decode_operate_marine(self, data):
+        stats['unpack'] += 1
+        try:
+            return codec.decode_player_operate(data)
+        except codec.DecodeError:
+            return parse_sub_message(data, 4, api_pb2.MarineOperate)
 
 
     def pack_join_room_error_response(self, error_code):
-        msg = api_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
         msg.msg = api_pb2.joinroom
         msg.response.ret = error_code
         return msg.SerializeToString()
 
 
     def pack_join_room_response(self, room_id, map_size, marines):
-        msg = api_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
         msg.msg = api_pb2.cmdresponse
 
-        msg.response.ret = 0
-        msg.response.cmd = api_pb2.joinroom
+        response = pool.get(api_pb2.CmdResponse)
+        response.ret = 0
+        response.cmd = api_pb2.joinroom
 
-        jrm = msg.response.jrmResponse
+        jrm = pool.get(api_pb2.JoinRoomResponse)
         jrm.id = room_id
         jrm.size.x, jrm.size.z = map_size
-        for m in marines:
-            msg_s = jrm.marines.add()
-            msg_s.MergeFrom(marine_obj_to_protobuf(m))
-        return msg.SerializeToString()
+        jrm = jrm.SerializeToString() + splice_marines(3, marines)
+
+        response = response.SerializeToString() + wire.length_delimited(3, jrm)
+        return msg.SerializeToString() + wire.length_delimited(2, response)
+
+
 
+    def pack_create_marine_response(self, error_code):
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
+        msg.msg = api_pb2.cmdresponse
+        msg.response.ret = error_code
+        msg.response.cmd = api_pb2.createmarine
+        return msg.SerializeToString()
 
 
     def pack_operate_marine_response(self, error_code):
-        msg = api_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
         msg.msg = api_pb2.cmdresponse
         msg.response.ret = error_code
         msg.response.cmd = api_pb2.marineoperate
@@ -130,26 +244,29 @@ class PlayerMessage(object):
 
 
     def pack_start_battle_message(self):
-        msg = api_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
         msg.msg = api_pb2.startbattle
         return msg.SerializeToString()
 
 
     def pack_sence_update_message(self, my_marines, other_marines):
-        msg = api_pb2.Message()
-        msg.msg = api_pb2.senceupdate
-        for m in my_marines:
-            msg_own = msg.update.own.add()
-            msg_own.MergeFrom(marine_obj_to_protobuf(m))
-        for m in other_marines:
-            msg_oth = msg.update.others.add()
-            msg_oth.MergeFrom(marine_obj_to_protobuf(m, own=False))
+        return self.pack_sence_update_views([(m, FIELDS_ALL) for m in my_marines],
+                                            [(m, FIELDS_ALL) for m in other_marines])
 
-        return msg.SerializeToString()
+
+    def pack_sence_update_views(self, my_views, other_views):
+        """
+        :param my_views: [(marine, optional)], optional is FIELD_* flags
+        """
+        stats['pack'] += 1
+        return codec.encode_player_sence_update([serialize_marine(m, True, optional) for m, optional in my_views],
+                                                [serialize_marine(m, False, optional) for m, optional in other_views])
 
 
     def pack_end_battle_message(self, reason, win):
-        msg = api_pb2.Message()
+        stats['pack'] += 1
+        msg = pool.get(api_pb2.Message)
         msg.msg = api_pb2.endbattle
         msg.endbattle.reason = reason
         msg.endbattle.win = win
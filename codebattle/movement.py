@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# Server side movement.
+#
+# Without it the observer moves the marines and reports them back.
+# With a movement tick the room moves every Run marine toward its target
+# position each tick, clamped to the terrain, and sets it Idle on arrival.
+# The owner and the observers get the moved marines as scene updates.
+#
+# Rooms with a codebattle.store.MarineStore move all marines in one
+# vectorized step over the store arrays, other rooms loop over the marines.
+
+import math
+
+from codebattle import clock
+from codebattle import message
+from codebattle.store import numpy
+
+# seconds, 0 leaves the movement to the observer
+MOVEMENT_TICK = 0
+# map units per second
+MARINE_SPEED = 5.0
+
+
+class MovementEngine(object):
+    def __init__(self, room, interval, speed=MARINE_SPEED):
+        """
+
+        :param room: codebattle.room.Room
+        """
+        self.room = room
+        self.interval = interval
+        self.speed = speed
+        self.job = None
+        self.last_time = None
+
+
+    def start(self):
+        self.last_time = clock.now()
+        self.job = clock.call_later(self.interval, self.tick)
+
+
+    def stop(self):
+        if self.job is not None:
+            clock.cancel(self.job)
+            self.job = None
+
+
+    def tick(self):
+        now = clock.now()
+        elapsed, self.last_time = now - self.last_time, now
+
+        moved = self.step(elapsed)
+        if moved:
+            self.emit(moved)
+
+        self.job = clock.call_later(self.interval, self.tick)
+
+
+    def step(self, elapsed):
+        """move the Run marines for elapsed seconds
+
+        :return: [Marine] moved
+        """
+        if self.room.marine_store is not None:
+            return self.step_store(self.room.marine_store, elapsed)
+        return self.step_marines(elapsed)
+
+
+    def step_store(self, store, elapsed):
+        # the store keeps the marines of players already gone, move only the connected ones
+        connected = [store.owner_index(p) for p in self.room.alive_players]
+        rows = numpy.flatnonzero((store.column('status') == message.marine_pb2.Run) & (store.column('hp') > 0) &
+                                 numpy.isin(store.column('owner'), connected))
+        if not len(rows):
+            return []
+
+        x, z = store.x[rows], store.z[rows]
+        dx, dz = store.target_x[rows] - x, store.target_z[rows] - z
+        distance = numpy.hypot(dx, dz)
+        step = self.speed * elapsed
+        arrived = distance <= step
+
+        scale = numpy.where(arrived, 1.0, step / numpy.maximum(distance, 1e-9))
+        width, height = self.room.terrain.size
+        store.x[rows] = numpy.clip(x + dx * scale, 0, width)
+        store.z[rows] = numpy.clip(z + dz * scale, 0, height)
+        store.status[rows[arrived]] = message.marine_pb2.Idle
+        store.touch(rows)
+
+        moved = store.marines_of(rows)
+        for m in moved:
+            if m.grid is not None:
+                m.grid.update(m)
+        return moved
+
+
+    def step_marines(self, elapsed):
+        width, height = self.room.terrain.size
+        step = self.speed * elapsed
+        moved = []
+        for p in self.room.alive_players:
+            for m in p.get_alive_marines():
+                if m.status != message.marine_pb2.Run:
+                    continue
+
+                x, z = m.position
+                tx, tz = m.target_position
+                dx, dz = tx - x, tz - z
+                distance = math.hypot(dx, dz)
+                if distance <= step:
+                    x, z = tx, tz
+                    m.status = message.marine_pb2.Idle
+                else:
+                    x += dx * step / distance
+                    z += dz * step / distance
+
+                m.position = [min(max(x, 0), width), min(max(z, 0), height)]
+                m.touch()
+                if m.grid is not None:
+                    m.grid.update(m)
+                moved.append(m)
+        return moved
+
+
+    def emit(self, moved):
+        self.room.sence_update_to_observers(moved)
+
+        by_player = {}
+        for m in moved:
+            by_player.setdefault(m.player, []).append(m)
+        for p, marines in by_player.items():
+            self.room.sence_update_to_players([p], marines, [])
@@ -3,13 +3,13 @@
 __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
-import gevent
-from gevent.server import StreamServer
-
 import logging
 
+from codebattle import runtime
 from codebattle.endpoint import EndPoint
+from codebattle.router import CommandRouter
 from codebattle.room import RoomManager
+from codebattle import matchmaking
 from codebattle import message
 
 
@@ -26,38 +26,51 @@ class Observer(EndPoint):
         logger.info("Observer {0} lost".format(id(self)))
 
     def on_data(self, data):
-        cmd, data = message.observer.unpack(data)
-        if cmd == message.OBSERVER_CREATE_ROOM:
-            # TODO a observer only can create one room
-            room = RoomManager.create_room(data.map, MAX_PLAYERS, MAX_SECONDS)
-            RoomManager.observer_join_room(room.id, self)
-
-            msg = message.observer.pack_create_room_message(0, room.id, room.terrain.size)
-            self.put_data(msg)
-            return
+        router.dispatch(self, data)
+
+
+    def on_create_room(self, data, raw):
+        # TODO a observer only can create one room
+        room = RoomManager.create_room(data.map, MAX_PLAYERS, MAX_SECONDS)
+        RoomManager.observer_join_room(room.id, self)
+
+        msg = message.observer.pack_create_room_message(0, room.id, room.terrain.size)
+        self.put_data(msg)
 
-        if cmd == message.OBSERVER_JOIN_ROOM:
-            raise NotImplementedError("Observer Join Room Not Implemented")
 
-        if cmd == message.OBSERVER_MARINE_REPORT:
-            self.room.notify_players(data)
+    def on_join_room(self, data, raw):
+        if data.roomid <= 0 and matchmaking.MATCHMAKING:
+            # observe the next matched room
+            if self.room is None:
+                matchmaking.matchmaker.add_observer(self)
             return
 
+        raise NotImplementedError("Observer Join Room Not Implemented")
+
+
+    def on_marine_report(self, data, raw):
+        self.room.notify_players(data)
+
+
+router = CommandRouter('observer')
+router.register(message.OBSERVER_CREATE_ROOM, Observer.on_create_room, message.observer.decode_create_room)
+router.register(message.OBSERVER_JOIN_ROOM, Observer.on_join_room, message.observer.decode_join_room)
+router.register(message.OBSERVER_MARINE_REPORT, Observer.on_marine_report, message.observer.decode_marine_report)
+
 
 
-class ObserverManager(gevent.Greenlet):
-    def __init__(self, port):
+class ObserverManager(object):
+    def __init__(self, port, reuse_port=False):
         self.port = port
-        gevent.Greenlet.__init__(self)
+        self.reuse_port = reuse_port
 
 
-    def _connection_handler(self, client, address):
-        logger.info("New Connection From {0}".format(address))
-        observer = Observer(client)
+    def _connection_handler(self, transport):
+        logger.info("New Connection From {0}".format(transport.address))
+        observer = Observer(transport)
         observer.start()
 
 
-    def _run(self):
+    def start(self):
         logger.info("Observer Listen at port {0}".format(self.port))
-        server = StreamServer(('0.0.0.0', self.port), self._connection_handler)
-        server.serve_forever()
+        runtime.serve(self.port, self._connection_handler, self.reuse_port)
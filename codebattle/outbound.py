@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+from collections import deque
+
+OUTBOUND_MAX_FRAMES = 1024
+OUTBOUND_MAX_BYTES = 4 * 1024 * 1024
+
+# flush at most this many bytes with one send call
+SEND_BATCH_SIZE = 64 * 1024
+# frames per send call, stay under IOV_MAX
+SEND_BATCH_FRAMES = 512
+# consumed and dropped entries kept in the deques before they are compacted
+COMPACT_SLACK = 64
+
+# what to do when a slow consumer fills up its queue
+POLICY_DISCONNECT = 'disconnect'
+# drop the oldest queued scene updates until the new frame fits
+POLICY_DROP_OLDEST = 'drop_oldest'
+# drop the queued scene update with the same key, the new one goes to the tail
+POLICY_COLLAPSE = 'collapse'
+
+OUTBOUND_POLICY = POLICY_DISCONNECT
+
+# process wide counters of every queue
+stats = {
+    'dropped': 0,
+    'collapsed': 0,
+    'disconnected': 0,
+}
+
+
+class OutboundQueueFull(Exception):
+    pass
+
+
+class OutboundQueue(object):
+    """Bounded queue of outbound frames.
+
+    Frames put with a key are scene updates, they may be dropped or
+    collapsed by the policy. Frames without a key are never dropped.
+    When the policy can not make room the queue is closed and put raises Full.
+
+    on_ready is called by put and close, the transport sets it to wake up its writer.
+    """
+    Full = OutboundQueueFull
+
+    def __init__(self, max_frames=OUTBOUND_MAX_FRAMES, max_bytes=OUTBOUND_MAX_BYTES, policy=OUTBOUND_POLICY,
+                 batch_size=SEND_BATCH_SIZE):
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.batch_size = batch_size
+        self.frames = 0
+        self.bytes = 0
+        self.closed = False
+        self.stats = {
+            'dropped': 0,
+            'collapsed': 0,
+            'disconnected': 0,
+        }
+
+        # entries are [key, data], data is None once consumed or dropped
+        self.entries = deque()
+        self.keyed_entries = deque()
+        self.latest = {}
+        self.on_ready = None
+
+
+    def _count(self, name):
+        self.stats[name] += 1
+        stats[name] += 1
+
+
+    def _fits(self, data_length):
+        return self.frames < self.max_frames and self.bytes + data_length <= self.max_bytes
+
+
+    def _remove(self, entry):
+        key, data = entry
+        entry[1] = None
+        self.frames -= 1
+        self.bytes -= len(data)
+        if key is not None and self.latest.get(key) is entry:
+            del self.latest[key]
+
+        keyed_entries = self.keyed_entries
+        while keyed_entries and keyed_entries[0][1] is None:
+            keyed_entries.popleft()
+
+        return data
+
+
+    def _drop_oldest(self):
+        keyed_entries = self.keyed_entries
+        while keyed_entries:
+            entry = keyed_entries[0]
+            if entry[1] is not None:
+                self._remove(entry)
+                self._count('dropped')
+                return True
+            keyed_entries.popleft()
+        return False
+
+
+    def _collapse(self, key, data_length):
+        """drop the queued frame of key if the new one fits then"""
+        entry = self.latest.get(key)
+        if entry is None or self.bytes - len(entry[1]) + data_length > self.max_bytes:
+            return
+
+        self._remove(entry)
+        self._count('collapsed')
+
+
+    def _compact(self):
+        self.entries = deque(entry for entry in self.entries if entry[1] is not None)
+        self.keyed_entries = deque(entry for entry in self.keyed_entries if entry[1] is not None)
+
+
+    def put(self, data, key=None):
+        if self.closed:
+            return
+
+        data_length = len(data)
+        if not self._fits(data_length):
+            if self.policy == POLICY_COLLAPSE and key is not None:
+                self._collapse(key, data_length)
+
+            elif self.policy == POLICY_DROP_OLDEST:
+                while not self._fits(data_length) and self._drop_oldest():
+                    pass
+
+            if not self._fits(data_length):
+                self._count('disconnected')
+                self.close()
+                raise self.Full()
+
+        entry = [key, data]
+        self.entries.append(entry)
+        if key is not None:
+            self.keyed_entries.append(entry)
+            self.latest[key] = entry
+
+        self.frames += 1
+        self.bytes += data_length
+        if len(self.entries) > 2 * self.frames + COMPACT_SLACK:
+            self._compact()
+        if self.on_ready is not None:
+            self.on_ready()
+
+
+    def get_nowait(self):
+        """return the next frame, or None if the queue is empty"""
+        entries = self.entries
+        while entries:
+            entry = entries.popleft()
+            if entry[1] is not None:
+                return self._remove(entry)
+        return None
+
+
+    def get_batch(self):
+        """return the frames to write with one send call, empty when nothing to send or closed"""
+        batch = []
+        if self.closed:
+            return batch
+
+        batch_size = 0
+        while batch_size < self.batch_size and len(batch) < SEND_BATCH_FRAMES:
+            data = self.get_nowait()
+            if data is None:
+                break
+            batch.append(data)
+            batch_size += len(data)
+        return batch
+
+
+    def empty(self):
+        return self.frames == 0
+
+
+    def close(self):
+        self.closed = True
+        if self.on_ready is not None:
+            self.on_ready()
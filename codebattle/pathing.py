@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+# Precomputed paths of a terrain map.
+#
+# The free cells of a map are labeled with their connected component (4
+# neighbours), so "can a reach b" is one lookup. For routes the map is cut
+# in blocks of PATH_BLOCK x PATH_BLOCK cells, every connected region of
+# free cells inside a block is a node at its cell nearest to the block
+# center, nodes are linked when a free cell touches a free cell across the
+# block border. The next hop and the distance between every two nodes are
+# precomputed, a path query follows the next hops and costs one lookup per
+# block on the way. Routes are coarse, the marine still moves straight
+# between waypoints.
+#
+# The tables are built offline with the map (codebattle.mapbuild), saved
+# next to the map file as <map_id>.path and mmapped like the map. The
+# server never builds them, a map without a table or with a table of
+# another version of the map has StraightPaths.
+#
+#     PATH_HEADER(magic, version, block, map crc32, nodes)
+#     components: width * height int32, 0 is blocked
+#     regions:    width * height int32, the node of the cell, -1 is blocked
+#     nodes:      nodes int32, the cell of the node
+#     next hop:   nodes * nodes uint16, [from * nodes + to], NO_HOP for none
+#     distance:   nodes * nodes float32, map units
+
+import os
+import heapq
+import math
+import struct
+import logging
+from array import array
+from collections import deque
+
+from codebattle import maps
+
+logger = logging.getLogger('codebattle.pathing')
+
+# cells
+PATH_BLOCK = 8
+PATH_MAGIC = b'CBPT'
+PATH_VERSION = 1
+PATH_HEADER = struct.Struct('<4sHHII')
+NO_HOP = 0xffff
+# the tables are nodes * nodes * 6 bytes, 96MB at MAX_NODES
+MAX_NODES = 4096
+
+INT32 = struct.Struct('<i')
+UINT16 = struct.Struct('<H')
+FLOAT32 = struct.Struct('<f')
+
+
+class PathTableError(Exception):
+    pass
+
+
+def _to_bytes(values):
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        values.byteswap()
+    try:
+        return values.tobytes()
+    except AttributeError:
+        return values.tostring()
+
+
+class PathTable(object):
+    Error = PathTableError
+
+    def __init__(self, terrain_map, data, mm=None):
+        """
+
+        :param terrain_map: codebattle.maps.TerrainMap
+        :param data: buffer of a whole path file
+        """
+        self.map = terrain_map
+        self.data = data
+        self.mm = mm
+        _, _, self.block, _, self.nodes = PATH_HEADER.unpack_from(data)
+
+        cells = terrain_map.width * terrain_map.height
+        self.components_offset = PATH_HEADER.size
+        self.regions_offset = self.components_offset + 4 * cells
+        self.nodes_offset = self.regions_offset + 4 * cells
+        self.hops_offset = self.nodes_offset + 4 * self.nodes
+        self.distances_offset = self.hops_offset + 2 * self.nodes * self.nodes
+        if len(data) != self.distances_offset + 4 * self.nodes * self.nodes:
+            raise PathTableError("Path table of map {0} has a bad size".format(terrain_map.map_id))
+
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+    def _cell(self, x, z):
+        cx, cz = self.map.cell_of(x, z)
+        return cz * self.map.width + cx
+
+    def _node(self, cell):
+        return INT32.unpack_from(self.data, self.regions_offset + 4 * cell)[0]
+
+    def _node_position(self, node):
+        cell = INT32.unpack_from(self.data, self.nodes_offset + 4 * node)[0]
+        cz, cx = divmod(cell, self.map.width)
+        size = self.map.cell_size
+        return [(cx + 0.5) * size, (cz + 0.5) * size]
+
+
+    def component_of(self, x, z):
+        """0 for a blocked position"""
+        return INT32.unpack_from(self.data, self.components_offset + 4 * self._cell(x, z))[0]
+
+
+    def connected(self, start, goal):
+        """
+        :param start: (x, z)
+        """
+        component = self.component_of(*start)
+        return component != 0 and component == self.component_of(*goal)
+
+
+    def distance(self, start, goal):
+        """coarse distance of the route, None if goal can not be reached"""
+        if not self.connected(start, goal):
+            return None
+
+        a, b = self._node(self._cell(*start)), self._node(self._cell(*goal))
+        if a == b:
+            return math.hypot(goal[0] - start[0], goal[1] - start[1])
+        return FLOAT32.unpack_from(self.data, self.distances_offset + 4 * (a * self.nodes + b))[0]
+
+
+    def find_path(self, start, goal):
+        """waypoints from start to goal, the last one is goal
+
+        :return: [[x, z]], None if goal can not be reached
+        """
+        if not self.connected(start, goal):
+            return None
+
+        node, target = self._node(self._cell(*start)), self._node(self._cell(*goal))
+        waypoints = []
+        while node != target:
+            node = UINT16.unpack_from(self.data, self.hops_offset + 2 * (node * self.nodes + target))[0]
+            if node != target:
+                waypoints.append(self._node_position(node))
+
+        waypoints.append([goal[0], goal[1]])
+        return waypoints
+
+
+
+class StraightPaths(object):
+    """the paths of a map without a path table, goals are one straight line away"""
+    def __init__(self, terrain_map):
+        self.map = terrain_map
+
+
+    def close(self):
+        pass
+
+
+    def connected(self, start, goal):
+        return not self.map.blocked_at(*start) and not self.map.blocked_at(*goal)
+
+
+    def distance(self, start, goal):
+        if not self.connected(start, goal):
+            return None
+        return math.hypot(goal[0] - start[0], goal[1] - start[1])
+
+
+    def find_path(self, start, goal):
+        if not self.connected(start, goal):
+            return None
+        return [[goal[0], goal[1]]]
+
+
+
+def _label(free, width, height, cells, labels, first_label):
+    """label the 4 neighbour connected free cells of cells, cells is a set or None for the whole map
+
+    :return: the next label
+    """
+    label = first_label
+    for start in (range(width * height) if cells is None else sorted(cells)):
+        if not free[start] or labels[start] >= first_label:
+            continue
+        labels[start] = label
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            cz, cx = divmod(cell, width)
+            for nx, nz in ((cx - 1, cz), (cx + 1, cz), (cx, cz - 1), (cx, cz + 1)):
+                if 0 <= nx < width and 0 <= nz < height:
+                    n = nz * width + nx
+                    if free[n] and labels[n] < first_label and (cells is None or n in cells):
+                        labels[n] = label
+                        queue.append(n)
+        label += 1
+    return label
+
+
+def build(terrain_map, block=PATH_BLOCK):
+    """
+    :return: the bytes of the path file of terrain_map
+    """
+    width, height = terrain_map.width, terrain_map.height
+    columns = (width + block - 1) // block
+    free = [not terrain_map.blocked(cx, cz) for cz in range(height) for cx in range(width)]
+
+    components = array('i', [0]) * (width * height)
+    count = _label(free, width, height, None, components, 1) - 1
+
+    # nodes, the regions inside every block
+    regions = array('i', [-1]) * (width * height)
+    nodes = array('i')
+    for by in range((height + block - 1) // block):
+        for bx in range(columns):
+            x0, z0 = bx * block, by * block
+            x1, z1 = min(x0 + block, width), min(z0 + block, height)
+            cells = set(cz * width + cx for cz in range(z0, z1) for cx in range(x0, x1))
+            first = len(nodes)
+            last = _label(free, width, height, cells, regions, first)
+            if last > MAX_NODES:
+                raise PathTableError("Map {0} has too many nodes, use a larger block".format(terrain_map.map_id))
+
+            # the node position, the cell of the region nearest to the block center
+            center_x, center_z = (x0 + x1 - 1) / 2.0, (z0 + z1 - 1) / 2.0
+            best = {}
+            for cell in cells:
+                node = regions[cell]
+                if node < 0:
+                    continue
+                cz, cx = divmod(cell, width)
+                d = ((cx - center_x) ** 2 + (cz - center_z) ** 2, cell)
+                if node not in best or d < best[node]:
+                    best[node] = d
+            nodes.extend(best[node][1] for node in range(first, last))
+
+    # links between nodes across block borders
+    links = [{} for _ in nodes]
+    for cell in range(width * height):
+        a = regions[cell]
+        if a < 0:
+            continue
+        cz, cx = divmod(cell, width)
+        for n in ((cell + 1) if cx + 1 < width else None, (cell + width) if cz + 1 < height else None):
+            if n is None or regions[n] < 0 or regions[n] == a:
+                continue
+            b = regions[n]
+            if b not in links[a]:
+                (az, ax), (bz, bx) = divmod(nodes[a], width), divmod(nodes[b], width)
+                d = math.hypot(ax - bx, az - bz) * terrain_map.cell_size
+                links[a][b] = links[b][a] = d
+
+    # next hop and distance from every node, dijkstra
+    size = len(nodes)
+    hops = array('H', [NO_HOP]) * (size * size)
+    distances = array('f', [float('inf')]) * (size * size)
+    for source in range(size):
+        row = source * size
+        hops[row + source] = source
+        distances[row + source] = 0.0
+        best = {source: 0.0}
+        heap = [(0.0, source, source)]
+        while heap:
+            d, node, first = heapq.heappop(heap)
+            if d > best[node]:
+                continue
+            for n, step in links[node].items():
+                nd = d + step
+                if nd < best.get(n, float('inf')):
+                    best[n] = nd
+                    hop = n if node == source else first
+                    hops[row + n] = hop
+                    distances[row + n] = nd
+                    heapq.heappush(heap, (nd, n, hop))
+
+    header = PATH_HEADER.pack(PATH_MAGIC, PATH_VERSION, block, terrain_map.checksum, size)
+    logger.info("Map {0} path table built, {1} components {2} nodes".format(terrain_map.map_id, count, size))
+    return b''.join([header, _to_bytes(components), _to_bytes(regions), _to_bytes(nodes),
+                     _to_bytes(hops), _to_bytes(distances)])
+
+
+def load(terrain_map, path, block=PATH_BLOCK):
+    """
+    :return: PathTable, None if the file is missing or for another map version
+    """
+    if not os.path.exists(path):
+        return None
+
+    mm = maps.map_file(path)
+    if mm is None:
+        return None
+
+    try:
+        if len(mm) >= PATH_HEADER.size:
+            magic, version, table_block, crc, _ = PATH_HEADER.unpack_from(mm)
+            if (magic, version, table_block, crc) == (PATH_MAGIC, PATH_VERSION, block, terrain_map.checksum):
+                return PathTable(terrain_map, mm, mm)
+    except PathTableError:
+        logger.warning("Path table {0} is broken".format(path))
+
+    mm.close()
+    return None
+
+
+def paths_of(terrain_map, block=PATH_BLOCK):
+    """the PathTable of terrain_map, loaded once per process. never built here
+
+    :param terrain_map: codebattle.maps.TerrainMap
+    :return: PathTable, StraightPaths if the map has no table
+    """
+    if terrain_map.paths is not None:
+        return terrain_map.paths
+
+    path = terrain_map.table_path('.path')
+    table = load(terrain_map, path, block) if path is not None else None
+    if table is None:
+        if path is not None:
+            logger.warning("Map {0} has no path table {1}, paths are straight. "
+                           "Build it with codebattle.mapbuild".format(terrain_map.map_id, path))
+        table = StraightPaths(terrain_map)
+
+    terrain_map.paths = table
+    return table
@@ -3,16 +3,15 @@
 __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
-import gevent
-from gevent.queue import Queue
-from gevent.event import Event
-from gevent.server import StreamServer
-
 import logging
 
+from codebattle import runtime
+from codebattle import worker
+from codebattle import matchmaking
 from codebattle.endpoint import EndPoint
+from codebattle.router import CommandRouter
 from codebattle.room import RoomManager
-from codebattle.marine import MarineFactory, Marine
+from codebattle.marine import Marine, MarineSpawner
 from codebattle import message
 
 logger = logging.getLogger('codebattle.player')
@@ -25,8 +24,6 @@ class Player(EndPoint):
         self.alive_marines = {}
         self.died_marines = {}
         self.battle_win = False
-        self.battle_finish_event = Event()
-        self.notify_queue = Queue()
 
 
     def get_alive_marines(self):
@@ -34,64 +31,68 @@ class Player(EndPoint):
 
 
     def notify(self, data):
-        self.notify_queue.put(data)
+        try:
+            self.get_notified(data)
+        except Exception:
+            logger.exception("Player {0} failed to handle report {1}".format(id(self), data.report))
 
 
-    def get_notified(self):
-        while True:
-            data = self.notify_queue.get()
-            if data.report == message.observer_pb2.toidle:
-                if data.midle.id not in self.alive_marines:
-                    continue
+    def get_notified(self, data):
+        if data.report == message.observer_pb2.toidle:
+            if data.midle.id not in self.alive_marines:
+                return
 
-                this_marine = self.alive_marines[data.midle.id]
-                this_marine.update(data.report, data.midle.position)
-                self.room.report_idle(this_marine, self)
-                continue
+            this_marine = self.alive_marines[data.midle.id]
+            this_marine.update(data.report, data.midle.position, reported=True)
+            self.room.report_idle(this_marine, self)
+            return
 
 
-            if data.report == message.observer_pb2.damage:
-                if data.mdamage.id in self.alive_marines:
-                    # own marine has been attacked
-                    this_marine = self.alive_marines[data.mdamage.id]
-                    this_marine.update(data.mdamage.status, position=data.mdamage.position, role=message.marine_pb2.Injured, damaged=True)
+        if data.report == message.observer_pb2.damage:
+            if data.mdamage.id in self.alive_marines:
+                # own marine has been attacked
+                this_marine = self.alive_marines[data.mdamage.id]
+                this_marine.update(data.mdamage.status, position=data.mdamage.position, role=message.marine_pb2.Injured, damaged=True,
+                                   reported=True)
 
-                    if this_marine.died:
-                        self.marine_die(this_marine)
+                if this_marine.died:
+                    self.marine_die(this_marine)
 
-                    self.room.report_damage(this_marine, self)
-                    continue
+                self.room.report_damage(this_marine, self)
+                return
 
-                if data.mattack.id in self.alive_marines:
-                    this_marine = self.alive_marines[data.mattack.id]
-                    this_marine.update(data.mattack.status, position=data.mattack.position, role=message.marine_pb2.Attacker)
-                    self.room.report_damage(this_marine, self)
-                    continue
+            if data.mattack.id in self.alive_marines:
+                this_marine = self.alive_marines[data.mattack.id]
+                this_marine.update(data.mattack.status, position=data.mattack.position, role=message.marine_pb2.Attacker,
+                                   reported=True)
+                self.room.report_damage(this_marine, self)
+                return
 
 
-            if data.report == message.observer_pb2.flares or data.report == message.observer_pb2.flares2:
-                for m in data.marines:
-                    if m.id in self.alive_marines:
-                        self.alive_marines[m.id].update(m.status, position=m.position)
+        if data.report == message.observer_pb2.flares or data.report == message.observer_pb2.flares2:
+            for m in data.marines:
+                if m.id in self.alive_marines:
+                    self.alive_marines[m.id].update(m.status, position=m.position, reported=True)
 
-                if data.reporterId in self.alive_marines:
-                    self.room.report_flares(self.alive_marines[data.reporterId], self, data.report==message.observer_pb2.flares2)
+            if data.reporterId in self.alive_marines:
+                self.room.report_flares(self.alive_marines[data.reporterId], self, data.report==message.observer_pb2.flares2)
 
-                continue
+            return
 
-            if data.report == message.observer_pb2.gunattack:
-                for m in data.marines:
-                    if m.id in self.alive_marines:
-                        self.alive_marines[m.id].update(m.status, m.position)
+        if data.report == message.observer_pb2.gunattack:
+            for m in data.marines:
+                if m.id in self.alive_marines:
+                    self.alive_marines[m.id].update(m.status, m.position, reported=True)
 
-                if data.reporterId in self.alive_marines:
-                    self.room.report_gunattack(self.alive_marines[data.reporterId], self)
+            if data.reporterId in self.alive_marines:
+                self.room.report_gunattack(self.alive_marines[data.reporterId], self)
 
 
     def marine_batch_add(self, marines, color):
         for m in marines:
             self.alive_marines[m.id] = m
             m.set_player(self)
+            self.room.terrain.grid.insert(m)
 
         logger.debug("Player {0} alive marines {1}".format(id(self), self.alive_marines.keys()))
         self.room.broadcast_to_observers(message.observer.pack_create_marine_message(marines, color))
@@ -100,6 +101,7 @@ class Player(EndPoint):
     def marine_die(self, m):
         logger.info("Player {0}. Marine {1} Died".format(id(self), m.id))
         m.update(status=message.marine_pb2.Dead)
+        self.room.terrain.grid.remove(m)
         self.alive_marines.pop(m.id)
         self.died_marines[m.id] = m
 
@@ -113,30 +115,55 @@ class Player(EndPoint):
         logger.info("Player {0} lost".format(id(self)))
 
 
-    def on_data(self, data):
-        cmd, data = message.player.unpack(data)
-        if cmd == message.PLAYER_JOIN_ROOM:
-            try:
-                room = RoomManager.player_join_room(data.roomid, self)
-            except RoomManager.RoomNotFound:
-                logger.warning("Player {0} Try to join a NONE exist room {1}".format(id(self), data.roomid))
-                self.put_data(message.player.pack_join_room_error_response(14))
-                return
-            except RoomManager.RoomFull:
-                logger.warning("Player {0} Try to join a FULL room {1}".format(id(self), data.roomid))
-                self.put_data(message.player.pack_join_room_error_response(15))
-                return
+    def on_data(self, raw):
+        router.dispatch(self, raw)
+
 
-            marines = MarineFactory.create_marines(room.terrain.size, PLAYER_MARINE_AMOUNT)
-            self.marine_batch_add(marines, data.color)
-            self.put_data(message.player.pack_join_room_response(room.id, room.terrain.size, marines))
+    def on_join_room(self, data, raw):
+        if data.roomid <= 0 and matchmaking.MATCHMAKING:
+            # roomid -map, wait for a matched room
+            if self.room is None:
+                matchmaking.matchmaker.enqueue(self, -data.roomid, color=data.color)
             return
 
-        if cmd == message.PLAYER_CREATE_MARINE:
-            raise NotImplementedError("Player Create Marine Not Implemented")
+        # a real room, leave the queue first
+        matchmaking.matchmaker.player_left(self)
+        if (self.room is None and worker.handoff is not None and self.transport.has_socket
+                and not worker.is_local(data.roomid) and worker.may_exist(data.roomid)):
+            worker.handoff_endpoint(self, data.roomid, raw)
+            return
 
-        if cmd == message.PLAYER_OPERATE_MARINE:
-            self.marine_operate(data.id, data.status, data.targetPostion)
+        self.join_room(data.roomid, data.color)
+
+
+    def join_room(self, room_id, color):
+        try:
+            room, marines = RoomManager.player_join_room(room_id, self, PLAYER_MARINE_AMOUNT)
+        except RoomManager.RoomNotFound:
+            logger.warning("Player {0} Try to join a NONE exist room {1}".format(id(self), room_id))
+            self.put_data(message.player.pack_join_room_error_response(14))
+            return
+        except RoomManager.RoomFull:
+            logger.warning("Player {0} Try to join a FULL room {1}".format(id(self), room_id))
+            self.put_data(message.player.pack_join_room_error_response(15))
+            return
+        except MarineSpawner.MapFull:
+            logger.warning("Player {0} Try to join room {1}, no room for its marines".format(id(self), room_id))
+            self.put_data(message.player.pack_join_room_error_response(16))
+            return
+
+        self.marine_batch_add(marines, color)
+        self.put_data(message.player.pack_join_room_response(room.id, room.terrain.size, marines))
+
+
+    def on_create_marine(self, data, raw):
+        # marines are given on joining a room, players can not create more
+        logger.warning("Player {0} Try to create marines".format(id(self)))
+        self.put_data(message.player.pack_create_marine_response(30))
+
+
+    def on_operate_marine(self, data, raw):
+        self.marine_operate(data.id, data.status, data.targetPostion)
 
 
     def marine_operate(self, _id, status, position=None):
@@ -169,35 +196,33 @@ class Player(EndPoint):
             self.put_data(message.player.pack_operate_marine_response(24))
             return
 
-        self.room.broadcast_to_observers(message.observer.pack_sence_update_message(marine))
+        self.room.sence_update_to_observers([marine])
+        if status == message.marine_pb2.GunAttack and self.room.gun_resolver is not None:
+            self.room.gun_resolver.resolve(marine, self)
 
 
     def endbattle(self, reason):
         self.put_data(message.player.pack_end_battle_message(reason, self.battle_win))
-        self.battle_finish_event.set()
-
-
-    def _run(self):
-        super(Player, self)._run()
-        job = gevent.spawn(self.get_notified)
-        self.battle_finish_event.wait()
-        job.kill()
         logger.info("Player {0} finish...".format(id(self)))
 
 
+router = CommandRouter('player')
+router.register(message.PLAYER_JOIN_ROOM, Player.on_join_room, message.player.decode_join_room)
+router.register(message.PLAYER_CREATE_MARINE, Player.on_create_marine, message.player.decode_create_marine)
+router.register(message.PLAYER_OPERATE_MARINE, Player.on_operate_marine, message.player.decode_operate_marine)
+
 
-class PlayerManager(gevent.Greenlet):
-    def __init__(self, port):
+class PlayerManager(object):
+    def __init__(self, port, reuse_port=False):
         self.port = port
-        gevent.Greenlet.__init__(self)
+        self.reuse_port = reuse_port
 
-    def _connection_handler(self, client, address):
-        logger.info("New Connection From {0}".format(address))
-        player = Player(client)
+    def _connection_handler(self, transport):
+        logger.info("New Connection From {0}".format(transport.address))
+        player = Player(transport)
         player.start()
 
 
-    def _run(self):
+    def start(self):
         logger.info("Player Listen at port {0}".format(self.port))
-        server = StreamServer(('0.0.0.0', self.port), self._connection_handler)
-        server.serve_forever()
+        runtime.serve(self.port, self._connection_handler, self.reuse_port)
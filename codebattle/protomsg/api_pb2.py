@@ -1,46 +1,59 @@
+# -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: api.proto
-
+"""Generated protocol buffer code."""
 from google.protobuf.internal import enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from google.protobuf import reflection as _reflection
-from google.protobuf import descriptor_pb2
+from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
+_sym_db = _symbol_database.Default()
+
 
-import marine_pb2
+from . import marine_pb2 as marine__pb2
 
 
 DESCRIPTOR = _descriptor.FileDescriptor(
   name='api.proto',
   package='CodeBattle.Api',
-  serialized_pb='\n\tapi.proto\x12\x0e\x43odeBattle.Api\x1a\x0cmarine.proto\"\xa9\x01\n\x03\x43md\x12$\n\x03\x63md\x18\x01 \x02(\x0e\x32\x17.CodeBattle.Api.CmdEnum\x12%\n\x03jrm\x18\x02 \x01(\x0b\x32\x18.CodeBattle.Api.JoinRoom\x12)\n\x03\x63me\x18\x03 \x01(\x0b\x32\x1c.CodeBattle.Api.CreateMarine\x12*\n\x03opt\x18\x04 \x01(\x0b\x32\x1d.CodeBattle.Api.MarineOperate\"\xbd\x01\n\x07Message\x12(\n\x03msg\x18\x01 \x02(\x0e\x32\x1b.CodeBattle.Api.MessageEnum\x12-\n\x08response\x18\x02 \x01(\x0b\x32\x1b.CodeBattle.Api.CmdResponse\x12+\n\x06update\x18\x03 \x01(\x0b\x32\x1b.CodeBattle.Api.SenceUpdate\x12,\n\tendbattle\x18\x04 \x01(\x0b\x32\x19.CodeBattle.Api.EndBattle\")\n\x08JoinRoom\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\x12\r\n\x05\x63olor\x18\x02 \x01(\t\"i\n\x10JoinRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\x12#\n\x07marines\x18\x03 \x03(\x0b\x32\x12.CodeBattle.Marine\"E\n\x0c\x43reateMarine\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\x12%\n\x08position\x18\x02 \x02(\x0b\x32\x13.CodeBattle.Vector2\":\n\x14\x43reateMarineResponse\x12\"\n\x06marine\x18\x01 \x02(\x0b\x32\x12.CodeBattle.Marine\"k\n\rMarineOperate\x12\n\n\x02id\x18\x01 \x02(\x05\x12\"\n\x06status\x18\x02 \x02(\x0e\x32\x12.CodeBattle.Status\x12*\n\rtargetPostion\x18\x03 \x01(\x0b\x32\x13.CodeBattle.Vector2\"\xb2\x01\n\x0b\x43mdResponse\x12\x0b\n\x03ret\x18\x01 \x02(\x05\x12$\n\x03\x63md\x18\x02 \x01(\x0e\x32\x17.CodeBattle.Api.CmdEnum\x12\x35\n\x0bjrmResponse\x18\x03 \x01(\x0b\x32 .CodeBattle.Api.JoinRoomResponse\x12\x39\n\x0b\x63meResponse\x18\x04 \x01(\x0b\x32$.CodeBattle.Api.CreateMarineResponse\"R\n\x0bSenceUpdate\x12\x1f\n\x03own\x18\x01 \x03(\x0b\x32\x12.CodeBattle.Marine\x12\"\n\x06others\x18\x02 \x03(\x0b\x32\x12.CodeBattle.Marine\"(\n\tEndBattle\x12\x0e\n\x06reason\x18\x01 \x02(\t\x12\x0b\n\x03win\x18\x02 \x02(\x08*<\n\x07\x43mdEnum\x12\x0c\n\x08joinroom\x10\x01\x12\x10\n\x0c\x63reatemarine\x10\x02\x12\x11\n\rmarineoperate\x10\x03*O\n\x0bMessageEnum\x12\x0f\n\x0b\x63mdresponse\x10\x00\x12\x0f\n\x0bsenceupdate\x10\x01\x12\x0f\n\x0bstartbattle\x10\x02\x12\r\n\tendbattle\x10\x03')
+  syntax='proto2',
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_pb=b'\n\tapi.proto\x12\x0e\x43odeBattle.Api\x1a\x0cmarine.proto\"\xa9\x01\n\x03\x43md\x12$\n\x03\x63md\x18\x01 \x02(\x0e\x32\x17.CodeBattle.Api.CmdEnum\x12%\n\x03jrm\x18\x02 \x01(\x0b\x32\x18.CodeBattle.Api.JoinRoom\x12)\n\x03\x63me\x18\x03 \x01(\x0b\x32\x1c.CodeBattle.Api.CreateMarine\x12*\n\x03opt\x18\x04 \x01(\x0b\x32\x1d.CodeBattle.Api.MarineOperate\"\xbd\x01\n\x07Message\x12(\n\x03msg\x18\x01 \x02(\x0e\x32\x1b.CodeBattle.Api.MessageEnum\x12-\n\x08response\x18\x02 \x01(\x0b\x32\x1b.CodeBattle.Api.CmdResponse\x12+\n\x06update\x18\x03 \x01(\x0b\x32\x1b.CodeBattle.Api.SenceUpdate\x12,\n\tendbattle\x18\x04 \x01(\x0b\x32\x19.CodeBattle.Api.EndBattle\")\n\x08JoinRoom\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\x12\r\n\x05\x63olor\x18\x02 \x01(\t\"i\n\x10JoinRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\x12#\n\x07marines\x18\x03 \x03(\x0b\x32\x12.CodeBattle.Marine\"E\n\x0c\x43reateMarine\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\x12%\n\x08position\x18\x02 \x02(\x0b\x32\x13.CodeBattle.Vector2\":\n\x14\x43reateMarineResponse\x12\"\n\x06marine\x18\x01 \x02(\x0b\x32\x12.CodeBattle.Marine\"k\n\rMarineOperate\x12\n\n\x02id\x18\x01 \x02(\x05\x12\"\n\x06status\x18\x02 \x02(\x0e\x32\x12.CodeBattle.Status\x12*\n\rtargetPostion\x18\x03 \x01(\x0b\x32\x13.CodeBattle.Vector2\"\xb2\x01\n\x0b\x43mdResponse\x12\x0b\n\x03ret\x18\x01 \x02(\x05\x12$\n\x03\x63md\x18\x02 \x01(\x0e\x32\x17.CodeBattle.Api.CmdEnum\x12\x35\n\x0bjrmResponse\x18\x03 \x01(\x0b\x32 .CodeBattle.Api.JoinRoomResponse\x12\x39\n\x0b\x63meResponse\x18\x04 \x01(\x0b\x32$.CodeBattle.Api.CreateMarineResponse\"R\n\x0bSenceUpdate\x12\x1f\n\x03own\x18\x01 \x03(\x0b\x32\x12.CodeBattle.Marine\x12\"\n\x06others\x18\x02 \x03(\x0b\x32\x12.CodeBattle.Marine\"(\n\tEndBattle\x12\x0e\n\x06reason\x18\x01 \x02(\t\x12\x0b\n\x03win\x18\x02 \x02(\x08*<\n\x07\x43mdEnum\x12\x0c\n\x08joinroom\x10\x01\x12\x10\n\x0c\x63reatemarine\x10\x02\x12\x11\n\rmarineoperate\x10\x03*O\n\x0bMessageEnum\x12\x0f\n\x0b\x63mdresponse\x10\x00\x12\x0f\n\x0bsenceupdate\x10\x01\x12\x0f\n\x0bstartbattle\x10\x02\x12\r\n\tendbattle\x10\x03'
+  ,
+  dependencies=[marine__pb2.DESCRIPTOR,])
 
 _CMDENUM = _descriptor.EnumDescriptor(
   name='CmdEnum',
   full_name='CodeBattle.Api.CmdEnum',
   filename=None,
   file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
   values=[
     _descriptor.EnumValueDescriptor(
       name='joinroom', index=0, number=1,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='createmarine', index=1, number=2,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='marineoperate', index=2, number=3,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
   ],
   containing_type=None,
-  options=None,
+  serialized_options=None,
   serialized_start=1104,
   serialized_end=1164,
 )
+_sym_db.RegisterEnumDescriptor(_CMDENUM)
 
 CmdEnum = enum_type_wrapper.EnumTypeWrapper(_CMDENUM)
 _MESSAGEENUM = _descriptor.EnumDescriptor(
@@ -48,29 +61,35 @@ _MESSAGEENUM = _descriptor.EnumDescriptor(
   full_name='CodeBattle.Api.MessageEnum',
   filename=None,
   file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
   values=[
     _descriptor.EnumValueDescriptor(
       name='cmdresponse', index=0, number=0,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='senceupdate', index=1, number=1,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='startbattle', index=2, number=2,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='endbattle', index=3, number=3,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
   ],
   containing_type=None,
-  options=None,
+  serialized_options=None,
   serialized_start=1166,
   serialized_end=1245,
 )
+_sym_db.RegisterEnumDescriptor(_MESSAGEENUM)
 
 MessageEnum = enum_type_wrapper.EnumTypeWrapper(_MESSAGEENUM)
 joinroom = 1
@@ -89,6 +108,7 @@ _CMD = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='cmd', full_name='CodeBattle.Api.Cmd.cmd', index=0,
@@ -96,37 +116,40 @@ _CMD = _descriptor.Descriptor(
       has_default_value=False, default_value=1,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='jrm', full_name='CodeBattle.Api.Cmd.jrm', index=1,
       number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='cme', full_name='CodeBattle.Api.Cmd.cme', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='opt', full_name='CodeBattle.Api.Cmd.opt', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=44,
   serialized_end=213,
 )
@@ -138,6 +161,7 @@ _MESSAGE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='msg', full_name='CodeBattle.Api.Message.msg', index=0,
@@ -145,37 +169,40 @@ _MESSAGE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='response', full_name='CodeBattle.Api.Message.response', index=1,
       number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='update', full_name='CodeBattle.Api.Message.update', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='endbattle', full_name='CodeBattle.Api.Message.endbattle', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=216,
   serialized_end=405,
 )
@@ -187,6 +214,7 @@ _JOINROOM = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='roomid', full_name='CodeBattle.Api.JoinRoom.roomid', index=0,
@@ -194,23 +222,26 @@ _JOINROOM = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='color', full_name='CodeBattle.Api.JoinRoom.color', index=1,
       number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=unicode("", "utf-8"),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=407,
   serialized_end=448,
 )
@@ -222,6 +253,7 @@ _JOINROOMRESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='id', full_name='CodeBattle.Api.JoinRoomResponse.id', index=0,
@@ -229,30 +261,33 @@ _JOINROOMRESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='size', full_name='CodeBattle.Api.JoinRoomResponse.size', index=1,
       number=2, type=11, cpp_type=10, label=2,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='marines', full_name='CodeBattle.Api.JoinRoomResponse.marines', index=2,
       number=3, type=11, cpp_type=10, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=450,
   serialized_end=555,
 )
@@ -264,6 +299,7 @@ _CREATEMARINE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='roomid', full_name='CodeBattle.Api.CreateMarine.roomid', index=0,
@@ -271,23 +307,26 @@ _CREATEMARINE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='position', full_name='CodeBattle.Api.CreateMarine.position', index=1,
       number=2, type=11, cpp_type=10, label=2,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=557,
   serialized_end=626,
 )
@@ -299,6 +338,7 @@ _CREATEMARINERESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='marine', full_name='CodeBattle.Api.CreateMarineResponse.marine', index=0,
@@ -306,16 +346,19 @@ _CREATEMARINERESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=628,
   serialized_end=686,
 )
@@ -327,6 +370,7 @@ _MARINEOPERATE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='id', full_name='CodeBattle.Api.MarineOperate.id', index=0,
@@ -334,30 +378,33 @@ _MARINEOPERATE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='status', full_name='CodeBattle.Api.MarineOperate.status', index=1,
       number=2, type=14, cpp_type=8, label=2,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='targetPostion', full_name='CodeBattle.Api.MarineOperate.targetPostion', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=688,
   serialized_end=795,
 )
@@ -369,6 +416,7 @@ _CMDRESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='ret', full_name='CodeBattle.Api.CmdResponse.ret', index=0,
@@ -376,37 +424,40 @@ _CMDRESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='cmd', full_name='CodeBattle.Api.CmdResponse.cmd', index=1,
       number=2, type=14, cpp_type=8, label=1,
       has_default_value=False, default_value=1,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='jrmResponse', full_name='CodeBattle.Api.CmdResponse.jrmResponse', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='cmeResponse', full_name='CodeBattle.Api.CmdResponse.cmeResponse', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=798,
   serialized_end=976,
 )
@@ -418,6 +469,7 @@ _SENCEUPDATE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='own', full_name='CodeBattle.Api.SenceUpdate.own', index=0,
@@ -425,23 +477,26 @@ _SENCEUPDATE = _descriptor.Descriptor(
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='others', full_name='CodeBattle.Api.SenceUpdate.others', index=1,
       number=2, type=11, cpp_type=10, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=978,
   serialized_end=1060,
 )
@@ -453,30 +508,34 @@ _ENDBATTLE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='reason', full_name='CodeBattle.Api.EndBattle.reason', index=0,
       number=1, type=9, cpp_type=9, label=2,
-      has_default_value=False, default_value=unicode("", "utf-8"),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='win', full_name='CodeBattle.Api.EndBattle.win', index=1,
       number=2, type=8, cpp_type=7, label=2,
       has_default_value=False, default_value=False,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=1062,
   serialized_end=1102,
 )
@@ -489,17 +548,17 @@ _MESSAGE.fields_by_name['msg'].enum_type = _MESSAGEENUM
 _MESSAGE.fields_by_name['response'].message_type = _CMDRESPONSE
 _MESSAGE.fields_by_name['update'].message_type = _SENCEUPDATE
 _MESSAGE.fields_by_name['endbattle'].message_type = _ENDBATTLE
-_JOINROOMRESPONSE.fields_by_name['size'].message_type = marine_pb2._VECTOR2INT
-_JOINROOMRESPONSE.fields_by_name['marines'].message_type = marine_pb2._MARINE
-_CREATEMARINE.fields_by_name['position'].message_type = marine_pb2._VECTOR2
-_CREATEMARINERESPONSE.fields_by_name['marine'].message_type = marine_pb2._MARINE
-_MARINEOPERATE.fields_by_name['status'].enum_type = marine_pb2._STATUS
-_MARINEOPERATE.fields_by_name['targetPostion'].message_type = marine_pb2._VECTOR2
+_JOINROOMRESPONSE.fields_by_name['size'].message_type = marine__pb2._VECTOR2INT
+_JOINROOMRESPONSE.fields_by_name['marines'].message_type = marine__pb2._MARINE
+_CREATEMARINE.fields_by_name['position'].message_type = marine__pb2._VECTOR2
+_CREATEMARINERESPONSE.fields_by_name['marine'].message_type = marine__pb2._MARINE
+_MARINEOPERATE.fields_by_name['status'].enum_type = marine__pb2._STATUS
+_MARINEOPERATE.fields_by_name['targetPostion'].message_type = marine__pb2._VECTOR2
 _CMDRESPONSE.fields_by_name['cmd'].enum_type = _CMDENUM
 _CMDRESPONSE.fields_by_name['jrmResponse'].message_type = _JOINROOMRESPONSE
 _CMDRESPONSE.fields_by_name['cmeResponse'].message_type = _CREATEMARINERESPONSE
-_SENCEUPDATE.fields_by_name['own'].message_type = marine_pb2._MARINE
-_SENCEUPDATE.fields_by_name['others'].message_type = marine_pb2._MARINE
+_SENCEUPDATE.fields_by_name['own'].message_type = marine__pb2._MARINE
+_SENCEUPDATE.fields_by_name['others'].message_type = marine__pb2._MARINE
 DESCRIPTOR.message_types_by_name['Cmd'] = _CMD
 DESCRIPTOR.message_types_by_name['Message'] = _MESSAGE
 DESCRIPTOR.message_types_by_name['JoinRoom'] = _JOINROOM
@@ -510,66 +569,79 @@ DESCRIPTOR.message_types_by_name['MarineOperate'] = _MARINEOPERATE
 DESCRIPTOR.message_types_by_name['CmdResponse'] = _CMDRESPONSE
 DESCRIPTOR.message_types_by_name['SenceUpdate'] = _SENCEUPDATE
 DESCRIPTOR.message_types_by_name['EndBattle'] = _ENDBATTLE
+DESCRIPTOR.enum_types_by_name['CmdEnum'] = _CMDENUM
+DESCRIPTOR.enum_types_by_name['MessageEnum'] = _MESSAGEENUM
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
-class Cmd(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CMD
-
+Cmd = _reflection.GeneratedProtocolMessageType('Cmd', (_message.Message,), {
+  'DESCRIPTOR' : _CMD,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.Cmd)
+  })
+_sym_db.RegisterMessage(Cmd)
 
-class Message(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _MESSAGE
-
+Message = _reflection.GeneratedProtocolMessageType('Message', (_message.Message,), {
+  'DESCRIPTOR' : _MESSAGE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.Message)
+  })
+_sym_db.RegisterMessage(Message)
 
-class JoinRoom(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _JOINROOM
-
+JoinRoom = _reflection.GeneratedProtocolMessageType('JoinRoom', (_message.Message,), {
+  'DESCRIPTOR' : _JOINROOM,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.JoinRoom)
+  })
+_sym_db.RegisterMessage(JoinRoom)
 
-class JoinRoomResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _JOINROOMRESPONSE
-
+JoinRoomResponse = _reflection.GeneratedProtocolMessageType('JoinRoomResponse', (_message.Message,), {
+  'DESCRIPTOR' : _JOINROOMRESPONSE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.JoinRoomResponse)
+  })
+_sym_db.RegisterMessage(JoinRoomResponse)
 
-class CreateMarine(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CREATEMARINE
-
+CreateMarine = _reflection.GeneratedProtocolMessageType('CreateMarine', (_message.Message,), {
+  'DESCRIPTOR' : _CREATEMARINE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.CreateMarine)
+  })
+_sym_db.RegisterMessage(CreateMarine)
 
-class CreateMarineResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CREATEMARINERESPONSE
-
+CreateMarineResponse = _reflection.GeneratedProtocolMessageType('CreateMarineResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CREATEMARINERESPONSE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.CreateMarineResponse)
+  })
+_sym_db.RegisterMessage(CreateMarineResponse)
 
-class MarineOperate(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _MARINEOPERATE
-
+MarineOperate = _reflection.GeneratedProtocolMessageType('MarineOperate', (_message.Message,), {
+  'DESCRIPTOR' : _MARINEOPERATE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.MarineOperate)
+  })
+_sym_db.RegisterMessage(MarineOperate)
 
-class CmdResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CMDRESPONSE
-
+CmdResponse = _reflection.GeneratedProtocolMessageType('CmdResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CMDRESPONSE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.CmdResponse)
+  })
+_sym_db.RegisterMessage(CmdResponse)
 
-class SenceUpdate(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _SENCEUPDATE
-
+SenceUpdate = _reflection.GeneratedProtocolMessageType('SenceUpdate', (_message.Message,), {
+  'DESCRIPTOR' : _SENCEUPDATE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.SenceUpdate)
+  })
+_sym_db.RegisterMessage(SenceUpdate)
 
-class EndBattle(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _ENDBATTLE
-
+EndBattle = _reflection.GeneratedProtocolMessageType('EndBattle', (_message.Message,), {
+  'DESCRIPTOR' : _ENDBATTLE,
+  '__module__' : 'api_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Api.EndBattle)
+  })
+_sym_db.RegisterMessage(EndBattle)
 
 
 # @@protoc_insertion_point(module_scope)
@@ -1,46 +1,59 @@
+# -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: observer.proto
-
+"""Generated protocol buffer code."""
 from google.protobuf.internal import enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from google.protobuf import reflection as _reflection
-from google.protobuf import descriptor_pb2
+from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
+_sym_db = _symbol_database.Default()
+
 
-import marine_pb2
+from . import marine_pb2 as marine__pb2
 
 
 DESCRIPTOR = _descriptor.FileDescriptor(
   name='observer.proto',
   package='CodeBattle.Observer',
-  serialized_pb='\n\x0eobserver.proto\x12\x13\x43odeBattle.Observer\x1a\x0cmarine.proto\"\xba\x01\n\x03\x43md\x12)\n\x03\x63md\x18\x01 \x02(\x0e\x32\x1c.CodeBattle.Observer.CmdEnum\x12,\n\x03\x63rm\x18\x02 \x01(\x0b\x32\x1f.CodeBattle.Observer.CreateRoom\x12*\n\x03jrm\x18\x03 \x01(\x0b\x32\x1d.CodeBattle.Observer.JoinRoom\x12.\n\x03mrt\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.MarineReport\"\xd2\x01\n\x07Message\x12-\n\x03msg\x18\x01 \x02(\x0e\x32 .CodeBattle.Observer.MessageEnum\x12\x32\n\x08response\x18\x02 \x01(\x0b\x32 .CodeBattle.Observer.CmdResponse\x12\x30\n\x06update\x18\x03 \x01(\x0b\x32 .CodeBattle.Observer.SenceUpdate\x12\x32\n\x07marines\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.CreateMarine\"\x19\n\nCreateRoom\x12\x0b\n\x03map\x18\x01 \x02(\x05\"F\n\x12\x43reateRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\"\x1a\n\x08JoinRoom\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\"D\n\x10JoinRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\"\xa1\x02\n\x0cMarineReport\x12/\n\x06report\x18\x01 \x02(\x0e\x32\x1f.CodeBattle.Observer.ReportEnum\x12\x30\n\x05midle\x18\x02 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x32\n\x07mattack\x18\x03 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x32\n\x07mdamage\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x12\n\nreporterId\x18\x05 \x01(\x05\x12\x32\n\x07marines\x18\x06 \x03(\x0b\x32!.CodeBattle.Observer.MarineStatus\"e\n\x0cMarineStatus\x12\n\n\x02id\x18\x01 \x02(\x05\x12\"\n\x06status\x18\x02 \x02(\x0e\x32\x12.CodeBattle.Status\x12%\n\x08position\x18\x03 \x02(\x0b\x32\x13.CodeBattle.Vector2\"\xbf\x01\n\x0b\x43mdResponse\x12\x0b\n\x03ret\x18\x01 \x02(\x05\x12)\n\x03\x63md\x18\x02 \x02(\x0e\x32\x1c.CodeBattle.Observer.CmdEnum\x12<\n\x0b\x63rmResponse\x18\x03 \x01(\x0b\x32\'.CodeBattle.Observer.CreateRoomResponse\x12:\n\x0bjrmResponse\x18\x04 \x01(\x0b\x32%.CodeBattle.Observer.JoinRoomResponse\"1\n\x0bSenceUpdate\x12\"\n\x06marine\x18\x01 \x03(\x0b\x32\x12.CodeBattle.Marine\"A\n\x0c\x43reateMarine\x12\r\n\x05\x63olor\x18\x01 \x02(\t\x12\"\n\x06marine\x18\x02 \x03(\x0b\x32\x12.CodeBattle.Marine*9\n\x07\x43mdEnum\x12\x0e\n\ncreateroom\x10\x00\x12\x0c\n\x08joinroom\x10\x01\x12\x10\n\x0cmarinereport\x10\x02*A\n\x0bMessageEnum\x12\x0f\n\x0b\x63mdresponse\x10\x00\x12\x0f\n\x0bsenceupdate\x10\x01\x12\x10\n\x0c\x63reatemarine\x10\x02*L\n\nReportEnum\x12\n\n\x06toidle\x10\x00\x12\n\n\x06\x64\x61mage\x10\x01\x12\n\n\x06\x66lares\x10\x02\x12\x0b\n\x07\x66lares2\x10\x03\x12\r\n\tgunattack\x10\x04')
+  syntax='proto2',
+  serialized_options=None,
+  create_key=_descriptor._internal_create_key,
+  serialized_pb=b'\n\x0eobserver.proto\x12\x13\x43odeBattle.Observer\x1a\x0cmarine.proto\"\xba\x01\n\x03\x43md\x12)\n\x03\x63md\x18\x01 \x02(\x0e\x32\x1c.CodeBattle.Observer.CmdEnum\x12,\n\x03\x63rm\x18\x02 \x01(\x0b\x32\x1f.CodeBattle.Observer.CreateRoom\x12*\n\x03jrm\x18\x03 \x01(\x0b\x32\x1d.CodeBattle.Observer.JoinRoom\x12.\n\x03mrt\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.MarineReport\"\xd2\x01\n\x07Message\x12-\n\x03msg\x18\x01 \x02(\x0e\x32 .CodeBattle.Observer.MessageEnum\x12\x32\n\x08response\x18\x02 \x01(\x0b\x32 .CodeBattle.Observer.CmdResponse\x12\x30\n\x06update\x18\x03 \x01(\x0b\x32 .CodeBattle.Observer.SenceUpdate\x12\x32\n\x07marines\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.CreateMarine\"\x19\n\nCreateRoom\x12\x0b\n\x03map\x18\x01 \x02(\x05\"F\n\x12\x43reateRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\"\x1a\n\x08JoinRoom\x12\x0e\n\x06roomid\x18\x01 \x02(\x05\"D\n\x10JoinRoomResponse\x12\n\n\x02id\x18\x01 \x02(\x05\x12$\n\x04size\x18\x02 \x02(\x0b\x32\x16.CodeBattle.Vector2Int\"\xa1\x02\n\x0cMarineReport\x12/\n\x06report\x18\x01 \x02(\x0e\x32\x1f.CodeBattle.Observer.ReportEnum\x12\x30\n\x05midle\x18\x02 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x32\n\x07mattack\x18\x03 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x32\n\x07mdamage\x18\x04 \x01(\x0b\x32!.CodeBattle.Observer.MarineStatus\x12\x12\n\nreporterId\x18\x05 \x01(\x05\x12\x32\n\x07marines\x18\x06 \x03(\x0b\x32!.CodeBattle.Observer.MarineStatus\"e\n\x0cMarineStatus\x12\n\n\x02id\x18\x01 \x02(\x05\x12\"\n\x06status\x18\x02 \x02(\x0e\x32\x12.CodeBattle.Status\x12%\n\x08position\x18\x03 \x02(\x0b\x32\x13.CodeBattle.Vector2\"\xbf\x01\n\x0b\x43mdResponse\x12\x0b\n\x03ret\x18\x01 \x02(\x05\x12)\n\x03\x63md\x18\x02 \x02(\x0e\x32\x1c.CodeBattle.Observer.CmdEnum\x12<\n\x0b\x63rmResponse\x18\x03 \x01(\x0b\x32\'.CodeBattle.Observer.CreateRoomResponse\x12:\n\x0bjrmResponse\x18\x04 \x01(\x0b\x32%.CodeBattle.Observer.JoinRoomResponse\"1\n\x0bSenceUpdate\x12\"\n\x06marine\x18\x01 \x03(\x0b\x32\x12.CodeBattle.Marine\"A\n\x0c\x43reateMarine\x12\r\n\x05\x63olor\x18\x01 \x02(\t\x12\"\n\x06marine\x18\x02 \x03(\x0b\x32\x12.CodeBattle.Marine*9\n\x07\x43mdEnum\x12\x0e\n\ncreateroom\x10\x00\x12\x0c\n\x08joinroom\x10\x01\x12\x10\n\x0cmarinereport\x10\x02*A\n\x0bMessageEnum\x12\x0f\n\x0b\x63mdresponse\x10\x00\x12\x0f\n\x0bsenceupdate\x10\x01\x12\x10\n\x0c\x63reatemarine\x10\x02*L\n\nReportEnum\x12\n\n\x06toidle\x10\x00\x12\n\n\x06\x64\x61mage\x10\x01\x12\n\n\x06\x66lares\x10\x02\x12\x0b\n\x07\x66lares2\x10\x03\x12\r\n\tgunattack\x10\x04'
+  ,
+  dependencies=[marine__pb2.DESCRIPTOR,])
 
 _CMDENUM = _descriptor.EnumDescriptor(
   name='CmdEnum',
   full_name='CodeBattle.Observer.CmdEnum',
   filename=None,
   file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
   values=[
     _descriptor.EnumValueDescriptor(
       name='createroom', index=0, number=0,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='joinroom', index=1, number=1,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='marinereport', index=2, number=2,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
   ],
   containing_type=None,
-  options=None,
+  serialized_options=None,
   serialized_start=1359,
   serialized_end=1416,
 )
+_sym_db.RegisterEnumDescriptor(_CMDENUM)
 
 CmdEnum = enum_type_wrapper.EnumTypeWrapper(_CMDENUM)
 _MESSAGEENUM = _descriptor.EnumDescriptor(
@@ -48,25 +61,30 @@ _MESSAGEENUM = _descriptor.EnumDescriptor(
   full_name='CodeBattle.Observer.MessageEnum',
   filename=None,
   file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
   values=[
     _descriptor.EnumValueDescriptor(
       name='cmdresponse', index=0, number=0,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='senceupdate', index=1, number=1,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='createmarine', index=2, number=2,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
   ],
   containing_type=None,
-  options=None,
+  serialized_options=None,
   serialized_start=1418,
   serialized_end=1483,
 )
+_sym_db.RegisterEnumDescriptor(_MESSAGEENUM)
 
 MessageEnum = enum_type_wrapper.EnumTypeWrapper(_MESSAGEENUM)
 _REPORTENUM = _descriptor.EnumDescriptor(
@@ -74,33 +92,40 @@ _REPORTENUM = _descriptor.EnumDescriptor(
   full_name='CodeBattle.Observer.ReportEnum',
   filename=None,
   file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
   values=[
     _descriptor.EnumValueDescriptor(
       name='toidle', index=0, number=0,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='damage', index=1, number=1,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='flares', index=2, number=2,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='flares2', index=3, number=3,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
     _descriptor.EnumValueDescriptor(
       name='gunattack', index=4, number=4,
-      options=None,
-      type=None),
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
   ],
   containing_type=None,
-  options=None,
+  serialized_options=None,
   serialized_start=1485,
   serialized_end=1561,
 )
+_sym_db.RegisterEnumDescriptor(_REPORTENUM)
 
 ReportEnum = enum_type_wrapper.EnumTypeWrapper(_REPORTENUM)
 createroom = 0
@@ -123,6 +148,7 @@ _CMD = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='cmd', full_name='CodeBattle.Observer.Cmd.cmd', index=0,
@@ -130,37 +156,40 @@ _CMD = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='crm', full_name='CodeBattle.Observer.Cmd.crm', index=1,
       number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='jrm', full_name='CodeBattle.Observer.Cmd.jrm', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='mrt', full_name='CodeBattle.Observer.Cmd.mrt', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=54,
   serialized_end=240,
 )
@@ -172,6 +201,7 @@ _MESSAGE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='msg', full_name='CodeBattle.Observer.Message.msg', index=0,
@@ -179,37 +209,40 @@ _MESSAGE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='response', full_name='CodeBattle.Observer.Message.response', index=1,
       number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='update', full_name='CodeBattle.Observer.Message.update', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='marines', full_name='CodeBattle.Observer.Message.marines', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=243,
   serialized_end=453,
 )
@@ -221,6 +254,7 @@ _CREATEROOM = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='map', full_name='CodeBattle.Observer.CreateRoom.map', index=0,
@@ -228,16 +262,19 @@ _CREATEROOM = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=455,
   serialized_end=480,
 )
@@ -249,6 +286,7 @@ _CREATEROOMRESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='id', full_name='CodeBattle.Observer.CreateRoomResponse.id', index=0,
@@ -256,23 +294,26 @@ _CREATEROOMRESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='size', full_name='CodeBattle.Observer.CreateRoomResponse.size', index=1,
       number=2, type=11, cpp_type=10, label=2,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=482,
   serialized_end=552,
 )
@@ -284,6 +325,7 @@ _JOINROOM = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='roomid', full_name='CodeBattle.Observer.JoinRoom.roomid', index=0,
@@ -291,16 +333,19 @@ _JOINROOM = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=554,
   serialized_end=580,
 )
@@ -312,6 +357,7 @@ _JOINROOMRESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='id', full_name='CodeBattle.Observer.JoinRoomResponse.id', index=0,
@@ -319,23 +365,26 @@ _JOINROOMRESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='size', full_name='CodeBattle.Observer.JoinRoomResponse.size', index=1,
       number=2, type=11, cpp_type=10, label=2,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=582,
   serialized_end=650,
 )
@@ -347,6 +396,7 @@ _MARINEREPORT = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='report', full_name='CodeBattle.Observer.MarineReport.report', index=0,
@@ -354,51 +404,54 @@ _MARINEREPORT = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='midle', full_name='CodeBattle.Observer.MarineReport.midle', index=1,
       number=2, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='mattack', full_name='CodeBattle.Observer.MarineReport.mattack', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='mdamage', full_name='CodeBattle.Observer.MarineReport.mdamage', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='reporterId', full_name='CodeBattle.Observer.MarineReport.reporterId', index=4,
       number=5, type=5, cpp_type=1, label=1,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='marines', full_name='CodeBattle.Observer.MarineReport.marines', index=5,
       number=6, type=11, cpp_type=10, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=653,
   serialized_end=942,
 )
@@ -410,6 +463,7 @@ _MARINESTATUS = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='id', full_name='CodeBattle.Observer.MarineStatus.id', index=0,
@@ -417,30 +471,33 @@ _MARINESTATUS = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='status', full_name='CodeBattle.Observer.MarineStatus.status', index=1,
       number=2, type=14, cpp_type=8, label=2,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='position', full_name='CodeBattle.Observer.MarineStatus.position', index=2,
       number=3, type=11, cpp_type=10, label=2,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=944,
   serialized_end=1045,
 )
@@ -452,6 +509,7 @@ _CMDRESPONSE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='ret', full_name='CodeBattle.Observer.CmdResponse.ret', index=0,
@@ -459,37 +517,40 @@ _CMDRESPONSE = _descriptor.Descriptor(
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='cmd', full_name='CodeBattle.Observer.CmdResponse.cmd', index=1,
       number=2, type=14, cpp_type=8, label=2,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='crmResponse', full_name='CodeBattle.Observer.CmdResponse.crmResponse', index=2,
       number=3, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='jrmResponse', full_name='CodeBattle.Observer.CmdResponse.jrmResponse', index=3,
       number=4, type=11, cpp_type=10, label=1,
       has_default_value=False, default_value=None,
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=1048,
   serialized_end=1239,
 )
@@ -501,6 +562,7 @@ _SENCEUPDATE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='marine', full_name='CodeBattle.Observer.SenceUpdate.marine', index=0,
@@ -508,16 +570,19 @@ _SENCEUPDATE = _descriptor.Descriptor(
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=1241,
   serialized_end=1290,
 )
@@ -529,30 +594,34 @@ _CREATEMARINE = _descriptor.Descriptor(
   filename=None,
   file=DESCRIPTOR,
   containing_type=None,
+  create_key=_descriptor._internal_create_key,
   fields=[
     _descriptor.FieldDescriptor(
       name='color', full_name='CodeBattle.Observer.CreateMarine.color', index=0,
       number=1, type=9, cpp_type=9, label=2,
-      has_default_value=False, default_value=unicode("", "utf-8"),
+      has_default_value=False, default_value=b"".decode('utf-8'),
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
     _descriptor.FieldDescriptor(
       name='marine', full_name='CodeBattle.Observer.CreateMarine.marine', index=1,
       number=2, type=11, cpp_type=10, label=3,
       has_default_value=False, default_value=[],
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
-      options=None),
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
   nested_types=[],
   enum_types=[
   ],
-  options=None,
+  serialized_options=None,
   is_extendable=False,
+  syntax='proto2',
   extension_ranges=[],
+  oneofs=[
+  ],
   serialized_start=1292,
   serialized_end=1357,
 )
@@ -565,20 +634,20 @@ _MESSAGE.fields_by_name['msg'].enum_type = _MESSAGEENUM
 _MESSAGE.fields_by_name['response'].message_type = _CMDRESPONSE
 _MESSAGE.fields_by_name['update'].message_type = _SENCEUPDATE
 _MESSAGE.fields_by_name['marines'].message_type = _CREATEMARINE
-_CREATEROOMRESPONSE.fields_by_name['size'].message_type = marine_pb2._VECTOR2INT
-_JOINROOMRESPONSE.fields_by_name['size'].message_type = marine_pb2._VECTOR2INT
+_CREATEROOMRESPONSE.fields_by_name['size'].message_type = marine__pb2._VECTOR2INT
+_JOINROOMRESPONSE.fields_by_name['size'].message_type = marine__pb2._VECTOR2INT
 _MARINEREPORT.fields_by_name['report'].enum_type = _REPORTENUM
 _MARINEREPORT.fields_by_name['midle'].message_type = _MARINESTATUS
 _MARINEREPORT.fields_by_name['mattack'].message_type = _MARINESTATUS
 _MARINEREPORT.fields_by_name['mdamage'].message_type = _MARINESTATUS
 _MARINEREPORT.fields_by_name['marines'].message_type = _MARINESTATUS
-_MARINESTATUS.fields_by_name['status'].enum_type = marine_pb2._STATUS
-_MARINESTATUS.fields_by_name['position'].message_type = marine_pb2._VECTOR2
+_MARINESTATUS.fields_by_name['status'].enum_type = marine__pb2._STATUS
+_MARINESTATUS.fields_by_name['position'].message_type = marine__pb2._VECTOR2
 _CMDRESPONSE.fields_by_name['cmd'].enum_type = _CMDENUM
 _CMDRESPONSE.fields_by_name['crmResponse'].message_type = _CREATEROOMRESPONSE
 _CMDRESPONSE.fields_by_name['jrmResponse'].message_type = _JOINROOMRESPONSE
-_SENCEUPDATE.fields_by_name['marine'].message_type = marine_pb2._MARINE
-_CREATEMARINE.fields_by_name['marine'].message_type = marine_pb2._MARINE
+_SENCEUPDATE.fields_by_name['marine'].message_type = marine__pb2._MARINE
+_CREATEMARINE.fields_by_name['marine'].message_type = marine__pb2._MARINE
 DESCRIPTOR.message_types_by_name['Cmd'] = _CMD
 DESCRIPTOR.message_types_by_name['Message'] = _MESSAGE
 DESCRIPTOR.message_types_by_name['CreateRoom'] = _CREATEROOM
@@ -590,72 +659,87 @@ DESCRIPTOR.message_types_by_name['MarineStatus'] = _MARINESTATUS
 DESCRIPTOR.message_types_by_name['CmdResponse'] = _CMDRESPONSE
 DESCRIPTOR.message_types_by_name['SenceUpdate'] = _SENCEUPDATE
 DESCRIPTOR.message_types_by_name['CreateMarine'] = _CREATEMARINE
-
-class Cmd(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CMD
-
+DESCRIPTOR.enum_types_by_name['CmdEnum'] = _CMDENUM
+DESCRIPTOR.enum_types_by_name['MessageEnum'] = _MESSAGEENUM
+DESCRIPTOR.enum_types_by_name['ReportEnum'] = _REPORTENUM
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+Cmd = _reflection.GeneratedProtocolMessageType('Cmd', (_message.Message,), {
+  'DESCRIPTOR' : _CMD,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.Cmd)
+  })
+_sym_db.RegisterMessage(Cmd)
 
-class Message(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _MESSAGE
-
+Message = _reflection.GeneratedProtocolMessageType('Message', (_message.Message,), {
+  'DESCRIPTOR' : _MESSAGE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.Message)
+  })
+_sym_db.RegisterMessage(Message)
 
-class CreateRoom(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CREATEROOM
-
+CreateRoom = _reflection.GeneratedProtocolMessageType('CreateRoom', (_message.Message,), {
+  'DESCRIPTOR' : _CREATEROOM,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.CreateRoom)
+  })
+_sym_db.RegisterMessage(CreateRoom)
 
-class CreateRoomResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CREATEROOMRESPONSE
-
+CreateRoomResponse = _reflection.GeneratedProtocolMessageType('CreateRoomResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CREATEROOMRESPONSE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.CreateRoomResponse)
+  })
+_sym_db.RegisterMessage(CreateRoomResponse)
 
-class JoinRoom(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _JOINROOM
-
+JoinRoom = _reflection.GeneratedProtocolMessageType('JoinRoom', (_message.Message,), {
+  'DESCRIPTOR' : _JOINROOM,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.JoinRoom)
+  })
+_sym_db.RegisterMessage(JoinRoom)
 
-class JoinRoomResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _JOINROOMRESPONSE
-
+JoinRoomResponse = _reflection.GeneratedProtocolMessageType('JoinRoomResponse', (_message.Message,), {
+  'DESCRIPTOR' : _JOINROOMRESPONSE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.JoinRoomResponse)
+  })
+_sym_db.RegisterMessage(JoinRoomResponse)
 
-class MarineReport(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _MARINEREPORT
-
+MarineReport = _reflection.GeneratedProtocolMessageType('MarineReport', (_message.Message,), {
+  'DESCRIPTOR' : _MARINEREPORT,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.MarineReport)
+  })
+_sym_db.RegisterMessage(MarineReport)
 
-class MarineStatus(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _MARINESTATUS
-
+MarineStatus = _reflection.GeneratedProtocolMessageType('MarineStatus', (_message.Message,), {
+  'DESCRIPTOR' : _MARINESTATUS,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.MarineStatus)
+  })
+_sym_db.RegisterMessage(MarineStatus)
 
-class CmdResponse(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CMDRESPONSE
-
+CmdResponse = _reflection.GeneratedProtocolMessageType('CmdResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CMDRESPONSE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.CmdResponse)
+  })
+_sym_db.RegisterMessage(CmdResponse)
 
-class SenceUpdate(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _SENCEUPDATE
-
+SenceUpdate = _reflection.GeneratedProtocolMessageType('SenceUpdate', (_message.Message,), {
+  'DESCRIPTOR' : _SENCEUPDATE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.SenceUpdate)
+  })
+_sym_db.RegisterMessage(SenceUpdate)
 
-class CreateMarine(_message.Message):
-  __metaclass__ = _reflection.GeneratedProtocolMessageType
-  DESCRIPTOR = _CREATEMARINE
-
+CreateMarine = _reflection.GeneratedProtocolMessageType('CreateMarine', (_message.Message,), {
+  'DESCRIPTOR' : _CREATEMARINE,
+  '__module__' : 'observer_pb2'
   # @@protoc_insertion_point(class_scope:CodeBattle.Observer.CreateMarine)
+  })
+_sym_db.RegisterMessage(CreateMarine)
 
 
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+# Room ids and the rooms of a process.
+#
+# Room ids are 7 digits, id % worker_count is the worker owns the room (see
+# codebattle.worker.owner_of). Every worker counts its own ids and permutes
+# the counter with a Feistel network, so ids are unique without retries and
+# still look random to the clients. An id comes back only after the worker
+# went through all of its ids.
+#
+# The multi process workers share an owner directory, one byte per room id
+# in a shared file mapping, the owner writes the bytes of its rooms. Any
+# worker tells a live room from an unknown one with one read.
+
+import os
+import mmap
+import random
+import logging
+
+logger = logging.getLogger('codebattle.registry')
+
+ROOM_ID_MIN = 1000000
+ROOM_ID_MAX = 9999999
+FEISTEL_ROUNDS = 4
+REGISTRY_SHARDS = 16
+DIRECTORY_FILE = 'rooms.dir'
+
+
+class RoomIdExhausted(Exception):
+    pass
+
+
+class RoomIdAllocator(object):
+    Exhausted = RoomIdExhausted
+
+    def __init__(self, index=0, count=1, keys=None):
+        """
+
+        :param index: the worker index, every id % count is index
+        :param keys: FEISTEL_ROUNDS round keys, random by default
+        """
+        self.index = index
+        self.count = count
+        # the first multiple of count in the id range
+        self.base = -(-ROOM_ID_MIN // count) * count
+        self.space = (ROOM_ID_MAX - self.base + 1) // count
+        self.half_bits = (max(self.space - 1, 1).bit_length() + 1) // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.keys = keys or [random.getrandbits(32) for _ in range(FEISTEL_ROUNDS)]
+        self.counter = 0
+
+
+    def permute(self, n):
+        """a permutation of range(self.space)"""
+        while True:
+            left, right = n >> self.half_bits, n & self.mask
+            for key in self.keys:
+                left, right = right, left ^ ((((right ^ key) * 0x9e3779b1) >> 7) & self.mask)
+            n = (left << self.half_bits) | right
+            # cycle walking, the network permutes 2 * half_bits bits
+            if n < self.space:
+                return n
+
+
+    def allocate(self, taken=()):
+        """
+        :param taken: ids still in use, skipped
+        :return: room id
+        """
+        # a while loop, range would build a list of the whole id space on python 2
+        tries = 0
+        while tries < self.space:
+            tries += 1
+            n = self.permute(self.counter)
+            self.counter = (self.counter + 1) % self.space
+            room_id = self.base + n * self.count + self.index
+            if room_id not in taken:
+                return room_id
+
+        raise self.Exhausted()
+
+
+
+class RoomRegistry(object):
+    """room id -> room, in REGISTRY_SHARDS dicts"""
+    def __init__(self, shards=REGISTRY_SHARDS):
+        self.shards = [{} for _ in range(shards)]
+
+
+    def _shard(self, room_id):
+        # the ids of one worker share room_id % worker_count, mix them first
+        return self.shards[((room_id * 0x9e3779b1) >> 16) % len(self.shards)]
+
+
+    def add(self, room):
+        self._shard(room.id)[room.id] = room
+
+    def pop(self, room_id, *default):
+        return self._shard(room_id).pop(room_id, *default)
+
+    def get(self, room_id, default=None):
+        return self._shard(room_id).get(room_id, default)
+
+
+    def __getitem__(self, room_id):
+        return self._shard(room_id)[room_id]
+
+    def __contains__(self, room_id):
+        return room_id in self._shard(room_id)
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def __iter__(self):
+        for shard in self.shards:
+            for room_id in list(shard):
+                yield room_id
+
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [room for shard in self.shards for room in shard.values()]
+
+
+
+class OwnerDirectory(object):
+    """room id -> owner worker index, shared by the workers of a WorkerLauncher"""
+    SIZE = ROOM_ID_MAX - ROOM_ID_MIN + 1
+
+    def __init__(self, path, create=False):
+        if create:
+            with open(path, 'wb') as f:
+                # sparse, pages are allocated as rooms are created
+                f.truncate(self.SIZE)
+
+        self.path = path
+        with open(path, 'r+b') as f:
+            self.mm = mmap.mmap(f.fileno(), self.SIZE)
+
+
+    @classmethod
+    def path_in(cls, directory):
+        return os.path.join(directory, DIRECTORY_FILE)
+
+
+    def _set(self, room_id, value):
+        offset = room_id - ROOM_ID_MIN
+        self.mm[offset:offset + 1] = bytes(bytearray((value,)))
+
+
+    def claim(self, room_id, owner):
+        self._set(room_id, owner + 1)
+
+    def release(self, room_id):
+        self._set(room_id, 0)
+
+
+    def owner_of(self, room_id):
+        """
+        :return: the worker index, None for no such room
+        """
+        if not ROOM_ID_MIN <= room_id <= ROOM_ID_MAX:
+            return None
+        value = bytearray(self.mm[room_id - ROOM_ID_MIN:room_id - ROOM_ID_MIN + 1])[0]
+        return value - 1 if value else None
+
+
+    def close(self):
+        self.mm.close()
@@ -3,48 +3,124 @@
 __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
-import random
 import logging
 
-import gevent
-from gevent.event import Event
-
+from codebattle import clock
+from codebattle import timerwheel
+from codebattle import runtime
+from codebattle import worker
+from codebattle import scene
+from codebattle import store
+from codebattle import movement
+from codebattle import combat
 from codebattle.terrain import Terrain
+from codebattle.marine import MarineSpawner
+from codebattle.registry import RoomRegistry, RoomIdAllocator
+from codebattle.framing import frame
 from codebattle import message
 
 
 logger_room = logging.getLogger('codebattle.room')
 logger_room_mamager = logging.getLogger('codebattle.roomManager')
 
+# wait the observer to report positions of other marines before reveal them
+FLARES_REPORT_DELAY = 0.01
+# give endpoints time to flush the end battle messages
+FINISH_DELAY = 0.1
+# flares reveal the enemy marines in this radius, None reveals the whole map
+FLARES_RADIUS = None
+# close rooms no player joined in this many seconds, None waits for max_seconds
+ROOM_IDLE_SECONDS = None
+
+
+class Room(object):
+    def __init__(self, room_id, terrain, max_players, max_seconds, scene_delta=None, scene_tick=None, marine_store=None,
+                 movement_tick=None, server_gunattack=None):
+        """
 
-class Room(gevent.Greenlet):
-    def __init__(self, room_id, terrain, max_players, max_seconds):
+        :param scene_delta: send delta scene updates, default codebattle.scene.SCENE_DELTA
+        :param scene_tick: seconds between batched scene updates, default codebattle.scene.SCENE_TICK
+        :param marine_store: keep marines in a codebattle.store.MarineStore, default codebattle.store.MARINE_STORE
+        :param movement_tick: seconds between server side movement steps, default codebattle.movement.MOVEMENT_TICK
+        :param server_gunattack: resolve the shots on the server, default codebattle.combat.SERVER_GUNATTACK
+        """
         self.id = room_id
         self.terrain = terrain
         self.max_players = max_players
+        self.max_seconds = max_seconds
         self.observers = []
         self.alive_players = []
         self.died_players = []
         self.battle_stared = False
         self.battle_timeout = False
-        self.battle_start_event = Event()
-        self.battle_finish_event = Event()
+        self.battle_finish_pending = False
+        self.battle_finished = False
+        self.links = []
+        # codebattle.timerwheel timers, cancelled when the battle finishes
+        self.jobs = []
+        self.idle_job = None
+        self.scene_delta = scene.SCENE_DELTA if scene_delta is None else scene_delta
+        scene_tick = scene.SCENE_TICK if scene_tick is None else scene_tick
+        self.scene_batcher = scene.SceneBatcher(self, scene_tick) if scene_tick else None
 
-        gevent.Greenlet.__init__(self)
+        marine_store = store.MARINE_STORE if marine_store is None else marine_store
+        if marine_store and not store.available():
+            logger_room.warning("Room {0} marine store needs numpy, use plain marines".format(self.id))
+            marine_store = False
+        self.marine_store = store.MarineStore() if marine_store else None
+        self.spawner = MarineSpawner(terrain.size, blocked=terrain.blocked_at)
 
-        self.jobs = []
-        job_guard = gevent.spawn(self.guard_max_seconds, max_seconds)
-        self.jobs.append(job_guard)
+        movement_tick = movement.MOVEMENT_TICK if movement_tick is None else movement_tick
+        self.movement = movement.MovementEngine(self, movement_tick) if movement_tick else None
+
+        server_gunattack = combat.SERVER_GUNATTACK if server_gunattack is None else server_gunattack
+        self.gun_resolver = combat.GunResolver(self) if server_gunattack else None
 
         logger_room.info("Create Room {0}".format(self.id))
 
 
-    def guard_max_seconds(self, max_seconds):
-        gevent.sleep(max_seconds)
+    @property
+    def started(self):
+        return self.battle_stared
+
+
+    def start(self):
+        job_guard = timerwheel.call_later(self.max_seconds, self.guard_max_seconds)
+        self.jobs.append(job_guard)
+        if ROOM_IDLE_SECONDS is not None:
+            self.idle_job = timerwheel.call_later(ROOM_IDLE_SECONDS, self.expire_idle)
+            self.jobs.append(self.idle_job)
+
+
+    def cancel_jobs(self):
+        for job in self.jobs:
+            timerwheel.cancel(job)
+        self.jobs = []
+
+
+    def link(self, callback):
+        """callback(room) will be called after the room finished"""
+        self.links.append(callback)
+
+
+    def guard_max_seconds(self):
+        self.cancel_jobs()
+        self.battle_timeout = True
+        logger_room.info("Room {0} Timeout in seconds {1}.".format(self.id, self.max_seconds))
+        self.battle_start()
+        self.battle_finish()
+
+
+    def expire_idle(self):
+        self.cancel_jobs()
         self.battle_timeout = True
-        logger_room.info("Room {0} Timeout in seconds {1}.".format(self.id, max_seconds))
-        self.battle_start_event.set()
-        self.battle_finish_event.set()
+        logger_room.info("Room {0} Idle in seconds {1}.".format(self.id, ROOM_IDLE_SECONDS))
+        self.battle_start()
+        self.battle_finish()
+
+
+    def can_join(self):
+        return not self.battle_stared and len(self.alive_players) < self.max_players
 
 
     def player_join(self, player):
@@ -53,19 +129,21 @@ class Room(gevent.Greenlet):
         :param player: codebattle.player.Player
         :return: Boolean
         """
-        if self.battle_stared:
-            return False
-        if len(self.alive_players) >= self.max_players:
+        if not self.can_join():
             return False
 
         player.set_room(self)
         player.link(self.player_died)
         self.alive_players.append(player)
+        if self.idle_job is not None:
+            timerwheel.cancel(self.idle_job)
+            self.idle_job = None
 
         logger_room.info("Player {0} join room {1}".format(id(player), self.id))
 
         if len(self.alive_players) == self.max_players:
-            self.battle_start_event.set()
+            # after the player got the join room response
+            runtime.spawn(self.battle_start)
 
         return True
 
@@ -76,9 +154,13 @@ class Room(gevent.Greenlet):
         :param player: codebattle.player.Player
         """
         player.unlink(self.player_died)
+        if player not in self.alive_players:
+            return
+
         self.alive_players.remove(player)
         self.died_players.append(player)
-        self.battle_finish_event.set()
+        # after the caller reported the last damage
+        runtime.spawn(self.battle_finish)
 
 
     def observer_join(self, ob):
@@ -97,22 +179,36 @@ class Room(gevent.Greenlet):
         if self.battle_stared:
             return
 
-        self.battle_start_event.wait()
         self.battle_stared = True
-        for p in self.alive_players:
-            p.put_data(message.player.pack_start_battle_message())
+        self.broadcast_to_players(message.player.pack_start_battle_message())
+        if self.movement is not None:
+            self.movement.start()
 
         logger_room.info("Battle Started")
 
+        if self.battle_finish_pending:
+            self.battle_finish()
+
 
     def battle_finish(self):
-        self.battle_finish_event.wait()
+        if self.battle_finished:
+            return
+        if not self.battle_stared:
+            # finish right after the battle started
+            self.battle_finish_pending = True
+            return
+
+        self.battle_finished = True
         if self.battle_timeout:
             reason = "Timeout"
         else:
             reason = "Normal"
 
         logger_room.info("Battle Finished. {0}".format(reason))
+        self.cancel_jobs()
+        if self.scene_batcher is not None:
+            # the last scene updates go before the end battle messages
+            self.scene_batcher.flush()
         for p in self.alive_players:
             p.battle_win = True
             p.endbattle(reason)
@@ -120,84 +216,153 @@ class Room(gevent.Greenlet):
             p.battle_win = False
             p.endbattle(reason)
 
-        gevent.sleep(0.1)
+        clock.call_later(FINISH_DELAY, self.close)
+
+
+    def close(self):
         for p in self.observers:
             p.terminate()
 
         for p in self.alive_players:
+            p.unlink(self.player_died)
             p.terminate()
 
         for p in self.died_players:
             p.terminate()
 
+        self.cancel_jobs()
+        if self.movement is not None:
+            self.movement.stop()
+        if self.scene_batcher is not None:
+            self.scene_batcher.close()
+
+        logger_room.info("Room {0} finish".format(self.id))
+
+        links, self.links = self.links, []
+        for callback in links:
+            callback(self)
+
 
     def broadcast_to_all(self, data):
-        self.broadcast_to_observers(data)
-        self.broadcast_to_players(data)
+        data = frame(data)
+        self.broadcast_frame(self.observers, data)
+        self.broadcast_frame(self.alive_players, data)
 
 
-    def broadcast_to_observers(self, data, exclude=None):
-        for p in self.observers:
+    def broadcast_to_observers(self, data, exclude=None, key=None):
+        self.broadcast_frame(self.observers, frame(data), exclude, key)
+
+    def broadcast_to_players(self, data, exclude=None, key=None):
+        self.broadcast_frame(self.alive_players, frame(data), exclude, key)
+
+    def broadcast_frame(self, endpoints, data, exclude=None, key=None):
+        """send one framed data to every endpoint, no copy per endpoint"""
+        for p in endpoints:
             if p == exclude:
                 continue
-            p.put_data(data)
+            p.put_frame(data, key)
 
-    def broadcast_to_players(self, data, exclude=None):
-        for p in self.alive_players:
+
+    def sence_update_to_players(self, players, my_marines, other_marines, exclude=None, revealed=()):
+        """
+
+        :param revealed: other marines revealed by flares, see codebattle.scene
+        """
+        if self.scene_batcher is not None:
+            for p in players:
+                if p != exclude:
+                    self.scene_batcher.add_player_update(p, my_marines, other_marines, revealed)
+            return
+
+        self.send_sence_update(players, my_marines, other_marines, exclude, revealed)
+
+
+    def send_sence_update(self, players, my_marines, other_marines, exclude=None, revealed=()):
+        if not self.scene_delta:
+            other_marines = list(other_marines) + list(revealed)
+            data = message.player.pack_sence_update_message(my_marines, other_marines)
+            self.broadcast_frame(players, frame(data), exclude, message.PLAYER_SENCE_KEY)
+            return
+
+        for p in players:
             if p == exclude:
                 continue
-            p.put_data(data)
+            data = scene.pack_player_delta(p, my_marines, other_marines, revealed)
+            if data is not None:
+                p.put_data(data)
+
+
+    def sence_update_to_observers(self, marines):
+        if self.scene_batcher is not None:
+            self.scene_batcher.add_observer_update(marines)
+            return
+
+        self.send_observer_sence_update(marines)
+
+
+    def send_observer_sence_update(self, marines):
+        if not self.scene_delta:
+            data = message.observer.pack_sence_update_views([(m, message.FIELDS_ALL) for m in marines])
+            self.broadcast_to_observers(data, key=message.OBSERVER_SENCE_KEY)
+            return
+
+        for ob in self.observers:
+            ob.put_data(scene.pack_observer_delta(ob, marines))
 
 
     def notify_players(self, data):
+        if self.gun_resolver is not None and data.report in (message.observer_pb2.damage, message.observer_pb2.gunattack):
+            # the server resolved the shot already
+            return
+
         for p in self.alive_players:
             p.notify(data)
 
 
     def report_idle(self, marine, caller):
-        caller.put_data(message.player.pack_sence_update_message([marine], []))
+        self.sence_update_to_players([caller], [marine], [])
 
 
     def report_damage(self, marine, caller):
-        self.broadcast_to_observers(message.observer.pack_sence_update_message(marine))
-        caller.put_data(message.player.pack_sence_update_message([marine], []))
-        data = message.player.pack_sence_update_message([], [marine])
-        self.broadcast_to_players(data, exclude=caller)
+        self.sence_update_to_observers([marine])
+        self.sence_update_to_players([caller], [marine], [])
+        self.sence_update_to_players(self.alive_players, [], [marine], exclude=caller)
 
 
     def report_flares(self, marine, caller, flares2=False):
-        gevent.sleep(0.01)
-        other_players = [p for p in self.alive_players if p != caller]
-        other_marines = []
-        for p in other_players:
-            other_marines.extend(p.get_alive_marines())
+        clock.call_later(FLARES_REPORT_DELAY, self._report_flares, marine, caller, flares2)
 
-        caller.put_data(message.player.pack_sence_update_message([marine], other_marines))
 
-        if not flares2:
-            data = message.player.pack_sence_update_message([], [marine])
+    def _report_flares(self, marine, caller, flares2):
+        other_players = [p for p in self.alive_players if p != caller]
+        if FLARES_RADIUS is None:
+            other_marines = []
             for p in other_players:
-                p.put_data(data)
+                other_marines.extend(p.get_alive_marines())
+        else:
+            x, z = marine.position
+            other_marines = [m for m in self.terrain.grid.query_radius(x, z, FLARES_RADIUS)
+                             if m.player is not caller and m.player in other_players]
+        # obstacles hide marines from the flares
+        other_marines = [m for m in other_marines if self.terrain.can_see(marine.position, m.position)]
 
+        self.sence_update_to_players([caller], [marine], [], revealed=other_marines)
 
-    def report_gunattack(self, marine, caller):
-        other_players = [p for p in self.alive_players if p != caller]
-
-        data = message.player.pack_sence_update_message([], [marine])
-        for p in other_players:
-            p.put_data(data)
+        if not flares2:
+            self.sence_update_to_players(other_players, [], [marine])
 
 
-    def _run(self):
-        self.battle_start()
-        self.battle_finish()
-        gevent.killall(self.jobs)
-        logger_room.info("Room {0} finish".format(self.id))
+    def report_gunattack(self, marine, caller):
+        self.sence_update_to_players(self.alive_players, [], [marine], exclude=caller)
 
 
 
 class RoomManager(object):
-    rooms = {}
+    rooms = RoomRegistry()
+    # RoomIdAllocator of this worker
+    allocator = None
+    # objects have room_created(room) and room_destroyed(room)
+    listeners = []
 
     class RoomNotFound(Exception):
         pass
@@ -212,22 +377,32 @@ class RoomManager(object):
 
     @classmethod
     def generate_room_id(cls):
-        while True:
-            _id = random.randint(1000000, 9999999)
-            if _id not in cls.rooms:
-                return _id
+        # _id % worker_count is the index of the worker owns the room
+        allocator = cls.allocator
+        if allocator is None or (allocator.index, allocator.count) != (worker.worker_index, worker.worker_count):
+            allocator = cls.allocator = RoomIdAllocator(worker.worker_index, worker.worker_count)
+        return allocator.allocate(cls.rooms)
 
 
     @classmethod
-    def create_room(cls, map_id, max_player, max_seconds):
+    def create_room(cls, map_id, max_player, max_seconds, **options):
+        """
+
+        :param options: Room keyword arguments
+        """
         terrain = Terrain(map_id)
 
         _id = cls.generate_room_id()
-        room = Room(_id, terrain, max_player, max_seconds)
+        room = Room(_id, terrain, max_player, max_seconds, **options)
         room.start()
 
         room.link(cls.destroy_room)
-        cls.rooms[_id] = room
+        cls.rooms.add(room)
+        if worker.directory is not None:
+            worker.directory.claim(_id, worker.worker_index)
+
+        for listener in cls.listeners:
+            listener.room_created(room)
 
         cls.log_room_ids()
         return room
@@ -236,6 +411,10 @@ class RoomManager(object):
     @classmethod
     def destroy_room(cls, room):
         cls.rooms.pop(room.id)
+        if worker.directory is not None:
+            worker.directory.release(room.id)
+        for listener in cls.listeners:
+            listener.room_destroyed(room)
         cls.log_room_ids()
 
 
@@ -262,16 +441,17 @@ class RoomManager(object):
 
 
     @classmethod
-    def player_join_room(cls, _id, player):
-        """
+    def player_join_room(cls, _id, player, marine_amount):
+        """the marines are spawned before the player joins, no player is left in a room without them
 
         :param _id: Int
         :param player: codebattle.player.Player
-        :return: :raise cls.RoomFull: raise cls.RoomNotFound: codebattle.room.Room
+        :return: :raise cls.RoomFull: raise cls.RoomNotFound: raise MarineSpawner.MapFull: (room, marines)
         """
         room = cls.get_room(_id)
-        joined = room.player_join(player)
-        if not joined:
+        if not room.can_join():
             raise cls.RoomFull()
 
-        return room
+        marines = room.spawner.spawn(marine_amount, store=room.marine_store)
+        room.player_join(player)
+        return room, marines
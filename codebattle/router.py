@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Command routing.
+#
+# A router reads the cmd enum straight from the raw Cmd bytes, and calls the
+# handler registered for it with only the sub message the handler needs:
+#
+#     handler(endpoint, data, raw)
+#
+# data is parsed by the decoder registered with the handler, raw is the frame.
+
+import logging
+from timeit import default_timer
+
+from codebattle import message
+
+logger = logging.getLogger('codebattle.router')
+
+
+class UnknownCommand(Exception):
+    pass
+
+
+class Route(object):
+    def __init__(self, cmd, handler, decode):
+        self.cmd = cmd
+        self.handler = handler
+        self.decode = decode
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class CommandRouter(object):
+    UnknownCommand = UnknownCommand
+
+    def __init__(self, name):
+        self.name = name
+        self.routes = {}
+        self.unknown = 0
+
+
+    def register(self, cmd, handler, decode):
+        """
+
+        :param handler: handler(endpoint, data, raw)
+        :param decode: decode(raw), return the sub message of the cmd
+        """
+        self.routes[cmd] = Route(cmd, handler, decode)
+
+
+    def dispatch(self, endpoint, raw):
+        cmd = message.peek_cmd(raw)
+        try:
+            route = self.routes[cmd]
+        except KeyError:
+            self.unknown += 1
+            raise self.UnknownCommand("{0} unknown cmd {1}".format(self.name, cmd))
+
+        start = default_timer()
+        try:
+            route.handler(endpoint, route.decode(raw), raw)
+        finally:
+            elapsed = default_timer() - start
+            route.count += 1
+            route.seconds += elapsed
+            if elapsed > route.max_seconds:
+                route.max_seconds = elapsed
+
+
+    def stats(self):
+        """{cmd: {'count', 'seconds', 'max_seconds'}}, timings include decoding"""
+        stats = {}
+        for cmd, route in self.routes.items():
+            stats[cmd] = {
+                'count': route.count,
+                'seconds': route.seconds,
+                'max_seconds': route.max_seconds,
+            }
+        return stats
+
+
+    def log_stats(self):
+        for cmd, s in sorted(self.stats().items()):
+            logger.info("Router {0} cmd {1}: count {2}, seconds {3:.6f}, max {4:.6f}".format(
+                self.name, cmd, s['count'], s['seconds'], s['max_seconds']))
+        if self.unknown:
+            logger.info("Router {0} unknown cmd: count {1}".format(self.name, self.unknown))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# The runtime runs callbacks, timers and tcp servers for the game logic.
+# Game logic never blocks, so it runs the same on every runtime.
+#
+#     gevent:  codebattle.gevent_runtime.GeventRuntime
+#     asyncio: codebattle.asyncio_runtime.AsyncioRuntime (uvloop optional), python 3.7+
+#
+# The protomsg modules import on python 2 and 3 both, compile-protobufs.sh
+# keeps them so.
+
+RUNTIME_GEVENT = 'gevent'
+RUNTIME_ASYNCIO = 'asyncio'
+RUNTIME_UVLOOP = 'uvloop'
+
+_runtime = None
+
+
+class Runtime(object):
+    name = None
+
+    def spawn(self, func, *args):
+        """call func(*args) soon, not in the current call stack. return a handle"""
+        raise NotImplementedError()
+
+    def spawn_later(self, seconds, func, *args):
+        """call func(*args) after seconds. return a handle"""
+        raise NotImplementedError()
+
+    def cancel(self, handle):
+        """cancel a handle returned by spawn or spawn_later"""
+        raise NotImplementedError()
+
+    def serve(self, port, handler, reuse_port=False):
+        """listen on port, call handler(transport) for every new connection.
+
+        transport has start(endpoint), close(), fileno(), pending_data(), address and has_socket.
+        fileno() is None when has_socket is False, like for in process or gateway connections.
+        with reuse_port many processes can listen on the same port.
+        """
+        raise NotImplementedError()
+
+    def serve_unix(self, path, handler):
+        """like serve, listen on a unix socket path"""
+        raise NotImplementedError()
+
+    def connect_unix(self, path, handler):
+        """connect to a unix socket path, call handler(transport) once connected"""
+        raise NotImplementedError()
+
+    def adopt(self, fd, handler, data=b''):
+        """take over a connected tcp socket fd, received from another process.
+
+        data is received from the socket already, frames in it are handled first.
+        """
+        raise NotImplementedError()
+
+    def add_reader(self, fd, callback):
+        """call callback() every time fd is readable"""
+        raise NotImplementedError()
+
+    def run_forever(self):
+        raise NotImplementedError()
+
+
+def set_runtime(name):
+    """
+
+    :param name: RUNTIME_GEVENT, RUNTIME_ASYNCIO or RUNTIME_UVLOOP
+    :return: codebattle.runtime.Runtime
+    """
+    global _runtime
+    if name == RUNTIME_GEVENT:
+        from codebattle.gevent_runtime import GeventRuntime
+        _runtime = GeventRuntime()
+    elif name == RUNTIME_ASYNCIO:
+        from codebattle.asyncio_runtime import AsyncioRuntime
+        _runtime = AsyncioRuntime()
+    elif name == RUNTIME_UVLOOP:
+        from codebattle.asyncio_runtime import AsyncioRuntime
+        _runtime = AsyncioRuntime(use_uvloop=True)
+    else:
+        raise ValueError("Unknown runtime {0}".format(name))
+
+    return _runtime
+
+
+def get_runtime():
+    if _runtime is None:
+        set_runtime(RUNTIME_GEVENT)
+    return _runtime
+
+
+def spawn(func, *args):
+    return get_runtime().spawn(func, *args)
+
+def spawn_later(seconds, func, *args):
+    return get_runtime().spawn_later(seconds, func, *args)
+
+def cancel(handle):
+    get_runtime().cancel(handle)
+
+def serve(port, handler, reuse_port=False):
+    return get_runtime().serve(port, handler, reuse_port)
+
+def serve_unix(path, handler):
+    return get_runtime().serve_unix(path, handler)
+
+def connect_unix(path, handler):
+    return get_runtime().connect_unix(path, handler)
+
+def adopt(fd, handler, data=b''):
+    return get_runtime().adopt(fd, handler, data)
+
+def add_reader(fd, callback):
+    return get_runtime().add_reader(fd, callback)
+
+def run_forever():
+    get_runtime().run_forever()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# Delta scene updates.
+#
+# Every endpoint remembers what it received of every marine. A scene update
+# leaves out the optional fields (targetPosition, flaresAmount, role) which
+# did not change. The marines revealed by flares are skipped when the
+# endpoint has them already; the marine an update is about is always sent,
+# players take the update itself as the event.
+# id, hp, position and status are required by the proto, they are always sent.
+# Clients must keep the last value of an optional field when it is missing.
+#
+# Every KEYFRAME_INTERVAL-th update of an endpoint is a full one.
+# Delta updates are never collapsed in the outbound queue, a dropped one
+# would lose changes the next update does not carry.
+#
+# Tick batching.
+#
+# With a scene tick, a room collects the marines changed in the interval
+# and sends one SenceUpdate per recipient per tick, see SceneBatcher.
+
+from codebattle import clock
+from codebattle import message
+
+# off by default, clients have to understand missing optional fields
+SCENE_DELTA = False
+KEYFRAME_INTERVAL = 30
+# seconds, 0 sends every scene update right away
+SCENE_TICK = 0
+
+
+def marine_values(marine):
+    return (marine.hp, tuple(marine.position), marine.status,
+            tuple(marine.target_position), marine.flares_amount, marine.role)
+
+
+class SceneState(object):
+    """what one endpoint received of every marine"""
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        # (marine id, own) -> (marine version, marine_values)
+        self.sent = {}
+        self.updates = 0
+
+
+    def begin(self):
+        """start a new update, return True if it is a keyframe"""
+        self.updates += 1
+        return self.updates % self.keyframe_interval == 1 or self.keyframe_interval == 1
+
+
+    def view(self, marine, own, keyframe=False, skip_unchanged=False):
+        """
+
+        :param skip_unchanged: return None instead of the required fields only, if the endpoint has the marine already
+        :return: (marine, optional fields) to send
+        """
+        key = (marine.id, own)
+        last = self.sent.get(key)
+        if last is not None and last[0] == marine.version and not keyframe:
+            return None if skip_unchanged else (marine, 0)
+
+        values = marine_values(marine)
+        self.sent[key] = (marine.version, values)
+        if last is None or keyframe:
+            return marine, message.FIELDS_ALL
+
+        old = last[1]
+        if old == values:
+            return None if skip_unchanged else (marine, 0)
+
+        optional = 0
+        if values[3] != old[3]:
+            optional |= message.FIELD_TARGET_POSITION
+        if values[4] != old[4]:
+            optional |= message.FIELD_FLARES_AMOUNT
+        if values[5] != old[5]:
+            optional |= message.FIELD_ROLE
+        return marine, optional
+
+
+    def views(self, marines, own, keyframe, skip_unchanged=False):
+        views = []
+        for m in marines:
+            view = self.view(m, own, keyframe, skip_unchanged)
+            if view is not None:
+                views.append(view)
+        return views
+
+
+
+def state_of(endpoint):
+    """
+    :param endpoint: codebattle.endpoint.EndPoint
+    :return: SceneState
+    """
+    if endpoint.scene_state is None:
+        endpoint.scene_state = SceneState()
+    return endpoint.scene_state
+
+
+def pack_player_delta(player, my_marines, other_marines, revealed=()):
+    """the delta scene update for player, None when there is nothing new
+
+    :param revealed: other marines revealed by flares, the unchanged ones are skipped
+    """
+    state = state_of(player)
+    keyframe = state.begin()
+    my_views = state.views(my_marines, True, keyframe)
+    other_views = state.views(other_marines, False, keyframe)
+    other_views.extend(state.views(revealed, False, keyframe, skip_unchanged=True))
+    if not my_views and not other_views:
+        return None
+    return message.player.pack_sence_update_views(my_views, other_views)
+
+
+def pack_observer_delta(observer, marines):
+    state = state_of(observer)
+    return message.observer.pack_sence_update_views(state.views(marines, True, state.begin()))
+
+
+
+class SceneBatcher(object):
+    """collect the scene updates of a room, send one SenceUpdate per recipient every tick"""
+    def __init__(self, room, interval):
+        """
+
+        :param room: codebattle.room.Room
+        :param interval: seconds between two updates of a recipient
+        """
+        self.room = room
+        self.interval = interval
+        # player -> (own marines, other marines, revealed marines), by marine id
+        self.players = {}
+        self.observer_marines = {}
+        self.job = None
+
+
+    def add_player_update(self, player, my_marines, other_marines, revealed=()):
+        pending = self.players.get(player)
+        if pending is None:
+            pending = self.players[player] = ({}, {}, {})
+
+        my, others, reveal = pending
+        for m in my_marines:
+            my[m.id] = m
+        for m in other_marines:
+            others[m.id] = m
+            reveal.pop(m.id, None)
+        for m in revealed:
+            if m.id not in others:
+                reveal[m.id] = m
+
+        self.schedule()
+
+
+    def add_observer_update(self, marines):
+        for m in marines:
+            self.observer_marines[m.id] = m
+        self.schedule()
+
+
+    def schedule(self):
+        if self.job is None:
+            self.job = clock.call_later(self.interval, self.tick)
+
+
+    def tick(self):
+        self.job = None
+        self.flush()
+
+
+    def flush(self):
+        """send the pending updates now"""
+        if self.job is not None:
+            clock.cancel(self.job)
+            self.job = None
+
+        players, self.players = self.players, {}
+        observer_marines, self.observer_marines = self.observer_marines, {}
+
+        for p, (my, others, reveal) in players.items():
+            self.room.send_sence_update([p], list(my.values()), list(others.values()), revealed=list(reveal.values()))
+
+        if observer_marines:
+            self.room.send_observer_sence_update(list(observer_marines.values()))
+
+
+    def close(self):
+        if self.job is not None:
+            clock.cancel(self.job)
+            self.job = None
+        self.players = {}
+        self.observer_marines = {}
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+# Precomputed line of sight of a terrain map.
+#
+# The map is cut in sight cells of SIGHT_CELL x SIGHT_CELL map cells. Two
+# sight cells see each other when the segment between their centers crosses
+# no blocked map cell. Every sight cell keeps a bitset of the sight cells it
+# sees, so "can a see b" is one bit lookup. Positions in one sight cell share
+# the answer, the precision is the sight cell.
+#
+# The bitsets are built offline with the map (codebattle.mapbuild), saved
+# next to the map file as <map_id>.los and mmapped like the map. The server
+# never builds them, a map without bitsets or with bitsets of another
+# version of the map has OpenSight, nothing blocks the sight.
+#
+#     SIGHT_HEADER(magic, version, sight cell, map crc32, cells)
+#     bitsets: cells rows of (cells + 7) // 8 bytes, bit j of row i is
+#              row[j // 8] >> (j % 8) & 1
+
+import os
+import struct
+import logging
+
+from codebattle import maps
+
+logger = logging.getLogger('codebattle.sight')
+
+# map cells
+SIGHT_CELL = 2
+SIGHT_MAGIC = b'CBLS'
+SIGHT_VERSION = 1
+SIGHT_HEADER = struct.Struct('<4sHHII')
+
+
+class SightTableError(Exception):
+    pass
+
+
+class SightTable(object):
+    Error = SightTableError
+
+    def __init__(self, terrain_map, data, mm=None):
+        """
+
+        :param terrain_map: codebattle.maps.TerrainMap
+        :param data: buffer of a whole sight file
+        """
+        self.map = terrain_map
+        self.data = data
+        self.mm = mm
+        _, _, self.sight_cell, _, self.cells = SIGHT_HEADER.unpack_from(data)
+        self.columns = (terrain_map.width + self.sight_cell - 1) // self.sight_cell
+        self.row_bytes = (self.cells + 7) // 8
+        if len(data) != SIGHT_HEADER.size + self.cells * self.row_bytes:
+            raise SightTableError("Sight table of map {0} has a bad size".format(terrain_map.map_id))
+
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+    def cell_of(self, x, z):
+        cx, cz = self.map.cell_of(x, z)
+        return (cz // self.sight_cell) * self.columns + cx // self.sight_cell
+
+
+    def cells_see(self, a, b):
+        """
+        :param a: sight cell index
+        """
+        value = self.data[SIGHT_HEADER.size + a * self.row_bytes + b // 8]
+        if not isinstance(value, int):
+            value = ord(value)
+        return bool(value >> (b % 8) & 1)
+
+
+    def can_see(self, a, b):
+        """
+        :param a: (x, z)
+        """
+        return self.cells_see(self.cell_of(*a), self.cell_of(*b))
+
+
+
+class OpenSight(object):
+    """the sight of a map without a sight table, no filtering"""
+    def __init__(self, terrain_map):
+        self.map = terrain_map
+
+
+    def close(self):
+        pass
+
+
+    def can_see(self, a, b):
+        return True
+
+
+
+def _clear(free, width, x0, z0, x1, z1):
+    """True if the segment crosses no blocked cell, the cells of its ends excepted. in map cells"""
+    cx, cz = int(x0), int(z0)
+    end = (int(x1), int(z1))
+    if (cx, cz) == end:
+        return True
+    dx, dz = x1 - x0, z1 - z0
+    step_x = 1 if dx > 0 else -1
+    step_z = 1 if dz > 0 else -1
+    inf = float('inf')
+    next_x = ((cx + (step_x > 0)) - x0) / dx if dx else inf
+    next_z = ((cz + (step_z > 0)) - z0) / dz if dz else inf
+    delta_x = abs(1.0 / dx) if dx else inf
+    delta_z = abs(1.0 / dz) if dz else inf
+
+    # next_* are the segment fractions of the next cell borders
+    while min(next_x, next_z) < 1:
+        if next_x < next_z:
+            cx += step_x
+            next_x += delta_x
+        else:
+            cz += step_z
+            next_z += delta_z
+        if (cx, cz) == end:
+            return True
+        if not free[cz * width + cx]:
+            return False
+    return True
+
+
+def build(terrain_map, sight_cell=SIGHT_CELL):
+    """
+    :return: the bytes of the sight file of terrain_map
+    """
+    width, height = terrain_map.width, terrain_map.height
+    columns, rows = (width + sight_cell - 1) // sight_cell, (height + sight_cell - 1) // sight_cell
+    cells = columns * rows
+    row_bytes = (cells + 7) // 8
+    free = [not terrain_map.blocked(cx, cz) for cz in range(height) for cx in range(width)]
+
+    if all(free):
+        bitsets = bytearray(b'\xff') * (cells * row_bytes)
+    else:
+        bitsets = bytearray(cells * row_bytes)
+        centers = []
+        for cell in range(cells):
+            sz, sx = divmod(cell, columns)
+            x0, z0 = sx * sight_cell, sz * sight_cell
+            centers.append(((x0 + min(x0 + sight_cell, width)) / 2.0, (z0 + min(z0 + sight_cell, height)) / 2.0))
+
+        for a in range(cells):
+            ax, az = centers[a]
+            bitsets[a * row_bytes + a // 8] |= 1 << (a % 8)
+            for b in range(a + 1, cells):
+                bx, bz = centers[b]
+                if _clear(free, width, ax, az, bx, bz):
+                    bitsets[a * row_bytes + b // 8] |= 1 << (b % 8)
+                    bitsets[b * row_bytes + a // 8] |= 1 << (a % 8)
+
+    header = SIGHT_HEADER.pack(SIGHT_MAGIC, SIGHT_VERSION, sight_cell, terrain_map.checksum, cells)
+    logger.info("Map {0} sight table built, {1} cells".format(terrain_map.map_id, cells))
+    return header + bytes(bitsets)
+
+
+def load(terrain_map, path, sight_cell=SIGHT_CELL):
+    """
+    :return: SightTable, None if the file is missing or for another map version
+    """
+    if not os.path.exists(path):
+        return None
+
+    mm = maps.map_file(path)
+    if mm is None:
+        return None
+
+    try:
+        if len(mm) >= SIGHT_HEADER.size:
+            magic, version, table_cell, crc, _ = SIGHT_HEADER.unpack_from(mm)
+            if (magic, version, table_cell, crc) == (SIGHT_MAGIC, SIGHT_VERSION, sight_cell, terrain_map.checksum):
+                return SightTable(terrain_map, mm, mm)
+    except SightTableError:
+        logger.warning("Sight table {0} is broken".format(path))
+
+    mm.close()
+    return None
+
+
+def sight_of(terrain_map, sight_cell=SIGHT_CELL):
+    """the SightTable of terrain_map, loaded once per process. never built here
+
+    :param terrain_map: codebattle.maps.TerrainMap
+    :return: SightTable, OpenSight if the map has no table
+    """
+    if terrain_map.sight is not None:
+        return terrain_map.sight
+
+    path = terrain_map.table_path('.los')
+    table = load(terrain_map, path, sight_cell) if path is not None else None
+    if table is None:
+        if path is not None:
+            logger.warning("Map {0} has no sight table {1}, sight is not filtered. "
+                           "Build it with codebattle.mapbuild".format(terrain_map.map_id, path))
+        table = OpenSight(terrain_map)
+
+    terrain_map.sight = table
+    return table
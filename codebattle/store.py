@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Struct of arrays marine store.
+#
+# A room may keep the fields of its marines in numpy arrays, one row per
+# marine. StoredMarine is a Marine whose fields are properties over its row,
+# so the game logic is unchanged, and room wide work (damage, visibility,
+# movement) can run vectorized over the arrays.
+# Code writing the arrays directly must bump the version column of the
+# rows it changed, see codebattle.marine.Marine.touch.
+#
+# numpy is optional, without it rooms use plain Marine objects.
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from codebattle.marine import Marine
+
+# off by default, a room asked for a store without numpy uses plain marines
+MARINE_STORE = False
+STORE_INITIAL_CAPACITY = 16
+
+if numpy is not None:
+    STORE_COLUMNS = (
+        ('id', numpy.int32),
+        ('hp', numpy.int32),
+        ('x', numpy.float64),
+        ('z', numpy.float64),
+        ('target_x', numpy.float64),
+        ('target_z', numpy.float64),
+        ('status', numpy.int8),
+        ('role', numpy.int8),
+        ('flares', numpy.int32),
+        ('last_gunshot', numpy.float64),
+        ('version', numpy.int64),
+        # see MarineStore.owner_index, 0 before the marine joins a player
+        ('owner', numpy.int32),
+    )
+
+
+def available():
+    return numpy is not None
+
+
+class MarineStore(object):
+    def __init__(self, capacity=STORE_INITIAL_CAPACITY):
+        if numpy is None:
+            raise RuntimeError("MarineStore needs numpy")
+
+        self.capacity = capacity
+        self.size = 0
+        # row -> StoredMarine
+        self.marines = []
+        # player -> owner column value
+        self.owners = {}
+        for name, dtype in STORE_COLUMNS:
+            setattr(self, name, numpy.zeros(capacity, dtype))
+
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, dtype in STORE_COLUMNS:
+            column = numpy.zeros(self.capacity, dtype)
+            column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+
+
+    def allocate(self, marine):
+        """
+        :return: the row of marine
+        """
+        if self.size == self.capacity:
+            self._grow()
+
+        row = self.size
+        self.size += 1
+        self.marines.append(marine)
+        return row
+
+
+    def create_marine(self, id, position):
+        return StoredMarine(id, position, self)
+
+
+    def column(self, name):
+        """the used part of column name, a view, writes go to the store"""
+        return getattr(self, name)[:self.size]
+
+
+    def alive_rows(self):
+        return numpy.flatnonzero(self.column('hp') > 0)
+
+
+    def touch(self, rows):
+        """bump the version of rows after writing the arrays directly"""
+        self.version[rows] += 1
+
+
+    def marines_of(self, rows):
+        return [self.marines[row] for row in rows]
+
+
+    def owner_index(self, player):
+        """the owner column value of the marines of player"""
+        if player not in self.owners:
+            self.owners[player] = len(self.owners) + 1
+        return self.owners[player]
+
+
+
+def _column_property(column, cast):
+    def getter(self):
+        return cast(getattr(self.store, column)[self.row])
+
+    def setter(self, value):
+        getattr(self.store, column)[self.row] = value
+
+    return property(getter, setter)
+
+
+def _pair_property(column_x, column_z):
+    def getter(self):
+        return [float(getattr(self.store, column_x)[self.row]), float(getattr(self.store, column_z)[self.row])]
+
+    def setter(self, value):
+        getattr(self.store, column_x)[self.row], getattr(self.store, column_z)[self.row] = value
+
+    return property(getter, setter)
+
+
+class StoredMarine(Marine):
+    """a Marine viewing one row of a MarineStore
+
+    position and target_position read as new lists, assign them instead of changing the lists.
+    """
+    id = _column_property('id', int)
+    hp = _column_property('hp', int)
+    status = _column_property('status', int)
+    role = _column_property('role', int)
+    flares_amount = _column_property('flares', int)
+    last_gunshot_time = _column_property('last_gunshot', float)
+    version = _column_property('version', int)
+    position = _pair_property('x', 'z')
+    target_position = _pair_property('target_x', 'target_z')
+
+    def __init__(self, id, position, store):
+        """
+
+        :param store: MarineStore
+        """
+        self.store = store
+        self.row = store.allocate(self)
+        super(StoredMarine, self).__init__(id, position)
+
+
+    def set_player(self, player):
+        super(StoredMarine, self).set_player(player)
+        self.store.owner[self.row] = self.store.owner_index(player)
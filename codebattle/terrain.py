@@ -3,8 +3,120 @@
 __author__ = 'Wang Chao'
 __date__ = '14-6-22'
 
+from codebattle import maps
+from codebattle import pathing
+from codebattle import sight
+
+GRID_CELL_SIZE = 5
+
+
+class SpatialGrid(object):
+    """uniform grid of the alive marines on a terrain, for radius and rectangle queries"""
+    def __init__(self, size, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.max_cell = (int(size[0] // cell_size), int(size[1] // cell_size))
+        # (cell x, cell z) -> set of marines
+        self.cells = {}
+        # marine -> cell
+        self.where = {}
+
+
+    def _cell(self, x, z):
+        cx = min(max(int(x // self.cell_size), 0), self.max_cell[0])
+        cz = min(max(int(z // self.cell_size), 0), self.max_cell[1])
+        return cx, cz
+
+
+    def insert(self, marine):
+        """
+        :param marine: codebattle.marine.Marine, it calls update after every move
+        """
+        marine.grid = self
+        self.update(marine)
+
+
+    def update(self, marine):
+        cell = self._cell(*marine.position)
+        old = self.where.get(marine)
+        if old == cell:
+            return
+
+        if old is not None:
+            self.cells[old].discard(marine)
+        self.cells.setdefault(cell, set()).add(marine)
+        self.where[marine] = cell
+
+
+    def remove(self, marine):
+        marine.grid = None
+        cell = self.where.pop(marine, None)
+        if cell is not None:
+            self.cells[cell].discard(marine)
+
+
+    def query_rect(self, x0, z0, x1, z1):
+        """marines with x0 <= x <= x1 and z0 <= z <= z1"""
+        cx0, cz0 = self._cell(x0, z0)
+        cx1, cz1 = self._cell(x1, z1)
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cz in range(cz0, cz1 + 1):
+                for m in self.cells.get((cx, cz), ()):
+                    x, z = m.position
+                    if x0 <= x <= x1 and z0 <= z <= z1:
+                        found.append(m)
+        return found
+
+
+    def query_radius(self, x, z, radius):
+        """marines within radius of (x, z)"""
+        radius_square = radius * radius
+        found = []
+        for m in self.query_rect(x - radius, z - radius, x + radius, z + radius):
+            mx, mz = m.position
+            if (mx - x) * (mx - x) + (mz - z) * (mz - z) <= radius_square:
+                found.append(m)
+        return found
+
+
 
 class Terrain(object):
     def __init__(self, map_id):
         self.map_id = map_id
-        self.size = (50, 50)
+        # codebattle.maps.TerrainMap, shared by every room on the map
+        self.map = maps.get_map(map_id)
+        self.size = self.map.size
+        self.grid = SpatialGrid(self.size)
+
+
+    def blocked_at(self, x, z):
+        return self.map.blocked_at(x, z)
+
+
+    @property
+    def paths(self):
+        """codebattle.pathing.PathTable of the map"""
+        return pathing.paths_of(self.map)
+
+    def connected(self, start, goal):
+        return self.paths.connected(start, goal)
+
+    def find_path(self, start, goal):
+        """
+        :param start: (x, z)
+        :return: [[x, z]] waypoints ending at goal, None if goal can not be reached
+        """
+        return self.paths.find_path(start, goal)
+
+
+    @property
+    def sight(self):
+        """codebattle.sight.SightTable of the map"""
+        return sight.sight_of(self.map)
+
+    def can_see(self, a, b):
+        """
+        :param a: (x, z)
+        :return: True if nothing blocks the line from a to b
+        """
+        return self.sight.can_see(a, b)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# Hierarchical timer wheel for the long timers of the process.
+#
+# Room timeouts and idle room expiry are minutes away and most of them are
+# cancelled, one runtime timer each would be a waste. The wheel keeps them
+# in WHEEL_LEVELS levels of WHEEL_SLOTS slots, level n slots are
+# WHEEL_SLOTS ** n ticks wide. A timer goes to the lowest level its delay
+# fits in and moves down a level every time its slot comes round, it fires
+# from level 0. Adding and cancelling are O(1), a pending timer is one small
+# object in a slot set.
+#
+# The wheel runs on the game clock (codebattle.clock), one clock timer per
+# tick while it holds timers, none when it is empty. Short delays stay on
+# the clock, the wheel rounds up to WHEEL_TICK.
+
+import math
+
+from codebattle import clock
+
+# seconds
+WHEEL_TICK = 0.5
+WHEEL_SLOTS = 64
+WHEEL_LEVELS = 4
+
+_wheel = None
+
+
+class WheelTimer(object):
+    __slots__ = ('due', 'func', 'args', 'bucket')
+
+    def __init__(self, due, func, args):
+        self.due = due
+        self.func = func
+        self.args = args
+        # the slot set holding the timer, None once fired or cancelled
+        self.bucket = None
+
+
+
+class TimerWheel(object):
+    def __init__(self, tick=WHEEL_TICK, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock.get_clock()
+        self.origin = self.clock.now()
+        # the last tick run
+        self.ticks = 0
+        self.count = 0
+        # [level][slot] -> set of WheelTimer, created on use
+        self.wheels = [[None] * slots for _ in range(levels)]
+        self.job = None
+
+
+    def _now_ticks(self):
+        return int((self.clock.now() - self.origin) / self.tick)
+
+
+    def call_later(self, seconds, func, *args):
+        """call func(*args) after seconds, rounded up to the tick. return a handle"""
+        if self.count == 0:
+            # nothing ran while empty, catch up with the clock
+            self.ticks = max(self.ticks, self._now_ticks())
+
+        due = max(self._now_ticks() + int(math.ceil(seconds / self.tick)), self.ticks + 1)
+        timer = WheelTimer(due, func, args)
+        self._place(timer)
+        self.count += 1
+
+        if self.job is None:
+            self.job = self.clock.call_later(self.tick, self._run)
+        return timer
+
+
+    def cancel(self, timer):
+        if timer.bucket is None:
+            return
+        timer.bucket.discard(timer)
+        timer.bucket = None
+        self.count -= 1
+
+        if self.count == 0 and self.job is not None:
+            self.clock.cancel(self.job)
+            self.job = None
+
+
+    def _place(self, timer):
+        delay = timer.due - self.ticks
+        # timers beyond the top level wait in its last slot of this round
+        due = timer.due if delay < self.slots ** self.levels else self.ticks + self.slots ** self.levels - 1
+
+        level = 0
+        while level < self.levels - 1 and delay >= self.slots ** (level + 1):
+            level += 1
+        slot = (due // self.slots ** level) % self.slots
+
+        bucket = self.wheels[level][slot]
+        if bucket is None:
+            bucket = self.wheels[level][slot] = set()
+        bucket.add(timer)
+        timer.bucket = bucket
+
+
+    def _advance(self):
+        """run one tick"""
+        self.ticks += 1
+        t = self.ticks
+
+        for level in range(self.levels - 1, 0, -1):
+            width = self.slots ** level
+            if t % width:
+                continue
+            slot = (t // width) % self.slots
+            bucket = self.wheels[level][slot]
+            if bucket:
+                self.wheels[level][slot] = None
+                for timer in bucket:
+                    self._place(timer)
+
+        slot = t % self.slots
+        bucket = self.wheels[0][slot]
+        if not bucket:
+            return
+        self.wheels[0][slot] = None
+        for timer in list(bucket):
+            if timer.bucket is not bucket:
+                # cancelled by a callback of this tick
+                continue
+            if timer.due > t:
+                # a later round
+                self._place(timer)
+                continue
+            timer.bucket = None
+            self.count -= 1
+            timer.func(*timer.args)
+
+
+    def _run(self):
+        self.job = None
+        target = self._now_ticks()
+        while self.ticks < target and self.count:
+            self._advance()
+        if not self.count:
+            self.ticks = max(self.ticks, target)
+
+        if self.count and self.job is None:
+            self.job = self.clock.call_later(self.tick, self._run)
+
+
+    def __len__(self):
+        return self.count
+
+
+
+def get_wheel():
+    """the timer wheel of the process, on the current clock"""
+    global _wheel
+    if _wheel is None or _wheel.clock is not clock.get_clock():
+        _wheel = TimerWheel()
+    return _wheel
+
+
+def call_later(seconds, func, *args):
+    return get_wheel().call_later(seconds, func, *args)
+
+def cancel(timer):
+    get_wheel().cancel(timer)
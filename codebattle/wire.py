@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+# Protobuf wire format helpers, for reading a field without parsing the whole message.
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH = 2
+WIRE_FIXED32 = 5
+
+
+class DecodeError(Exception):
+    pass
+
+
+if bytes is str:
+    def byte_values(data):
+        """data indexed as ints. python 2 indexes str and memoryview as 1 char strings, those are copied"""
+        if isinstance(data, bytearray):
+            return data
+        return bytearray(data)
+else:
+    def byte_values(data):
+        """data indexed as ints"""
+        return data
+
+
+def read_varint(data, pos):
+    """
+
+    :param data: indexed as ints, see byte_values
+    :return: (value, position after the varint)
+    """
+    result = 0
+    shift = 0
+    while True:
+        try:
+            b = data[pos]
+        except IndexError:
+            raise DecodeError("Truncated varint")
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("Too long varint")
+
+
+def skip_field(data, pos, wire_type):
+    """return the position after a field value of wire_type"""
+    if wire_type == WIRE_VARINT:
+        return read_varint(data, pos)[1]
+    if wire_type == WIRE_FIXED64:
+        return pos + 8
+    if wire_type == WIRE_LENGTH:
+        length, pos = read_varint(data, pos)
+        return pos + length
+    if wire_type == WIRE_FIXED32:
+        return pos + 4
+    raise DecodeError("Unsupported wire type {0}".format(wire_type))
+
+
+def find_varint(data, field_number, default=None):
+    """value of the first varint field_number in the serialized message data"""
+    data = byte_values(data)
+    pos = 0
+    end = len(data)
+    while pos < end:
+        tag, pos = read_varint(data, pos)
+        wire_type = tag & 0x07
+        if tag >> 3 == field_number and wire_type == WIRE_VARINT:
+            return read_varint(data, pos)[0]
+        pos = skip_field(data, pos, wire_type)
+    return default
+
+
+def encode_varint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def length_delimited(field_number, data):
+    """encode data as the field_number field of a message. messages can be spliced this way"""
+    return encode_varint((field_number << 3) | WIRE_LENGTH) + encode_varint(len(data)) + data
+
+
+def find_length_delimited(data, field_number):
+    """bytes of the length delimited field_number, None if missing.
+
+    occurrences of a sub message field are concatenated, which parses the same as merging them.
+    """
+    data = byte_values(data)
+    found = []
+    pos = 0
+    end = len(data)
+    while pos < end:
+        tag, pos = read_varint(data, pos)
+        wire_type = tag & 0x07
+        if tag >> 3 == field_number and wire_type == WIRE_LENGTH:
+            length, pos = read_varint(data, pos)
+            if pos + length > end:
+                raise DecodeError("Truncated field {0}".format(field_number))
+            found.append(data[pos:pos + length])
+            pos += length
+            continue
+        pos = skip_field(data, pos, wire_type)
+
+    if not found:
+        return None
+    if len(found) == 1:
+        return found[0]
+    return b''.join([memoryview(f).tobytes() for f in found])
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+# Multi process mode.
+#
+# Every worker listens on the same ports with SO_REUSEPORT, the kernel spreads
+# the connections. A room lives in the worker which created it, the worker
+# index is encoded in the room id (room_id % worker_count).
+# When a player asks to join a room of another worker, the connection is
+# handed off to the owner: the socket fd and the bytes already received are
+# sent over the owner's unix datagram socket. Ids of no live room, per the
+# shared codebattle.registry.OwnerDirectory, are answered locally.
+#
+# Python 2 has no socket.sendmsg, _multiprocessing.sendfd sends the fd in a
+# one byte datagram of its own then. The sender binds an autobind address and
+# sends the bytes first, the owner pairs the fd with the bytes of the same
+# sender address.
+
+import os
+import sys
+import array
+import socket
+import signal
+import shutil
+import tempfile
+import logging
+
+try:
+    import _multiprocessing
+except ImportError:
+    _multiprocessing = None
+
+from codebattle import runtime
+from codebattle.framing import frame
+from codebattle.registry import OwnerDirectory
+
+logger = logging.getLogger('codebattle.worker')
+
+HANDOFF_FILE = 'worker-{0}.sock'
+HANDOFF_MAX_SIZE = 64 * 1024
+HANDOFF_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
+worker_index = 0
+worker_count = 1
+handoff = None
+# codebattle.registry.OwnerDirectory of the workers
+directory = None
+
+
+def owner_of(room_id):
+    return room_id % worker_count
+
+
+def is_local(room_id):
+    return owner_of(room_id) == worker_index
+
+
+def may_exist(room_id):
+    """False if the directory knows no room room_id"""
+    return directory is None or directory.owner_of(room_id) is not None
+
+
+class Handoff(object):
+    """send and receive connections between workers"""
+    def __init__(self, handoff_dir):
+        self.handoff_dir = handoff_dir
+        self.sock = None
+        # sender address -> bytes waiting for their fd, without sendmsg
+        self.pending = {}
+
+
+    def path(self, index):
+        return os.path.join(self.handoff_dir, HANDOFF_FILE.format(index))
+
+
+    def listen(self, handler):
+        """
+
+        :param handler: called with the transport of every connection handed to this worker
+        """
+        self.handler = handler
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, HANDOFF_MAX_SIZE * 4)
+        self.sock.bind(self.path(worker_index))
+        self.sock.setblocking(False)
+        if HANDOFF_SENDMSG:
+            runtime.add_reader(self.sock.fileno(), self._on_readable)
+        else:
+            runtime.add_reader(self.sock.fileno(), self._on_readable_fd_datagram)
+
+
+    def _on_readable(self):
+        fd_size = array.array('i').itemsize
+        while True:
+            try:
+                data, ancdata, flags, address = self.sock.recvmsg(HANDOFF_MAX_SIZE, socket.CMSG_SPACE(fd_size))
+            except socket.error:
+                return
+
+            fds = array.array('i')
+            for level, _type, cmsg_data in ancdata:
+                if level == socket.SOL_SOCKET and _type == socket.SCM_RIGHTS:
+                    fds.frombytes(cmsg_data[:len(cmsg_data) - len(cmsg_data) % fd_size])
+
+            for fd in fds:
+                runtime.adopt(fd, self.handler, data)
+
+
+    def _on_readable_fd_datagram(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(HANDOFF_MAX_SIZE, socket.MSG_PEEK)
+                if len(data) > 1:
+                    self.sock.recv(HANDOFF_MAX_SIZE)
+                    self.pending[address] = data
+                    continue
+                fd = _multiprocessing.recvfd(self.sock.fileno())
+            except (socket.error, OSError):
+                return
+
+            data = self.pending.pop(address, None)
+            if data is None:
+                logger.warning("Handoff fd {0} from {1!r} without data, dropped".format(fd, address))
+                os.close(fd)
+                continue
+            runtime.adopt(fd, self.handler, data)
+
+
+    def send(self, index, fd, data):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        try:
+            if HANDOFF_SENDMSG:
+                sock.sendmsg([data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', [fd]))], 0, self.path(index))
+            else:
+                # autobind, the owner pairs the two datagrams by this address
+                sock.bind('')
+                sock.connect(self.path(index))
+                sock.send(data)
+                _multiprocessing.sendfd(sock.fileno(), fd)
+        finally:
+            sock.close()
+
+
+def handoff_endpoint(endpoint, room_id, data):
+    """hand the connection of endpoint to the worker owns room_id
+
+    :param endpoint: codebattle.endpoint.EndPoint
+    :param data: the frame asked for the room, it will be handled again by the owner
+    """
+    owner = owner_of(room_id)
+    pending = frame(memoryview(data).tobytes()) + endpoint.transport.pending_data()
+    try:
+        handoff.send(owner, endpoint.transport.fileno(), pending)
+    except (socket.error, OSError) as e:
+        logger.warning("EndPoint {0} handoff to worker {1} failed. {2}".format(id(endpoint), owner, e))
+    else:
+        logger.info("EndPoint {0} handoff to worker {1}".format(id(endpoint), owner))
+
+    # the owner holds its own fd, closing ours keeps the connection open
+    endpoint.terminate()
+
+
+
+class WorkerLauncher(object):
+    def __init__(self, amount, observer_port, player_port, runtime_name=runtime.RUNTIME_GEVENT):
+        self.amount = amount
+        self.observer_port = observer_port
+        self.player_port = player_port
+        self.runtime_name = runtime_name
+        self.pids = []
+
+
+    def run(self):
+        handoff_dir = tempfile.mkdtemp(prefix='codebattle-')
+        OwnerDirectory(OwnerDirectory.path_in(handoff_dir), create=True).close()
+        try:
+            for index in range(self.amount):
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        self.run_worker(index, handoff_dir)
+                    finally:
+                        os._exit(0)
+
+                self.pids.append(pid)
+                logger.info("Start worker {0} pid {1}".format(index, pid))
+
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            self.wait()
+        finally:
+            shutil.rmtree(handoff_dir, ignore_errors=True)
+
+
+    def wait(self):
+        try:
+            while self.pids:
+                pid, status = os.wait()
+                if pid in self.pids:
+                    self.pids.remove(pid)
+                    logger.warning("Worker pid {0} exit with status {1}".format(pid, status))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for pid in self.pids:
+                os.kill(pid, signal.SIGTERM)
+
+
+    def run_worker(self, index, handoff_dir):
+        global worker_index, worker_count, handoff, directory
+        from codebattle.observer import ObserverManager
+        from codebattle.player import PlayerManager
+
+        worker_index = index
+        worker_count = self.amount
+        directory = OwnerDirectory(OwnerDirectory.path_in(handoff_dir))
+
+        runtime.set_runtime(self.runtime_name)
+
+        ob = ObserverManager(self.observer_port, reuse_port=True)
+        ob.start()
+
+        p = PlayerManager(self.player_port, reuse_port=True)
+        p.start()
+
+        handoff = Handoff(handoff_dir)
+        handoff.listen(p._connection_handler)
+
+        logger.info("Worker {0} running".format(worker_index))
+        runtime.run_forever()
@@ -5,5 +5,9 @@ __date__ = '14-6-22'
 
 from codebattle import CodeBattle
 
+# terrain maps are off by default, every room plays the 50x50 default map.
+# map_dir is the directory of the <map_id>.map files, see codebattle.maps:
+#
+#     cb = CodeBattle(map_dir='/var/lib/codebattle/maps')
 cb = CodeBattle()
 cb.run()
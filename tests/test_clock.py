@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.clock.VirtualClock on a fake runtime and a fake wall clock.
+
+import unittest
+
+from codebattle import clock
+from codebattle import runtime
+from codebattle.clock import VirtualClock
+
+
+class FakeWallClock(object):
+    def __init__(self):
+        self.wall = 1000.0
+
+    def time(self):
+        return self.wall
+
+
+
+class FakeHandle(object):
+    def __init__(self, delay, func, args):
+        self.delay = delay
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+
+
+class FakeRuntime(runtime.Runtime):
+    """runs nothing by itself, the test calls run_soon and run_later"""
+    def __init__(self):
+        self.soon = []
+        self.later = []
+
+    def spawn(self, func, *args):
+        handle = FakeHandle(0, func, args)
+        self.soon.append(handle)
+        return handle
+
+    def spawn_later(self, seconds, func, *args):
+        handle = FakeHandle(seconds, func, args)
+        self.later.append(handle)
+        return handle
+
+    def cancel(self, handle):
+        handle.cancelled = True
+
+
+    def run_soon(self):
+        while self.soon:
+            handle = self.soon.pop(0)
+            if not handle.cancelled:
+                handle.func(*handle.args)
+
+
+    def pending_later(self):
+        return [handle for handle in self.later if not handle.cancelled]
+
+
+    def run_later(self, handle):
+        self.later.remove(handle)
+        handle.func(*handle.args)
+
+
+
+class VirtualClockTest(unittest.TestCase):
+    def setUp(self):
+        self.wall = FakeWallClock()
+        self.real_time = clock.time
+        clock.time = self.wall
+        self.real_runtime = runtime._runtime
+        self.runtime = runtime._runtime = FakeRuntime()
+        self.fired = []
+
+
+    def tearDown(self):
+        clock.time = self.real_time
+        runtime._runtime = self.real_runtime
+
+
+    def fire(self, name):
+        self.fired.append(name)
+
+
+    def test_advance(self):
+        vclock = VirtualClock(auto=False)
+        vclock.call_later(5, self.fire, 'b')
+        vclock.call_later(1, self.fire, 'a')
+        cancelled = vclock.call_later(3, self.fire, 'cancelled')
+        vclock.cancel(cancelled)
+
+        self.assertTrue(vclock.advance())
+        self.assertEqual(vclock.now(), 1)
+        self.assertTrue(vclock.advance())
+        self.assertEqual(vclock.now(), 5)
+        self.assertFalse(vclock.advance())
+        self.assertEqual(self.fired, ['a', 'b'])
+        self.assertEqual(self.runtime.soon, [])
+
+
+    def test_auto_jumps_to_the_next_timer(self):
+        vclock = VirtualClock()
+        vclock.call_later(100, self.fire, 'guard')
+        self.assertEqual(self.runtime.later, [])
+
+        self.runtime.run_soon()
+        self.assertEqual(self.fired, ['guard'])
+        self.assertEqual(vclock.now(), 100)
+
+
+    def test_held_follows_the_wall_clock(self):
+        vclock = VirtualClock()
+        vclock.hold()
+        vclock.call_later(10, self.fire, 'guard')
+
+        # the guard waits 10 wall seconds, it does not fire at once
+        self.runtime.run_soon()
+        self.assertEqual(self.fired, [])
+        [step] = self.runtime.pending_later()
+        self.assertEqual(step.delay, 10)
+
+        self.wall.wall += 4
+        self.assertEqual(vclock.now(), 4)
+
+        self.wall.wall += 6
+        self.runtime.run_later(step)
+        self.assertEqual(self.fired, ['guard'])
+        self.assertEqual(vclock.now(), 10)
+
+
+    def test_earlier_timer_reschedules_the_step(self):
+        vclock = VirtualClock()
+        vclock.hold()
+        vclock.call_later(10, self.fire, 'late')
+        vclock.call_later(2, self.fire, 'early')
+
+        [step] = self.runtime.pending_later()
+        self.assertEqual(step.delay, 2)
+        self.wall.wall += 2
+        self.runtime.run_later(step)
+        self.assertEqual(self.fired, ['early'])
+
+        [step] = self.runtime.pending_later()
+        self.assertEqual(step.delay, 8)
+
+
+    def test_release_goes_back_to_jumping(self):
+        vclock = VirtualClock()
+        vclock.hold()
+        vclock.hold()
+        vclock.call_later(10, self.fire, 'guard')
+        self.wall.wall += 3
+
+        vclock.release()
+        # still held by the other peer
+        self.runtime.run_soon()
+        self.assertEqual(self.fired, [])
+        self.assertEqual(len(self.runtime.pending_later()), 1)
+
+        vclock.release()
+        self.assertEqual(self.runtime.pending_later(), [])
+        self.runtime.run_soon()
+        self.assertEqual(self.fired, ['guard'])
+        self.assertEqual(vclock.now(), 10)
+
+        # the clock keeps the paced time after the holds are gone
+        self.wall.wall -= 100
+        self.assertEqual(vclock.now(), 10)
+
+
+    def test_hold_keeps_the_time(self):
+        vclock = VirtualClock(start=50)
+        vclock.hold()
+        self.assertEqual(vclock.now(), 50)
+        self.wall.wall += 1
+        self.assertEqual(vclock.now(), 51)
+        vclock.release()
+
+        vclock.hold()
+        self.assertEqual(vclock.now(), 51)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
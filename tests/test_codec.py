@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.codec against the generated protomsg classes, both must give the same bytes.
+
+import unittest
+
+from codebattle import codec
+from codebattle import message
+from codebattle.marine import Marine
+from codebattle.protomsg import api_pb2, observer_pb2, marine_pb2
+
+
+def frames(data):
+    """the types a frame reaches the decoders as"""
+    return [data, bytearray(data), memoryview(bytearray(data))]
+
+
+def new_marine(marine_id, x, z, hp=100, status=marine_pb2.Run, role=marine_pb2.Attacker):
+    m = Marine(marine_id, (x, z))
+    m.hp = hp
+    m.status = status
+    m.role = role
+    m.target_position = (x + 1.5, z - 2.25)
+    m.flares_amount = 3
+    return m
+
+
+def set_status(msg, marine_id, status, x, z):
+    msg.id = marine_id
+    msg.status = status
+    msg.position.x = x
+    msg.position.z = z
+
+
+def status_to_pb2(status, msg):
+    set_status(msg, status.id, status.status, status.position.x, status.position.z)
+
+
+class DecodeTest(unittest.TestCase):
+    def player_operate(self, data):
+        """decode data with the codec, serialize the result with api_pb2"""
+        o = codec.decode_player_operate(data)
+        cmd = api_pb2.Cmd()
+        cmd.cmd = api_pb2.marineoperate
+        cmd.opt.id = o.id
+        cmd.opt.status = o.status
+        cmd.opt.targetPostion.x = o.targetPostion.x
+        cmd.opt.targetPostion.z = o.targetPostion.z
+        return cmd.SerializeToString()
+
+
+    def observer_report(self, data):
+        """decode data with the codec, serialize the result with observer_pb2"""
+        r = codec.decode_observer_report(data)
+        cmd = observer_pb2.Cmd()
+        cmd.cmd = observer_pb2.marinereport
+        cmd.mrt.report = r.report
+        # the codec reads missing sub messages as default ones, like the generated classes
+        parsed = observer_pb2.Cmd()
+        parsed.ParseFromString(bytes(bytearray(data)))
+        for name in ('midle', 'mattack', 'mdamage'):
+            if parsed.mrt.HasField(name):
+                status_to_pb2(getattr(r, name), getattr(cmd.mrt, name))
+        if parsed.mrt.HasField('reporterId'):
+            cmd.mrt.reporterId = r.reporterId
+        for m in r.marines:
+            status_to_pb2(m, cmd.mrt.marines.add())
+        return cmd.SerializeToString()
+
+
+    def test_player_operate(self):
+        for marine_id, x, z in [(1, 10.5, 12.0), (1000, 0.0, 49.75), (-3, -1.5, 3.25)]:
+            cmd = api_pb2.Cmd()
+            cmd.cmd = api_pb2.marineoperate
+            cmd.opt.id = marine_id
+            cmd.opt.status = marine_pb2.GunAttack
+            cmd.opt.targetPostion.x = x
+            cmd.opt.targetPostion.z = z
+            data = cmd.SerializeToString()
+            for frame in frames(data):
+                self.assertEqual(self.player_operate(frame), data)
+
+
+    def test_player_operate_without_target(self):
+        cmd = api_pb2.Cmd()
+        cmd.cmd = api_pb2.marineoperate
+        cmd.opt.id = 7
+        cmd.opt.status = marine_pb2.Idle
+        o = codec.decode_player_operate(cmd.SerializeToString())
+        self.assertEqual((o.id, o.status, o.targetPostion.x, o.targetPostion.z), (7, marine_pb2.Idle, 0.0, 0.0))
+
+
+    def test_observer_reports(self):
+        reports = []
+
+        cmd = observer_pb2.Cmd()
+        cmd.cmd = observer_pb2.marinereport
+        cmd.mrt.report = observer_pb2.toidle
+        set_status(cmd.mrt.midle, 3, marine_pb2.Idle, 3.0, 4.0)
+        reports.append(cmd)
+
+        cmd = observer_pb2.Cmd()
+        cmd.cmd = observer_pb2.marinereport
+        cmd.mrt.report = observer_pb2.damage
+        set_status(cmd.mrt.mattack, 1, marine_pb2.GunAttack, 1.0, 2.0)
+        set_status(cmd.mrt.mdamage, 2, marine_pb2.Idle, 5.5, 6.5)
+        reports.append(cmd)
+
+        for report in (observer_pb2.flares, observer_pb2.flares2, observer_pb2.gunattack):
+            cmd = observer_pb2.Cmd()
+            cmd.cmd = observer_pb2.marinereport
+            cmd.mrt.report = report
+            cmd.mrt.reporterId = 1
+            for i in range(3):
+                set_status(cmd.mrt.marines.add(), 10 + i, marine_pb2.Run, i * 2.5, 49.0 - i)
+            reports.append(cmd)
+
+        for cmd in reports:
+            data = cmd.SerializeToString()
+            for frame in frames(data):
+                self.assertEqual(self.observer_report(frame), data)
+
+
+    def test_unusual_messages_fall_back(self):
+        cmd = api_pb2.Cmd()
+        cmd.cmd = api_pb2.joinroom
+        cmd.jrm.roomid = 1
+        self.assertRaises(codec.DecodeError, codec.decode_player_operate, cmd.SerializeToString())
+
+        cmd = api_pb2.Cmd()
+        cmd.cmd = api_pb2.marineoperate
+        cmd.opt.id = 1
+        cmd.opt.status = marine_pb2.Run
+        data = cmd.SerializeToString()
+        self.assertRaises(codec.DecodeError, codec.decode_player_operate, data[:-1])
+        self.assertRaises(codec.DecodeError, codec.decode_player_operate, data + b'\x50\x01')
+
+        # a player Cmd the codec rejects still decodes through api_pb2
+        self.assertEqual(message.player.decode_operate_marine(data + b'\x50\x01').id, 1)
+
+
+
+class EncodeTest(unittest.TestCase):
+    def setUp(self):
+        self.marines = [
+            new_marine(1, 10.5, 12.0),
+            new_marine(2, 0.0, 0.0, hp=0, status=marine_pb2.Dead, role=marine_pb2.Injured),
+            new_marine(-5, 49.75, 3.125, hp=-20, status=marine_pb2.Idle, role=marine_pb2.Normal),
+        ]
+
+
+    def test_marine(self):
+        for m in self.marines:
+            for own in (True, False):
+                for optional in range(codec.FIELDS_ALL + 1):
+                    expected = message.marine_obj_to_protobuf(m, own, optional).SerializeToString()
+                    self.assertEqual(codec.encode_marine(m, own, optional), expected)
+
+
+    def test_player_sence_update(self):
+        own, others = self.marines[:2], self.marines[2:]
+        msg = api_pb2.Message()
+        msg.msg = api_pb2.senceupdate
+        for m in own:
+            message.marine_obj_to_protobuf(m, True, msg=msg.update.own.add())
+        for m in others:
+            message.marine_obj_to_protobuf(m, False, msg=msg.update.others.add())
+
+        data = codec.encode_player_sence_update([codec.encode_marine(m, True) for m in own],
+                                                [codec.encode_marine(m, False) for m in others])
+        self.assertEqual(data, msg.SerializeToString())
+
+        parsed = api_pb2.Message()
+        parsed.ParseFromString(data)
+        self.assertEqual(parsed, msg)
+
+
+    def test_empty_player_sence_update(self):
+        msg = api_pb2.Message()
+        msg.msg = api_pb2.senceupdate
+        self.assertEqual(codec.encode_player_sence_update([], []), msg.SerializeToString())
+
+
+    def test_observer_sence_update(self):
+        msg = observer_pb2.Message()
+        msg.msg = observer_pb2.senceupdate
+        for m in self.marines:
+            message.marine_obj_to_protobuf(m, True, msg=msg.update.marine.add())
+
+        data = codec.encode_observer_sence_update([codec.encode_marine(m, True) for m in self.marines])
+        self.assertEqual(data, msg.SerializeToString())
+
+
+    def test_empty_observer_sence_update(self):
+        msg = observer_pb2.Message()
+        msg.msg = observer_pb2.senceupdate
+        self.assertEqual(codec.encode_observer_sence_update([]), msg.SerializeToString())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.framing.FrameReader on streams cut at every possible place.
+
+import unittest
+
+from codebattle.framing import FrameReader, FrameError, frame, HEADER
+
+
+class ChunkedSocket(object):
+    """recv_into hands out the chunks one by one"""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def recv_into(self, buf):
+        if not self.chunks:
+            return 0
+        chunk = self.chunks.pop(0)
+        if len(chunk) > len(buf):
+            chunk, self.chunks[:0] = chunk[:len(buf)], [chunk[len(buf):]]
+        buf[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def read_all(reader, sock):
+    frames = []
+    while reader.recv_into(sock):
+        frames.extend(f.tobytes() for f in reader.frames())
+    return frames
+
+
+def cut(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class FrameReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.payloads = [b'', b'a', b'hello', b'x' * 300, b'\x00\x01\x02' * 10]
+        self.stream = b''.join(frame(p) for p in self.payloads)
+
+
+    def test_every_chunk_size(self):
+        for size in range(1, len(self.stream) + 1):
+            reader = FrameReader(buffer_size=64)
+            self.assertEqual(read_all(reader, ChunkedSocket(cut(self.stream, size))), self.payloads)
+            self.assertEqual(reader.pending(), b'')
+
+
+    def test_feed(self):
+        reader = FrameReader(buffer_size=8)
+        frames = []
+        for chunk in cut(self.stream, 7):
+            reader.feed(chunk)
+            frames.extend(f.tobytes() for f in reader.frames())
+        self.assertEqual(frames, self.payloads)
+
+
+    def test_frame_larger_than_the_buffer(self):
+        payload = bytes(bytearray(range(256))) * 40
+        reader = FrameReader(buffer_size=16)
+        self.assertEqual(read_all(reader, ChunkedSocket(cut(frame(payload), 100))), [payload])
+        # back to the small buffer once the large frame is consumed
+        reader.get_buffer()
+        self.assertEqual(len(reader.buffer), 16)
+
+
+    def test_earlier_frame_survives_growing(self):
+        big = b'y' * 100
+        reader = FrameReader(buffer_size=16)
+        reader.feed(frame(b'abc') + frame(big)[:6])
+        [first] = list(reader.frames())
+        reader.feed(frame(big)[6:])
+        self.assertEqual(first.tobytes(), b'abc')
+        self.assertEqual([f.tobytes() for f in reader.frames()], [big])
+
+
+    def test_pending(self):
+        reader = FrameReader()
+        data = frame(b'done') + frame(b'partial')[:7]
+        reader.feed(data)
+        self.assertEqual([f.tobytes() for f in reader.frames()], [b'done'])
+        self.assertEqual(reader.pending(), frame(b'partial')[:7])
+
+
+    def test_invalid_length(self):
+        for length in (-1, 1025):
+            reader = FrameReader(max_frame_size=1024)
+            reader.feed(HEADER.pack(length) + b'data')
+            self.assertRaises(FrameError, list, reader.frames())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
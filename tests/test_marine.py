@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.marine spawning and marine ids.
+
+import math
+import random
+import unittest
+
+from codebattle import clock
+from codebattle.clock import VirtualClock
+from codebattle.marine import Marine, MarineSpawner, MarineIdAllocator, GUNSHOT_INTERVAL
+from codebattle.protomsg import marine_pb2
+
+
+class GunCoolDownTest(unittest.TestCase):
+    def setUp(self):
+        self.real_clock = clock._clock
+        self.clock = clock.set_clock(VirtualClock(start=100, auto=False))
+
+
+    def tearDown(self):
+        clock.set_clock(self.real_clock)
+
+
+    def test_cooldown(self):
+        marine = Marine(1, [0, 0])
+        marine.set_status(marine_pb2.GunAttack)
+        self.assertEqual(marine.last_gunshot_time, 100)
+
+        marine.set_status(marine_pb2.Idle)
+        self.assertRaises(Marine.GunCoolDown, marine.set_status, marine_pb2.GunAttack)
+
+        self.clock.time += GUNSHOT_INTERVAL
+        marine.set_status(marine_pb2.GunAttack)
+        self.assertEqual(marine.last_gunshot_time, 100 + GUNSHOT_INTERVAL)
+
+
+    def test_reported_shot(self):
+        marine = Marine(1, [0, 0])
+        marine.set_status(marine_pb2.GunAttack)
+        # the observer reports the shot back, it is not another one
+        marine.update(marine_pb2.GunAttack, reported=True)
+        self.assertEqual(marine.status, marine_pb2.GunAttack)
+        self.assertEqual(marine.last_gunshot_time, 100)
+
+
+
+class MarineIdAllocatorTest(unittest.TestCase):
+    def test_unique_until_exhausted(self):
+        ids = MarineIdAllocator(1, 50)
+        taken = set(ids.allocate() for _ in range(50))
+        self.assertEqual(taken, set(range(1, 51)))
+        self.assertRaises(MarineIdAllocator.Exhausted, ids.allocate)
+
+        ids.release(7)
+        self.assertEqual(ids.allocate(), 7)
+
+
+
+class MarineSpawnerTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(17)
+
+
+    def test_separation(self):
+        spawner = MarineSpawner((50, 50))
+        marines = spawner.spawn(625)
+        self.assertEqual(len(set(m.id for m in marines)), 625)
+        for m in marines:
+            x, z = m.position
+            self.assertTrue(0 <= x <= 50 and 0 <= z <= 50)
+
+        positions = sorted(m.position for m in marines)
+        for i, (x, z) in enumerate(positions):
+            for ox, oz in positions[i + 1:]:
+                if ox - x >= spawner.min_separation:
+                    break
+                self.assertTrue(math.hypot(ox - x, oz - z) >= spawner.min_separation)
+
+
+    def test_map_full_takes_nothing(self):
+        ids = MarineIdAllocator()
+        spawner = MarineSpawner((10, 10), ids=ids)
+        spawner.spawn(20)
+        self.assertEqual(len(spawner.free_cells), 5)
+
+        self.assertRaises(MarineSpawner.MapFull, spawner.spawn, 6)
+        self.assertEqual(len(spawner.free_cells), 5)
+        self.assertEqual(len(ids.used), 20)
+
+        self.assertEqual(len(spawner.spawn(5)), 5)
+        self.assertRaises(MarineSpawner.MapFull, spawner.spawn, 1)
+
+
+    def test_blocked_cells_are_dropped(self):
+        # the two left columns of cells are an obstacle
+        ids = MarineIdAllocator()
+        spawner = MarineSpawner((10, 10), ids=ids, blocked=lambda x, z: x < 4)
+        marines = spawner.spawn(15)
+        self.assertTrue(all(m.position[0] >= 4 for m in marines))
+
+        # the cells left are blocked, found only while spawning
+        self.assertRaises(MarineSpawner.MapFull, spawner.spawn, 1)
+        self.assertEqual(len(ids.used), 15)
+        self.assertEqual(spawner.free_cells, [])
+
+
+    def test_rollback_keeps_free_cells(self):
+        blocked = set()
+        spawner = MarineSpawner((10, 10), blocked=lambda x, z: (int(x // 2), int(z // 2)) in blocked)
+        for cx in range(5):
+            for cz in range(4):
+                blocked.add((cx, cz))
+
+        # 5 cells are free, but the spawn drops blocked ones on the way
+        self.assertRaises(MarineSpawner.MapFull, spawner.spawn, 6)
+        self.assertEqual(len(spawner.spawn(5)), 5)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.matchmaking with in process players on a virtual clock.
+
+import unittest
+
+from codebattle import clock
+from codebattle.clock import VirtualClock
+from codebattle.framing import FrameReader
+from codebattle.local import LocalTransport
+from codebattle.matchmaking import Matchmaker, SKILL_BUCKET_WIDTH
+from codebattle.player import Player
+from codebattle.room import RoomManager
+from codebattle.protomsg import api_pb2
+
+
+def make_player():
+    return Player(LocalTransport(lambda data: None))
+
+
+def join_responses(player):
+    reader = FrameReader()
+    while not player.inbox.empty():
+        reader.feed(player.inbox.get_nowait())
+
+    responses = []
+    for data in reader.frames():
+        msg = api_pb2.Message()
+        msg.ParseFromString(data.tobytes())
+        if msg.response.cmd == api_pb2.joinroom:
+            responses.append(msg.response)
+    return responses
+
+
+class MatchmakerTest(unittest.TestCase):
+    def setUp(self):
+        self.real_clock = clock._clock
+        clock.set_clock(VirtualClock(auto=False))
+        self.matchmaker = Matchmaker(room_size=2)
+        self.rooms = []
+        RoomManager.listeners.append(self)
+
+
+    def tearDown(self):
+        RoomManager.listeners.remove(self)
+        for room in self.rooms:
+            RoomManager.rooms.pop(room.id, None)
+        clock.set_clock(self.real_clock)
+
+
+    def room_created(self, room):
+        self.rooms.append(room)
+
+    def room_destroyed(self, room):
+        pass
+
+
+    def test_two_players_share_a_room(self):
+        first, second = make_player(), make_player()
+        self.matchmaker.enqueue(first, 0, skill=0)
+        self.assertEqual(len(self.matchmaker), 1)
+        self.assertIsNone(first.room)
+
+        self.matchmaker.enqueue(second, 0, skill=0)
+        self.assertEqual(len(self.matchmaker), 0)
+        self.assertEqual(len(self.rooms), 1)
+        self.assertIsNotNone(first.room)
+        self.assertIs(first.room, second.room)
+
+        for player in (first, second):
+            [response] = join_responses(player)
+            self.assertEqual(response.ret, 0)
+            self.assertEqual(response.jrmResponse.id, first.room.id)
+            self.assertEqual(len(player.alive_marines), 2)
+
+
+    def test_skill_buckets_are_apart(self):
+        first, second = make_player(), make_player()
+        self.matchmaker.enqueue(first, 0, skill=0)
+        self.matchmaker.enqueue(second, 0, skill=SKILL_BUCKET_WIDTH)
+        self.assertEqual(len(self.matchmaker), 2)
+        self.assertEqual(self.rooms, [])
+
+
+    def test_any_map_joins_a_map(self):
+        first, second = make_player(), make_player()
+        self.matchmaker.enqueue(first, 3)
+        self.matchmaker.enqueue(second, 0)
+        self.assertIs(first.room, second.room)
+        self.assertEqual(first.room.terrain.map_id, 3)
+
+
+    def test_closed_player_is_skipped(self):
+        gone, first, second = make_player(), make_player(), make_player()
+        self.matchmaker.enqueue(gone, 0)
+        gone.closed = True
+        self.matchmaker.enqueue(first, 0)
+        # the closed player was counted, first keeps its place
+        self.assertEqual(self.rooms, [])
+        self.assertEqual(len(self.matchmaker), 1)
+
+        self.matchmaker.enqueue(second, 0)
+        self.assertIs(first.room, second.room)
+        self.assertIsNone(gone.room)
+
+
+    def test_player_left(self):
+        player = make_player()
+        self.matchmaker.enqueue(player, 0)
+        self.matchmaker.player_left(player)
+        self.assertEqual(len(self.matchmaker), 0)
+        self.assertEqual(self.matchmaker.buckets, {})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.movement steps on rooms with and without a marine store.
+
+import unittest
+
+from codebattle import store
+from codebattle.local import LocalTransport
+from codebattle.movement import MovementEngine
+from codebattle.player import Player
+from codebattle.room import Room, RoomManager
+from codebattle.terrain import Terrain
+from codebattle.protomsg import marine_pb2
+
+ROOM_ID = 11
+
+
+class MovementTestMixin(object):
+    marine_store = False
+
+    def setUp(self):
+        self.room = Room(ROOM_ID, Terrain(1), 4, 60, scene_tick=0, marine_store=self.marine_store, movement_tick=0)
+        RoomManager.rooms.add(self.room)
+        self.engine = MovementEngine(self.room, 0.1, speed=1.0)
+        self.players = []
+        for _ in range(2):
+            player = Player(LocalTransport(lambda data: None))
+            player.join_room(ROOM_ID, 'red')
+            self.players.append(player)
+
+
+    def tearDown(self):
+        RoomManager.rooms.pop(ROOM_ID, None)
+
+
+    def run_marines(self, player):
+        for m in player.get_alive_marines():
+            m.position = [10.0, 10.0]
+            m.target_position = [20.0, 10.0]
+            m.status = marine_pb2.Run
+        return list(player.get_alive_marines())
+
+
+    def test_moves_toward_target(self):
+        marines = self.run_marines(self.players[0])
+        moved = self.engine.step(2)
+        self.assertEqual(set(m.id for m in moved), set(m.id for m in marines))
+        for m in marines:
+            self.assertEqual(list(m.position), [12.0, 10.0])
+
+        self.engine.step(100)
+        for m in marines:
+            self.assertEqual(list(m.position), [20.0, 10.0])
+            self.assertEqual(m.status, marine_pb2.Idle)
+
+
+    def test_skips_disconnected_players(self):
+        gone = self.run_marines(self.players[0])
+        staying = self.run_marines(self.players[1])
+        self.room.alive_players.remove(self.players[0])
+        self.room.died_players.append(self.players[0])
+
+        moved = self.engine.step(2)
+        self.assertEqual(set(m.id for m in moved), set(m.id for m in staying))
+        for m in gone:
+            self.assertEqual(list(m.position), [10.0, 10.0])
+
+
+
+class MarinesMovementTest(MovementTestMixin, unittest.TestCase):
+    pass
+
+
+
+@unittest.skipUnless(store.available(), "the marine store needs numpy")
+class StoreMovementTest(MovementTestMixin, unittest.TestCase):
+    marine_store = True
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.outbound queue policies on a consumer that stopped reading.
+
+import unittest
+
+from codebattle import outbound
+from codebattle.outbound import OutboundQueue
+
+KEY = 'sence'
+
+
+def drain(queue):
+    frames = []
+    while True:
+        data = queue.get_nowait()
+        if data is None:
+            return frames
+        frames.append(data)
+
+
+class DisconnectTest(unittest.TestCase):
+    def test_full_closes(self):
+        queue = OutboundQueue(max_frames=2, policy=outbound.POLICY_DISCONNECT)
+        queue.put(b'a', KEY)
+        queue.put(b'b')
+        self.assertRaises(OutboundQueue.Full, queue.put, b'c', KEY)
+        self.assertTrue(queue.closed)
+        self.assertEqual(queue.stats['disconnected'], 1)
+        # a closed queue takes nothing more
+        queue.put(b'd')
+        self.assertEqual(queue.get_batch(), [])
+
+
+    def test_max_bytes(self):
+        queue = OutboundQueue(max_bytes=4, policy=outbound.POLICY_DISCONNECT)
+        queue.put(b'abc')
+        self.assertRaises(OutboundQueue.Full, queue.put, b'de')
+
+
+
+class DropOldestTest(unittest.TestCase):
+    def test_drops_oldest_keyed(self):
+        queue = OutboundQueue(max_frames=3, policy=outbound.POLICY_DROP_OLDEST)
+        queue.put(b'u1', KEY)
+        queue.put(b'r1')
+        queue.put(b'u2', KEY)
+        queue.put(b'u3', KEY)
+        queue.put(b'u4', KEY)
+        self.assertEqual(queue.stats['dropped'], 2)
+        self.assertEqual(drain(queue), [b'r1', b'u3', b'u4'])
+
+
+    def test_unkeyed_frames_are_kept(self):
+        queue = OutboundQueue(max_frames=2, policy=outbound.POLICY_DROP_OLDEST)
+        queue.put(b'r1')
+        queue.put(b'r2')
+        self.assertRaises(OutboundQueue.Full, queue.put, b'u1', KEY)
+        self.assertEqual(queue.stats['dropped'], 0)
+
+
+
+class CollapseTest(unittest.TestCase):
+    def test_new_update_goes_to_the_tail(self):
+        queue = OutboundQueue(max_frames=3, policy=outbound.POLICY_COLLAPSE)
+        queue.put(b'u1', KEY)
+        queue.put(b'r1')
+        queue.put(b'r2')
+        queue.put(b'u2', KEY)
+        self.assertEqual(queue.stats['collapsed'], 1)
+        # u2 is not sent ahead of the frames queued after u1
+        self.assertEqual(drain(queue), [b'r1', b'r2', b'u2'])
+
+
+    def test_keeps_collapsing(self):
+        queue = OutboundQueue(max_frames=2, policy=outbound.POLICY_COLLAPSE)
+        queue.put(b'r1')
+        for i in range(10):
+            queue.put(('u%d' % i).encode(), KEY)
+        self.assertEqual(queue.stats['collapsed'], 9)
+        self.assertEqual(drain(queue), [b'r1', b'u9'])
+
+
+    def test_keys_collapse_apart(self):
+        queue = OutboundQueue(max_frames=2, policy=outbound.POLICY_COLLAPSE)
+        queue.put(b'a1', 'a')
+        queue.put(b'b1', 'b')
+        queue.put(b'a2', 'a')
+        self.assertEqual(drain(queue), [b'b1', b'a2'])
+
+
+    def test_nothing_to_collapse(self):
+        queue = OutboundQueue(max_frames=1, policy=outbound.POLICY_COLLAPSE)
+        queue.put(b'r1')
+        self.assertRaises(OutboundQueue.Full, queue.put, b'u1', KEY)
+
+
+    def test_dropped_entries_are_compacted(self):
+        queue = OutboundQueue(max_frames=2, policy=outbound.POLICY_COLLAPSE)
+        for i in range(1000):
+            queue.put(b'u', KEY)
+        self.assertEqual(queue.frames, 2)
+        self.assertTrue(len(queue.entries) <= 2 * 2 + outbound.COMPACT_SLACK + 1)
+        self.assertEqual(drain(queue), [b'u', b'u'])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.player commands on in process connections.
+
+import unittest
+
+from codebattle.framing import FrameReader
+from codebattle.local import LocalTransport
+from codebattle.marine import MarineSpawner
+from codebattle.player import Player, PLAYER_MARINE_AMOUNT
+from codebattle.room import Room, RoomManager
+from codebattle.terrain import Terrain
+from codebattle.protomsg import api_pb2, marine_pb2
+
+ROOM_ID = 7
+
+
+def sent_messages(player):
+    """the api_pb2.Messages queued to the player"""
+    reader = FrameReader()
+    while not player.inbox.empty():
+        reader.feed(player.inbox.get_nowait())
+
+    messages = []
+    for data in reader.frames():
+        msg = api_pb2.Message()
+        msg.ParseFromString(data.tobytes())
+        messages.append(msg)
+    return messages
+
+
+def make_player():
+    return Player(LocalTransport(lambda data: None))
+
+
+def make_room(max_players=4):
+    room = Room(ROOM_ID, Terrain(1), max_players, 60, scene_tick=0, marine_store=False, movement_tick=0)
+    RoomManager.rooms.add(room)
+    return room
+
+
+def player_create_marine():
+    cmd = api_pb2.Cmd()
+    cmd.cmd = api_pb2.createmarine
+    return cmd.SerializeToString()
+
+
+class JoinRoomTest(unittest.TestCase):
+    def tearDown(self):
+        RoomManager.rooms.pop(ROOM_ID, None)
+
+
+    def test_join(self):
+        room = make_room()
+        player = make_player()
+        player.join_room(ROOM_ID, 'red')
+
+        self.assertEqual(room.alive_players, [player])
+        self.assertEqual(len(player.alive_marines), PLAYER_MARINE_AMOUNT)
+        [msg] = sent_messages(player)
+        self.assertEqual(msg.response.ret, 0)
+        self.assertEqual(msg.response.jrmResponse.id, ROOM_ID)
+        self.assertEqual(len(msg.response.jrmResponse.marines), PLAYER_MARINE_AMOUNT)
+
+
+    def test_map_full(self):
+        room = make_room()
+        room.spawner = MarineSpawner(room.terrain.size, min_separation=room.terrain.size[0])
+        player = make_player()
+        player.join_room(ROOM_ID, 'red')
+
+        # not left in the room without marines
+        self.assertEqual(room.alive_players, [])
+        self.assertIsNone(player.room)
+        self.assertEqual(player.alive_marines, {})
+        self.assertFalse(player.closed)
+        [msg] = sent_messages(player)
+        self.assertNotEqual(msg.response.ret, 0)
+
+
+    def test_room_not_found(self):
+        player = make_player()
+        player.join_room(ROOM_ID, 'red')
+        [msg] = sent_messages(player)
+        self.assertNotEqual(msg.response.ret, 0)
+
+
+    def test_room_full(self):
+        room = make_room(max_players=1)
+        room.player_join(make_player())
+        free_cells = len(room.spawner.free_cells)
+
+        player = make_player()
+        player.join_room(ROOM_ID, 'red')
+        self.assertEqual(len(room.alive_players), 1)
+        # no marine spawned for it
+        self.assertEqual(len(room.spawner.free_cells), free_cells)
+        [msg] = sent_messages(player)
+        self.assertNotEqual(msg.response.ret, 0)
+
+
+
+class OperateMarineTest(unittest.TestCase):
+    def setUp(self):
+        self.room = make_room()
+        self.player = make_player()
+        self.player.join_room(ROOM_ID, 'red')
+        self.room.battle_stared = True
+        sent_messages(self.player)
+
+
+    def tearDown(self):
+        RoomManager.rooms.pop(ROOM_ID, None)
+
+
+    def test_gun_cooldown(self):
+        marine_id = list(self.player.alive_marines)[0]
+        self.player.marine_operate(marine_id, marine_pb2.GunAttack)
+        self.assertEqual(sent_messages(self.player), [])
+
+        self.player.marine_operate(marine_id, marine_pb2.Idle)
+        self.player.marine_operate(marine_id, marine_pb2.GunAttack)
+        [msg] = sent_messages(self.player)
+        self.assertEqual(msg.response.cmd, api_pb2.marineoperate)
+        self.assertNotEqual(msg.response.ret, 0)
+
+
+
+class CreateMarineTest(unittest.TestCase):
+    def test_error_response(self):
+        player = make_player()
+        player.on_data(player_create_marine())
+
+        self.assertFalse(player.closed)
+        messages = sent_messages(player)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].msg, api_pb2.cmdresponse)
+        self.assertEqual(messages[0].response.cmd, api_pb2.createmarine)
+        self.assertNotEqual(messages[0].response.ret, 0)
+
+
+
+class TransportTest(unittest.TestCase):
+    def test_local_has_no_socket(self):
+        transport = make_player().transport
+        self.assertFalse(transport.has_socket)
+        self.assertIsNone(transport.fileno())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.registry room ids, the sharded room registry and the owner directory.
+
+import shutil
+import tempfile
+import unittest
+
+from codebattle.registry import (RoomIdAllocator, RoomRegistry, OwnerDirectory,
+                                 ROOM_ID_MIN, ROOM_ID_MAX, FEISTEL_ROUNDS)
+
+KEYS = [0x12345678, 0x9abcdef0, 0x0fedcba9, 0x87654321][:FEISTEL_ROUNDS]
+
+
+def shrink(allocator, space):
+    """the allocator over the first space ids only, to go through all of them"""
+    allocator.space = space
+    allocator.half_bits = (max(space - 1, 1).bit_length() + 1) // 2
+    allocator.mask = (1 << allocator.half_bits) - 1
+    return allocator
+
+
+class Room(object):
+    def __init__(self, room_id):
+        self.id = room_id
+
+
+
+class RoomIdAllocatorTest(unittest.TestCase):
+    def test_ids_in_range_and_unique(self):
+        allocator = RoomIdAllocator(keys=KEYS)
+        ids = [allocator.allocate() for _ in range(20000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(ROOM_ID_MIN <= room_id <= ROOM_ID_MAX for room_id in ids))
+        # not handed out in counting order
+        self.assertNotEqual(ids, sorted(ids))
+
+
+    def test_worker_ids(self):
+        allocators = [RoomIdAllocator(index, 3) for index in range(3)]
+        for index, allocator in enumerate(allocators):
+            for _ in range(1000):
+                room_id = allocator.allocate()
+                self.assertEqual(room_id % 3, index)
+                self.assertTrue(ROOM_ID_MIN <= room_id <= ROOM_ID_MAX)
+
+
+    def test_permutation(self):
+        for space in (1, 2, 7, 1000, 4097):
+            allocator = shrink(RoomIdAllocator(keys=KEYS), space)
+            self.assertEqual(sorted(allocator.permute(n) for n in range(space)), list(range(space)))
+
+
+    def test_taken_ids_are_skipped(self):
+        allocator = shrink(RoomIdAllocator(keys=KEYS), 100)
+        taken = set(allocator.allocate() for _ in range(60))
+        rest = set(allocator.allocate(taken) for _ in range(40))
+        self.assertFalse(taken & rest)
+        self.assertEqual(len(taken | rest), 100)
+
+
+    def test_exhausted(self):
+        allocator = shrink(RoomIdAllocator(keys=KEYS), 10)
+        taken = set(allocator.allocate() for _ in range(10))
+        self.assertRaises(RoomIdAllocator.Exhausted, allocator.allocate, taken)
+
+        # a released id comes back
+        released = taken.pop()
+        self.assertEqual(allocator.allocate(taken), released)
+
+
+    def test_same_keys_same_ids(self):
+        first, second = RoomIdAllocator(keys=KEYS), RoomIdAllocator(keys=KEYS)
+        self.assertEqual([first.allocate() for _ in range(100)], [second.allocate() for _ in range(100)])
+
+
+
+class RoomRegistryTest(unittest.TestCase):
+    def test_dict_like(self):
+        registry = RoomRegistry(shards=4)
+        rooms = [Room(ROOM_ID_MIN + i * 3) for i in range(50)]
+        for room in rooms:
+            registry.add(room)
+
+        self.assertEqual(len(registry), 50)
+        self.assertEqual(sorted(registry.keys()), [room.id for room in rooms])
+        self.assertEqual(sorted(room.id for room in registry.values()), [room.id for room in rooms])
+        # ids of one worker spread over the shards
+        self.assertTrue(all(registry.shards))
+
+        self.assertIs(registry[rooms[7].id], rooms[7])
+        self.assertIn(rooms[7].id, registry)
+        self.assertIs(registry.pop(rooms[7].id), rooms[7])
+        self.assertNotIn(rooms[7].id, registry)
+        self.assertIsNone(registry.get(rooms[7].id))
+        self.assertIsNone(registry.pop(rooms[7].id, None))
+        self.assertRaises(KeyError, lambda: registry[rooms[7].id])
+        self.assertEqual(len(registry), 49)
+
+
+    def test_pop_while_iterating(self):
+        registry = RoomRegistry()
+        for i in range(10):
+            registry.add(Room(ROOM_ID_MIN + i))
+        for room_id in registry:
+            registry.pop(room_id)
+        self.assertEqual(len(registry), 0)
+
+
+
+class OwnerDirectoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = OwnerDirectory.path_in(self.tmp)
+        self.directory = OwnerDirectory(self.path, create=True)
+
+
+    def tearDown(self):
+        self.directory.close()
+        shutil.rmtree(self.tmp)
+
+
+    def test_claim_and_release(self):
+        self.assertIsNone(self.directory.owner_of(ROOM_ID_MIN))
+        self.directory.claim(ROOM_ID_MIN, 0)
+        self.directory.claim(ROOM_ID_MAX, 5)
+        self.assertEqual(self.directory.owner_of(ROOM_ID_MIN), 0)
+        self.assertEqual(self.directory.owner_of(ROOM_ID_MAX), 5)
+
+        self.directory.release(ROOM_ID_MIN)
+        self.assertIsNone(self.directory.owner_of(ROOM_ID_MIN))
+
+
+    def test_out_of_range(self):
+        self.assertIsNone(self.directory.owner_of(ROOM_ID_MIN - 1))
+        self.assertIsNone(self.directory.owner_of(ROOM_ID_MAX + 1))
+
+
+    def test_shared_between_mappings(self):
+        other = OwnerDirectory(self.path)
+        try:
+            self.directory.claim(ROOM_ID_MIN + 42, 3)
+            self.assertEqual(other.owner_of(ROOM_ID_MIN + 42), 3)
+            other.release(ROOM_ID_MIN + 42)
+            self.assertIsNone(self.directory.owner_of(ROOM_ID_MIN + 42))
+        finally:
+            other.close()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.scene delta updates, keyframes and tick batching.
+
+import unittest
+
+from codebattle import clock
+from codebattle import message
+from codebattle import scene
+from codebattle.clock import VirtualClock
+from codebattle.marine import Marine
+from codebattle.scene import SceneState, SceneBatcher
+from codebattle.protomsg import api_pb2, marine_pb2
+
+
+class Endpoint(object):
+    scene_state = None
+
+
+
+class RecordingRoom(object):
+    def __init__(self):
+        self.player_updates = []
+        self.observer_updates = []
+
+    def send_sence_update(self, players, my_marines, other_marines, revealed=()):
+        self.player_updates.append((players, my_marines, other_marines, revealed))
+
+    def send_observer_sence_update(self, marines):
+        self.observer_updates.append(marines)
+
+
+
+def ids(marines):
+    return sorted(m.id for m in marines)
+
+
+class SceneStateTest(unittest.TestCase):
+    def setUp(self):
+        self.marine = Marine(1, [1.0, 2.0])
+
+
+    def test_first_view_is_full(self):
+        state = SceneState()
+        self.assertEqual(state.view(self.marine, True), (self.marine, message.FIELDS_ALL))
+
+
+    def test_unchanged(self):
+        state = SceneState()
+        state.view(self.marine, True)
+        self.assertEqual(state.view(self.marine, True), (self.marine, 0))
+        self.assertIsNone(state.view(self.marine, True, skip_unchanged=True))
+
+        # a version bump without a change sends the required fields only
+        self.marine.touch()
+        self.assertEqual(state.view(self.marine, True), (self.marine, 0))
+
+
+    def test_changed_fields(self):
+        state = SceneState()
+        state.view(self.marine, True)
+
+        self.marine.target_position = [5.0, 5.0]
+        self.marine.touch()
+        self.assertEqual(state.view(self.marine, True), (self.marine, message.FIELD_TARGET_POSITION))
+
+        self.marine.flares_amount -= 1
+        self.marine.set_role(marine_pb2.Attacker)
+        self.assertEqual(state.view(self.marine, True),
+                         (self.marine, message.FIELD_FLARES_AMOUNT | message.FIELD_ROLE))
+
+
+    def test_own_and_other_views_apart(self):
+        state = SceneState()
+        state.view(self.marine, True)
+        self.assertEqual(state.view(self.marine, False), (self.marine, message.FIELDS_ALL))
+
+
+    def test_keyframes(self):
+        state = SceneState(keyframe_interval=3)
+        self.assertEqual([state.begin() for _ in range(7)], [True, False, False, True, False, False, True])
+        state.view(self.marine, True)
+        self.assertEqual(state.view(self.marine, True, keyframe=True), (self.marine, message.FIELDS_ALL))
+
+        state = SceneState(keyframe_interval=1)
+        self.assertTrue(all(state.begin() for _ in range(3)))
+
+
+
+class PlayerDeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.player = Endpoint()
+        self.own = Marine(1, [1.0, 2.0])
+        self.other = Marine(2, [3.0, 4.0])
+
+
+    def unpack(self, data):
+        msg = api_pb2.Message()
+        msg.ParseFromString(data)
+        self.assertEqual(msg.msg, api_pb2.senceupdate)
+        return msg.update
+
+
+    def test_delta_leaves_out_unchanged_optional_fields(self):
+        update = self.unpack(scene.pack_player_delta(self.player, [self.own], [self.other]))
+        self.assertTrue(update.own[0].HasField('targetPosition'))
+        self.assertTrue(update.others[0].HasField('role'))
+
+        self.own.hp -= 10
+        self.own.touch()
+        update = self.unpack(scene.pack_player_delta(self.player, [self.own], []))
+        [own] = update.own
+        self.assertEqual(own.hp, 90)
+        self.assertFalse(own.HasField('targetPosition'))
+        self.assertFalse(own.HasField('flaresAmount'))
+        self.assertFalse(own.HasField('role'))
+
+
+    def test_unchanged_revealed_marines_are_skipped(self):
+        scene.pack_player_delta(self.player, [self.own], [], revealed=[self.other])
+        self.assertIsNone(scene.pack_player_delta(self.player, [], [], revealed=[self.other]))
+
+        self.other.hp -= 10
+        self.other.touch()
+        update = self.unpack(scene.pack_player_delta(self.player, [], [], revealed=[self.other]))
+        self.assertEqual([m.hp for m in update.others], [90])
+
+
+    def test_keyframe_is_full(self):
+        self.player.scene_state = SceneState(keyframe_interval=2)
+        scene.pack_player_delta(self.player, [self.own], [])
+        update = self.unpack(scene.pack_player_delta(self.player, [self.own], []))
+        self.assertFalse(update.own[0].HasField('targetPosition'))
+        update = self.unpack(scene.pack_player_delta(self.player, [self.own], []))
+        self.assertTrue(update.own[0].HasField('targetPosition'))
+
+
+
+class SceneBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.real_clock = clock._clock
+        self.clock = clock.set_clock(VirtualClock(auto=False))
+        self.room = RecordingRoom()
+        self.batcher = SceneBatcher(self.room, 0.1)
+        self.marines = [Marine(i, [i, i]) for i in range(1, 5)]
+
+
+    def tearDown(self):
+        clock.set_clock(self.real_clock)
+
+
+    def test_one_update_per_player_per_tick(self):
+        first, second = Endpoint(), Endpoint()
+        m1, m2, m3, m4 = self.marines
+        self.batcher.add_player_update(first, [m1], [m3])
+        self.batcher.add_player_update(first, [m1, m2], [], revealed=[m3, m4])
+        self.batcher.add_player_update(second, [m3], [m1])
+        self.batcher.add_observer_update([m1, m2])
+        self.batcher.add_observer_update([m2, m3])
+        self.assertEqual(self.room.player_updates, [])
+
+        self.assertTrue(self.clock.advance())
+        self.assertEqual(self.clock.now(), 0.1)
+        self.assertEqual(len(self.room.player_updates), 2)
+        updates = dict((players[0], (my, others, revealed)) for players, my, others, revealed in self.room.player_updates)
+
+        my, others, revealed = updates[first]
+        self.assertEqual(ids(my), [1, 2])
+        self.assertEqual(ids(others), [3])
+        # m3 is sent as an other marine already
+        self.assertEqual(ids(revealed), [4])
+        self.assertEqual(ids(updates[second][0]), [3])
+
+        [observed] = self.room.observer_updates
+        self.assertEqual(ids(observed), [1, 2, 3])
+
+        # nothing pending, no more ticks
+        self.assertFalse(self.clock.advance())
+
+
+    def test_flush_and_close(self):
+        player = Endpoint()
+        self.batcher.add_player_update(player, self.marines[:1], [])
+        self.batcher.flush()
+        self.assertEqual(len(self.room.player_updates), 1)
+        self.assertFalse(self.clock.advance())
+
+        self.batcher.add_player_update(player, self.marines[:1], [])
+        self.batcher.close()
+        self.assertFalse(self.clock.advance())
+        self.assertEqual(len(self.room.player_updates), 1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.timerwheel on a virtual clock.
+
+import unittest
+
+from codebattle import clock
+from codebattle import timerwheel
+from codebattle.clock import VirtualClock
+from codebattle.timerwheel import TimerWheel
+
+
+class TimerWheelTest(unittest.TestCase):
+    def setUp(self):
+        self.real_clock = clock._clock
+        self.clock = clock.set_clock(VirtualClock(auto=False))
+        # 3 levels of 4 slots, the top level reaches 64 ticks
+        self.wheel = TimerWheel(tick=1, slots=4, levels=3)
+        self.fired = []
+
+
+    def tearDown(self):
+        clock.set_clock(self.real_clock)
+
+
+    def fire(self, name):
+        self.fired.append((name, self.clock.now()))
+
+
+    def run_all(self):
+        while self.clock.advance():
+            pass
+
+
+    def test_fires_in_order(self):
+        for seconds in (3, 1, 2, 0):
+            self.wheel.call_later(seconds, self.fire, seconds)
+        self.assertEqual(len(self.wheel), 4)
+        self.run_all()
+        # 0 still waits for the next tick
+        self.assertEqual(self.fired, [(0, 1), (1, 1), (2, 2), (3, 3)])
+        self.assertEqual(len(self.wheel), 0)
+
+
+    def test_rounds_up_to_the_tick(self):
+        wheel = TimerWheel(tick=0.5, slots=4, levels=3)
+        wheel.call_later(1.2, self.fire, 'a')
+        self.run_all()
+        self.assertEqual(self.fired, [('a', 1.5)])
+
+
+    def test_cascades_down_the_levels(self):
+        delays = [5, 15, 16, 17, 50, 63]
+        for seconds in delays:
+            self.wheel.call_later(seconds, self.fire, seconds)
+        self.run_all()
+        self.assertEqual(self.fired, [(d, d) for d in delays])
+
+
+    def test_beyond_the_top_level(self):
+        self.wheel.call_later(200, self.fire, 'far')
+        self.wheel.call_later(70, self.fire, 'near')
+        self.run_all()
+        self.assertEqual(self.fired, [('near', 70), ('far', 200)])
+
+
+    def test_cancel(self):
+        kept = self.wheel.call_later(2, self.fire, 'kept')
+        cancelled = self.wheel.call_later(20, self.fire, 'cancelled')
+        self.wheel.cancel(cancelled)
+        self.wheel.cancel(cancelled)
+        self.assertEqual(len(self.wheel), 1)
+        self.run_all()
+        self.assertEqual(self.fired, [('kept', 2)])
+
+        # cancelling a fired timer is a no-op
+        self.wheel.cancel(kept)
+        self.assertEqual(len(self.wheel), 0)
+
+
+    def test_empty_wheel_stops_the_clock_timer(self):
+        timer = self.wheel.call_later(30, self.fire, 'a')
+        self.wheel.cancel(timer)
+        self.assertIsNone(self.wheel.job)
+        self.assertFalse(self.clock.advance())
+
+
+    def test_cancel_in_the_same_tick(self):
+        later = []
+
+        def cancel_other():
+            self.fire('first')
+            self.wheel.cancel(later[0])
+
+        self.wheel.call_later(4, cancel_other)
+        later.append(self.wheel.call_later(4, self.fire, 'second'))
+        self.wheel.call_later(4, self.fire, 'third')
+        self.run_all()
+        names = [name for name, _ in self.fired]
+        # set order, the cancelled one only runs if it came before
+        self.assertIn('first', names)
+        self.assertIn('third', names)
+        if 'second' in names:
+            self.assertLess(names.index('second'), names.index('first'))
+        self.assertEqual(len(self.wheel), 0)
+
+
+    def test_catches_up_after_idle(self):
+        self.clock.time = 1000
+        self.wheel.call_later(2, self.fire, 'a')
+        self.run_all()
+        self.assertEqual(self.fired, [('a', 1002)])
+
+
+    def test_late_clock_runs_every_due_tick(self):
+        self.wheel.call_later(1, self.fire, 'a')
+        self.wheel.call_later(3, self.fire, 'b')
+        self.clock.time = 10
+        self.run_all()
+        self.assertEqual([name for name, _ in self.fired], ['a', 'b'])
+
+
+    def test_process_wheel_follows_the_clock(self):
+        wheel = timerwheel.get_wheel()
+        self.assertIs(timerwheel.get_wheel(), wheel)
+        clock.set_clock(VirtualClock(auto=False))
+        self.assertIsNot(timerwheel.get_wheel(), wheel)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# codebattle.wire and the command routing on real serialized Cmds.
+
+import unittest
+
+from codebattle import wire
+from codebattle import message
+from codebattle.router import CommandRouter
+from codebattle.protomsg import api_pb2, observer_pb2, marine_pb2
+
+
+def frames(data):
+    """the types a frame reaches the router as"""
+    return [data, bytearray(data), memoryview(bytearray(data))]
+
+
+def player_join_room(room_id, color='red'):
+    cmd = api_pb2.Cmd()
+    cmd.cmd = api_pb2.joinroom
+    cmd.jrm.roomid = room_id
+    cmd.jrm.color = color
+    return cmd.SerializeToString()
+
+
+def player_operate(marine_id):
+    cmd = api_pb2.Cmd()
+    cmd.cmd = api_pb2.marineoperate
+    cmd.opt.id = marine_id
+    cmd.opt.status = marine_pb2.Run
+    cmd.opt.targetPostion.x = 1.0
+    cmd.opt.targetPostion.z = 2.0
+    return cmd.SerializeToString()
+
+
+def observer_create_room(map_id):
+    cmd = observer_pb2.Cmd()
+    cmd.cmd = observer_pb2.createroom
+    cmd.crm.map = map_id
+    return cmd.SerializeToString()
+
+
+class VarintTest(unittest.TestCase):
+    def test_round_trip(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 31 - 1, 2 ** 64 - 1):
+            data = wire.encode_varint(value)
+            for frame in frames(data):
+                self.assertEqual(wire.read_varint(wire.byte_values(frame), 0), (value, len(data)))
+
+
+    def test_truncated(self):
+        self.assertRaises(wire.DecodeError, wire.read_varint, wire.byte_values(b'\x80\x80'), 0)
+
+
+
+class PeekTest(unittest.TestCase):
+    def test_peek_cmd(self):
+        cases = [
+            (player_join_room(1234567), api_pb2.joinroom),
+            (player_operate(3), api_pb2.marineoperate),
+            (observer_create_room(1), observer_pb2.createroom),
+            (b'\x08\x01', 1),
+            (b'', None),
+        ]
+        for data, cmd in cases:
+            for frame in frames(data):
+                self.assertEqual(message.peek_cmd(frame), cmd)
+
+
+    def test_find_varint_skips_fields(self):
+        # JoinRoom field 2 before the cmd field 1
+        data = wire.length_delimited(2, b'\x08\x05') + b'\x08\x03'
+        for frame in frames(data):
+            self.assertEqual(wire.find_varint(frame, 1), 3)
+            self.assertEqual(wire.find_varint(frame, 9, -1), -1)
+
+
+    def test_parse_sub_message(self):
+        data = player_join_room(1234567, 'blue')
+        for frame in frames(data):
+            jrm = message.player.decode_join_room(frame)
+            self.assertEqual((jrm.roomid, jrm.color), (1234567, 'blue'))
+
+
+    def test_repeated_sub_message_merges(self):
+        data = player_join_room(5) + wire.length_delimited(2, b'\x12\x04blue')
+        for frame in frames(data):
+            jrm = message.player.decode_join_room(frame)
+            self.assertEqual((jrm.roomid, jrm.color), (5, 'blue'))
+
+
+
+class RouterTest(unittest.TestCase):
+    def test_dispatch(self):
+        handled = []
+        router = CommandRouter('test')
+        router.register(message.PLAYER_JOIN_ROOM, lambda endpoint, data, raw: handled.append(data.roomid),
+                        message.player.decode_join_room)
+        router.register(message.PLAYER_OPERATE_MARINE, lambda endpoint, data, raw: handled.append(data.id),
+                        message.player.decode_operate_marine)
+
+        for frame in frames(player_join_room(1234567)) + frames(player_operate(3)):
+            router.dispatch(None, frame)
+        self.assertEqual(handled, [1234567] * 3 + [3] * 3)
+
+        self.assertRaises(CommandRouter.UnknownCommand, router.dispatch, None, observer_create_room(1))
+
+
+
+if __name__ == '__main__':
+    unittest.main()